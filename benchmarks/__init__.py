@@ -0,0 +1,3 @@
+"""
+Benchmarks del sistema de combate.
+"""
\ No newline at end of file
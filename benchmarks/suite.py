@@ -0,0 +1,549 @@
+"""
+Suite de benchmarks de las rutas críticas del combate.
+
+Cada benchmark prepara su estado fuera de la medición y retorna una función
+que ejecuta `ops` operaciones. Se reporta el mejor de varios intentos en
+ns/op y ops/s, y la memoria pico medida aparte con tracemalloc (que vuelve
+lento el código, por eso no se mide junto con el tiempo).
+
+Uso:
+    python -m benchmarks.suite                      # corre y compara con baseline.json
+    python -m benchmarks.suite --output result.json
+    python -m benchmarks.suite --save-baseline      # reemplaza la línea base
+    python -m benchmarks.suite --only attack --threshold 0.2
+
+El proceso termina con código 1 si algún benchmark empeora más que el umbral.
+"""
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from src.armor_system import LeatherArmor, PlateArmor, MagicShield, EnchantedArmor
+from src.character_table import CharacterTable
+from src.combat_log import CombatLog
+from src.combat_system import AttackResult, Character, CombatSystem
+from src.damage_calculator import StandardDamageCalculator, CriticalDamageCalculator
+from src.damage_pipeline import DamagePipeline
+from src.item_catalog import ItemCatalog, ARMOR_KINDS
+from src.metrics import CombatMetrics
+from src.rng import BufferedRandom
+from src.snapshot import snapshot
+from src.spatial_index import SpatialIndex
+from src.weapons import Sword
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_THRESHOLD = 0.15
+DEFAULT_MEMORY_THRESHOLD = 0.25
+
+# Nombre -> (fábrica que recibe ops y retorna la función a medir, ops por defecto)
+BENCHMARKS: Dict[str, tuple] = {}
+
+
+def benchmark(name: str, ops: int):
+    """Registra una fábrica de benchmark."""
+    def register(factory: Callable[[int], Callable[[], None]]):
+        BENCHMARKS[name] = (factory, ops)
+        return factory
+    return register
+
+
+class BenchmarkResult(NamedTuple):
+    """Resultado de un benchmark."""
+    name: str
+    ops: int
+    ns_per_op: float
+    ops_per_sec: float
+    peak_bytes: int
+
+
+class Regression(NamedTuple):
+    """Métrica que empeoró más que su umbral respecto a la línea base."""
+    name: str
+    metric: str
+    baseline: float
+    current: float
+    change: float  # Proporción de empeoramiento (0.2 = 20 % peor)
+
+
+def _immortal(name: str, level: int, armor=None) -> Character:
+    return Character(name, 10 ** 12, level, armor=armor)
+
+
+@benchmark("attack", ops=100_000)
+def _bench_attack(ops: int):
+    combat = CombatSystem(StandardDamageCalculator(), CombatLog(capacity=1024))
+    attacker = _immortal("Hero", 7)
+    defender = _immortal("Orc", 5)
+    weapon = Sword()
+    attack = combat.attack
+    
+    def run():
+        for _ in range(ops):
+            attack(attacker, defender, weapon)
+    return run
+
+
+@benchmark("attack_with_armor", ops=100_000)
+def _bench_attack_with_armor(ops: int):
+    combat = CombatSystem(StandardDamageCalculator(), CombatLog(capacity=1024))
+    attacker = _immortal("Hero", 7)
+    defender = _immortal("Knight", 5, PlateArmor())
+    weapon = Sword()
+    attack = combat.attack
+    
+    def run():
+        for _ in range(ops):
+            attack(attacker, defender, weapon)
+    return run
+
+
+@benchmark("attack_fast", ops=100_000)
+def _bench_attack_fast(ops: int):
+    combat = CombatSystem(StandardDamageCalculator(), CombatLog(capacity=1024))
+    attacker = _immortal("Hero", 7)
+    defender = _immortal("Knight", 5, PlateArmor())
+    weapon = Sword()
+    attack_fast = combat.attack_fast
+    out = AttackResult()
+    
+    def run():
+        for _ in range(ops):
+            attack_fast(attacker, defender, weapon, out)
+    return run
+
+
+# Un tick que conserva los resultados de TICK_ATTACKS ataques hasta procesarlos;
+# la memoria pico muestra lo que cuesta cada resultado
+TICK_ATTACKS = 1000
+
+
+@benchmark("attack_tick_results", ops=100_000)
+def _bench_attack_tick_results(ops: int):
+    combat = CombatSystem(StandardDamageCalculator(), CombatLog(capacity=1024))
+    attacker = _immortal("Hero", 7)
+    defender = _immortal("Knight", 5, PlateArmor())
+    weapon = Sword()
+    attack = combat.attack
+    tick = min(ops, TICK_ATTACKS)
+    
+    def run():
+        for _ in range(ops // tick):
+            results = [attack(attacker, defender, weapon) for _ in range(tick)]
+            del results
+    return run
+
+
+@benchmark("attack_fast_tick_results", ops=100_000)
+def _bench_attack_fast_tick_results(ops: int):
+    combat = CombatSystem(StandardDamageCalculator(), CombatLog(capacity=1024))
+    attacker = _immortal("Hero", 7)
+    defender = _immortal("Knight", 5, PlateArmor())
+    weapon = Sword()
+    attack_fast = combat.attack_fast
+    buffers = [AttackResult() for _ in range(min(ops, TICK_ATTACKS))]
+    
+    def run():
+        for _ in range(ops // len(buffers)):
+            for out in buffers:
+                attack_fast(attacker, defender, weapon, out)
+    return run
+
+
+@benchmark("attack_profiled", ops=100_000)
+def _bench_attack_profiled(ops: int):
+    # Perfilado activo: mide la versión instrumentada de attack
+    combat = CombatSystem(StandardDamageCalculator(), CombatLog(capacity=1024))
+    combat.enable_profiling()
+    attacker = _immortal("Hero", 7)
+    defender = _immortal("Knight", 5, PlateArmor())
+    weapon = Sword()
+    attack = combat.attack
+    
+    def run():
+        for _ in range(ops):
+            attack(attacker, defender, weapon)
+    return run
+
+
+@benchmark("attack_profiling_disabled", ops=100_000)
+def _bench_attack_profiling_disabled(ops: int):
+    # Perfilado y oyentes activados y luego quitados; debe costar lo mismo que "attack_with_armor"
+    combat = CombatSystem(StandardDamageCalculator(), CombatLog(capacity=1024))
+    combat.enable_profiling()
+    combat.disable_profiling()
+    hook = CombatMetrics()
+    combat.add_hook(hook)
+    combat.remove_hook(hook)
+    attacker = _immortal("Hero", 7)
+    defender = _immortal("Knight", 5, PlateArmor())
+    weapon = Sword()
+    attack = combat.attack
+    
+    def run():
+        for _ in range(ops):
+            attack(attacker, defender, weapon)
+    return run
+
+
+@benchmark("attack_with_metrics", ops=100_000)
+def _bench_attack_with_metrics(ops: int):
+    combat = CombatSystem(StandardDamageCalculator(), CombatLog(capacity=1024))
+    combat.add_hook(CombatMetrics())
+    attacker = _immortal("Hero", 7)
+    defender = _immortal("Knight", 5, PlateArmor())
+    weapon = Sword()
+    attack = combat.attack
+    
+    def run():
+        for _ in range(ops):
+            attack(attacker, defender, weapon)
+    return run
+
+
+@benchmark("take_damage", ops=200_000)
+def _bench_take_damage(ops: int):
+    character = _immortal("Dummy", 1, _durable(LeatherArmor()))
+    take_damage = character.take_damage
+    
+    def run():
+        for _ in range(ops):
+            take_damage(40)
+    return run
+
+
+def _durable(armor):
+    """Evita que la armadura se agote durante la medición."""
+    armor._durability = 10 ** 12
+    return armor
+
+
+def _absorb_factory(build_armor):
+    def factory(ops: int):
+        armor = build_armor()
+        absorb = armor.absorb_damage
+        
+        def run():
+            for _ in range(ops):
+                absorb(40)
+        return run
+    return factory
+
+
+benchmark("absorb_leather", ops=200_000)(_absorb_factory(lambda: _durable(LeatherArmor())))
+benchmark("absorb_plate", ops=200_000)(_absorb_factory(lambda: _durable(PlateArmor())))
+benchmark("absorb_magic_shield", ops=200_000)(_absorb_factory(lambda: MagicShield(mana=10 ** 9)))
+benchmark("absorb_enchanted", ops=200_000)(
+    _absorb_factory(lambda: _durable(EnchantedArmor(rng=BufferedRandom(0))))
+)
+
+
+def _damage_setup(calculator_cls, armor_factory):
+    calculator = (calculator_cls(rng=BufferedRandom(0)) if calculator_cls is CriticalDamageCalculator
+                  else calculator_cls())
+    return calculator, _immortal("Hero", 7), _immortal("Knight", 5, armor_factory()), Sword()
+
+
+def _damage_methods_factory(calculator_cls, armor_factory):
+    """Golpe por la ruta de métodos: arma, calculador, take_damage y armadura."""
+    def factory(ops: int):
+        calculator, attacker, defender, weapon = _damage_setup(calculator_cls, armor_factory)
+        calculate = calculator.calculate_damage
+        
+        def run():
+            for _ in range(ops):
+                defender.take_damage(calculate(weapon.get_damage(), attacker.level, defender.level))
+        return run
+    return factory
+
+
+def _damage_fused_factory(calculator_cls, armor_factory):
+    """El mismo golpe resuelto por DamagePipeline."""
+    def factory(ops: int):
+        calculator, attacker, defender, weapon = _damage_setup(calculator_cls, armor_factory)
+        attack = DamagePipeline(calculator).attack
+        
+        def run():
+            for _ in range(ops):
+                attack(attacker, defender, weapon)
+        return run
+    return factory
+
+
+def _plate():
+    return _durable(PlateArmor())
+
+
+def _enchanted():
+    return _durable(EnchantedArmor(rng=BufferedRandom(1)))
+
+
+benchmark("damage_methods_plate", ops=200_000)(
+    _damage_methods_factory(StandardDamageCalculator, _plate))
+benchmark("damage_fused_plate", ops=200_000)(
+    _damage_fused_factory(StandardDamageCalculator, _plate))
+benchmark("damage_methods_enchanted", ops=200_000)(
+    _damage_methods_factory(CriticalDamageCalculator, _enchanted))
+benchmark("damage_fused_enchanted", ops=200_000)(
+    _damage_fused_factory(CriticalDamageCalculator, _enchanted))
+
+
+@benchmark("calculator_standard", ops=200_000)
+def _bench_standard(ops: int):
+    calculate = StandardDamageCalculator().calculate_damage
+    
+    def run():
+        for i in range(ops):
+            calculate(50, i & 15, 8)
+    return run
+
+
+@benchmark("calculator_critical", ops=200_000)
+def _bench_critical(ops: int):
+    calculate = CriticalDamageCalculator(rng=BufferedRandom(0)).calculate_damage
+    
+    def run():
+        for i in range(ops):
+            calculate(50, i & 15, 8)
+    return run
+
+
+@benchmark("log_growth", ops=200_000)
+def _bench_log_growth(ops: int):
+    def run():
+        log = CombatLog()
+        append = log.append
+        for i in range(ops):
+            append("Hero", 7, "Orc", 5, "Sword", i & 63)
+    return run
+
+
+@benchmark("many_characters_batch", ops=100_000)
+def _bench_many_characters(ops: int):
+    table = CharacterTable()
+    for i in range(10_000):
+        table.add(f"C{i}", 10 ** 12, 1 + i % 20, LeatherArmor() if i % 3 == 0 else None)
+    attackers = [i % 10_000 for i in range(ops)]
+    defenders = [(i * 7919 + 1) % 10_000 for i in range(ops)]
+    damages = [50] * ops
+    combat = CombatSystem(StandardDamageCalculator())
+    
+    def run():
+        combat.attack_batch(table, attackers, defenders, damages)
+    return run
+
+
+@benchmark("snapshot_table", ops=100_000)
+def _bench_snapshot_table(ops: int):
+    # Una operación es un personaje capturado y serializado
+    table = CharacterTable()
+    armors = (None, LeatherArmor, PlateArmor, MagicShield, EnchantedArmor)
+    for i in range(ops):
+        armor_cls = armors[i % len(armors)]
+        table.add(f"C{i}", 100, 1 + i % 50, armor_cls() if armor_cls else None)
+    
+    def run():
+        snapshot(table).to_bytes()
+    return run
+
+
+@benchmark("catalog_load_json", ops=100_000)
+def _bench_catalog_load(ops: int):
+    # Una operación es una definición cargada desde JSON
+    kinds = list(ARMOR_KINDS)
+    records = []
+    for i in range(ops):
+        if i % 2:
+            records.append({"type": "weapon", "id": f"w{i}", "name": f"Blade {i}",
+                            "damage": 30 + i % 40, "intelligence_bonus": i % 5})
+        else:
+            records.append({"type": "armor", "id": f"a{i}", "name": f"Armor {i}",
+                            "kind": kinds[i // 2 % len(kinds)], "defense": 10 + i % 30})
+    text = json.dumps(records)
+    
+    def run():
+        ItemCatalog().load_json(io.StringIO(text))
+    return run
+
+
+@benchmark("spatial_nearest_enemy", ops=10_000)
+def _bench_spatial_nearest_enemy(ops: int):
+    # 50k unidades repartidas en dos equipos; una operación es una consulta
+    index = SpatialIndex(cell_size=8.0)
+    rng = random.Random(0)
+    units = []
+    for i in range(50_000):
+        unit = Character(f"U{i}", 100, 1)
+        index.insert(unit, rng.uniform(0, 1000), rng.uniform(0, 1000), team=i & 1)
+        units.append(unit)
+    queries = [units[(i * 31) % len(units)] for i in range(ops)]
+    nearest_enemy = index.nearest_enemy
+    
+    def run():
+        for unit in queries:
+            nearest_enemy(unit)
+    return run
+
+
+def run_benchmark(name: str, scale: float = 1.0, repeat: int = 3,
+                  measure_memory: bool = True) -> BenchmarkResult:
+    """
+    Ejecuta un benchmark registrado.
+    
+    Args:
+        name: Nombre registrado
+        scale: Factor sobre las operaciones por defecto
+        repeat: Intentos de tiempo; se reporta el mejor
+        measure_memory: Si es False no se mide la memoria pico (reporta 0)
+    """
+    factory, default_ops = BENCHMARKS[name]
+    ops = max(1, int(default_ops * scale))
+    
+    best = None
+    for _ in range(max(1, repeat)):
+        run = factory(ops)
+        gc.collect()
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter_ns()
+            run()
+            elapsed = time.perf_counter_ns() - start
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    
+    peak = 0
+    if measure_memory:
+        run = factory(ops)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    
+    ns_per_op = best / ops
+    return BenchmarkResult(name, ops, ns_per_op, 1e9 / ns_per_op if ns_per_op else 0.0, peak)
+
+
+def run_suite(names: Optional[List[str]] = None, scale: float = 1.0, repeat: int = 3,
+              measure_memory: bool = True) -> dict:
+    """Ejecuta varios benchmarks y retorna un documento JSON serializable."""
+    results = {}
+    for name in names or list(BENCHMARKS):
+        result = run_benchmark(name, scale, repeat, measure_memory)
+        results[name] = {
+            "ops": result.ops,
+            "ns_per_op": round(result.ns_per_op, 2),
+            "ops_per_sec": round(result.ops_per_sec, 1),
+            "peak_bytes": result.peak_bytes,
+        }
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "scale": scale,
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD,
+            memory_threshold: float = DEFAULT_MEMORY_THRESHOLD,
+            thresholds: Optional[Dict[str, float]] = None) -> List[Regression]:
+    """
+    Compara resultados contra una línea base.
+    
+    Args:
+        current: Documento de run_suite
+        baseline: Documento guardado con el mismo formato
+        threshold: Empeoramiento de ns/op tolerado (0.15 = 15 %)
+        memory_threshold: Empeoramiento de memoria pico tolerado
+        thresholds: Umbral de tiempo por benchmark, para los más ruidosos
+    
+    Returns:
+        Regresiones encontradas; los benchmarks sin línea base se ignoran
+    """
+    thresholds = thresholds or {}
+    regressions = []
+    baseline_results = baseline.get("results", {})
+    for name, result in current.get("results", {}).items():
+        reference = baseline_results.get(name)
+        if reference is None:
+            continue
+        limits = (("ns_per_op", thresholds.get(name, threshold)),
+                  ("peak_bytes", memory_threshold))
+        for metric, limit in limits:
+            before = reference.get(metric)
+            after = result.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            if change > limit:
+                regressions.append(Regression(name, metric, before, after, change))
+    return regressions
+
+
+def _parse_thresholds(values: List[str]) -> Dict[str, float]:
+    thresholds = {}
+    for value in values:
+        name, _, limit = value.partition("=")
+        thresholds[name] = float(limit)
+    return thresholds
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de las rutas críticas del combate")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), default=None)
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Factor sobre las operaciones de cada benchmark")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="No medir la memoria pico")
+    parser.add_argument("--output", help="Ruta donde guardar los resultados en JSON")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Guardar los resultados como nueva línea base")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD)
+    parser.add_argument("--benchmark-threshold", action="append", default=[],
+                        metavar="NOMBRE=UMBRAL", help="Umbral de tiempo para un benchmark")
+    args = parser.parse_args(argv)
+    
+    current = run_suite(args.only, args.scale, args.repeat, not args.no_memory)
+    for name, result in current["results"].items():
+        print(f"{name:24} {result['ns_per_op']:>10.1f} ns/op {result['ops_per_sec']:>12.0f} ops/s "
+              f"{result['peak_bytes'] / 1024:>10.1f} KiB")
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(current, output, indent=2, sort_keys=True)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as output:
+            json.dump(current, output, indent=2, sort_keys=True)
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"Sin línea base en {args.baseline}; use --save-baseline")
+        return 0
+    
+    with open(args.baseline, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions = compare(current, baseline, args.threshold, args.memory_threshold,
+                          _parse_thresholds(args.benchmark_threshold))
+    for regression in regressions:
+        print(f"REGRESIÓN {regression.name} {regression.metric}: "
+              f"{regression.baseline} -> {regression.current} (+{regression.change:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
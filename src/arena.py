@@ -0,0 +1,311 @@
+"""
+Arena asíncrona.
+Aloja muchas partidas en un solo event loop de asyncio. Los clientes
+envían comandos por TCP o por un socket Unix con un protocolo de marcos:
+4 bytes big-endian con el largo y luego un objeto JSON en UTF-8.
+
+Comandos (cada uno con un "id" que se devuelve en la respuesta):
+    {"op": "create_match", "match": "m1", "characters": [
+        {"name": "Hero", "health": 100, "level": 5, "weapon": "sword", "armor": "plate"}]}
+    {"op": "attack", "match": "m1", "attacker": "Hero", "defender": "Villain"}
+    {"op": "status", "match": "m1"}
+    {"op": "end_match", "match": "m1"}
+
+Los ataques que llegan durante un mismo tick del loop se acumulan y se
+resuelven juntos con CombatSystem.attack_batch, una llamada por partida.
+"""
+import asyncio
+import json
+import struct
+from typing import Dict, List, Optional
+
+from src.armor_system import LeatherArmor, PlateArmor, MagicShield, EnchantedArmor
+from src.character_table import CharacterTable
+from src.combat_system import CombatSystem
+from src.damage_calculator import StandardDamageCalculator
+from src.weapons import Sword, Bow, MagicStaff
+
+
+FRAME_HEADER = struct.Struct(">I")
+# Tamaño máximo de un marco; evita reservar memoria por un largo corrupto
+MAX_FRAME_SIZE = 1 << 20
+
+WEAPONS = {
+    "sword": Sword,
+    "bow": Bow,
+    "magic_staff": MagicStaff,
+}
+
+ARMORS = {
+    "leather": LeatherArmor,
+    "plate": PlateArmor,
+    "magic_shield": MagicShield,
+    "enchanted": EnchantedArmor,
+}
+
+
+class ProtocolError(Exception):
+    """Marco o comando inválido."""
+    pass
+
+
+def encode_frame(message: dict) -> bytes:
+    """Serializa un mensaje como marco con prefijo de largo."""
+    payload = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[dict]:
+    """
+    Lee un marco completo.
+    
+    Returns:
+        El mensaje decodificado, o None si la conexión se cerró entre marcos
+    """
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except asyncio.IncompleteReadError as error:
+        if error.partial:
+            raise ProtocolError("Conexión cerrada a mitad de un marco")
+        return None
+    (size,) = FRAME_HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise ProtocolError(f"Marco demasiado grande: {size} bytes")
+    try:
+        payload = await reader.readexactly(size)
+    except asyncio.IncompleteReadError:
+        raise ProtocolError("Conexión cerrada a mitad de un marco")
+    try:
+        message = json.loads(payload)
+    except ValueError:
+        raise ProtocolError("El marco no contiene JSON válido")
+    if not isinstance(message, dict):
+        raise ProtocolError("El mensaje debe ser un objeto JSON")
+    return message
+
+
+class Match:
+    """Una partida: personajes en una tabla por columnas y sus armas."""
+    
+    def __init__(self, match_id: str, combat: CombatSystem):
+        self.match_id = match_id
+        self.combat = combat
+        self.table = CharacterTable()
+        self.rows: Dict[str, int] = {}
+        self.weapon_damages: List[int] = []
+    
+    def add_character(self, spec: dict) -> int:
+        """Agrega un personaje descrito por un dict del protocolo."""
+        name = spec["name"]
+        if name in self.rows:
+            raise ProtocolError(f"Personaje repetido: {name}")
+        weapon_cls = WEAPONS.get(spec.get("weapon", "sword"))
+        if weapon_cls is None:
+            raise ProtocolError(f"Arma desconocida: {spec.get('weapon')}")
+        armor = None
+        if spec.get("armor") is not None:
+            armor_cls = ARMORS.get(spec["armor"])
+            if armor_cls is None:
+                raise ProtocolError(f"Armadura desconocida: {spec['armor']}")
+            armor = armor_cls()
+        row = self.table.add(name, int(spec["health"]), int(spec["level"]), armor)
+        self.rows[name] = row
+        self.weapon_damages.append(weapon_cls().get_damage())
+        return row
+    
+    def row(self, name: str) -> int:
+        row = self.rows.get(name)
+        if row is None:
+            raise ProtocolError(f"Personaje desconocido en {self.match_id}: {name}")
+        return row
+    
+    def status(self) -> dict:
+        """Vida actual de cada personaje."""
+        health = self.table.health
+        return {name: health[row] for name, row in self.rows.items()}
+
+
+class Arena:
+    """
+    Registro de partidas con resolución de ataques por tick.
+    
+    submit_attack() no resuelve nada: encola el ataque y programa un único
+    flush con loop.call_soon, que corre cuando el loop termina de atender
+    los eventos listos de este tick.
+    """
+    
+    def __init__(self, calculator_factory=StandardDamageCalculator):
+        self._calculator_factory = calculator_factory
+        self.matches: Dict[str, Match] = {}
+        self._pending: Dict[str, list] = {}
+        self._flush_scheduled = False
+        self.ticks = 0
+        self.attacks_resolved = 0
+    
+    def create_match(self, match_id: str, characters: List[dict]) -> Match:
+        if match_id in self.matches:
+            raise ProtocolError(f"La partida ya existe: {match_id}")
+        match = Match(match_id, CombatSystem(self._calculator_factory()))
+        for spec in characters:
+            match.add_character(spec)
+        self.matches[match_id] = match
+        return match
+    
+    def end_match(self, match_id: str):
+        self._match(match_id)
+        del self.matches[match_id]
+    
+    def _match(self, match_id: str) -> Match:
+        match = self.matches.get(match_id)
+        if match is None:
+            raise ProtocolError(f"Partida desconocida: {match_id}")
+        return match
+    
+    def submit_attack(self, match_id: str, attacker: str, defender: str) -> asyncio.Future:
+        """
+        Encola un ataque para el próximo flush.
+        
+        Returns:
+            Future con el daño y el estado del defensor
+        """
+        match = self._match(match_id)
+        attacker_row = match.row(attacker)
+        defender_row = match.row(defender)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(match_id, []).append((attacker_row, defender_row, future))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self.flush)
+        return future
+    
+    def flush(self):
+        """Resuelve todos los ataques pendientes, un lote por partida."""
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        self.ticks += 1
+        for match_id, attacks in pending.items():
+            match = self.matches.get(match_id)
+            if match is None:
+                for _, _, future in attacks:
+                    if not future.done():
+                        future.set_exception(ProtocolError(f"Partida terminada: {match_id}"))
+                continue
+            
+            attackers = [attack[0] for attack in attacks]
+            defenders = [attack[1] for attack in attacks]
+            weapon_damages = match.weapon_damages
+            health = []
+            try:
+                damages = match.combat.attack_batch(
+                    match.table, attackers, defenders,
+                    [weapon_damages[row] for row in attackers], health
+                )
+            except Exception as error:
+                # Un lote fallido no deja esperando a sus clientes ni frena
+                # a las demás partidas
+                for _, _, future in attacks:
+                    if not future.done():
+                        failure = ProtocolError(f"Error al resolver el tick de {match_id}: {error}")
+                        failure.__cause__ = error
+                        future.set_exception(failure)
+                continue
+            # Cada respuesta ve la vida del defensor justo después de su ataque
+            for (_, _, future), damage, remaining in zip(attacks, damages, health):
+                if not future.done():
+                    future.set_result({
+                        "damage": damage,
+                        "defender_health": remaining,
+                        "defender_alive": remaining > 0,
+                    })
+            self.attacks_resolved += len(attacks)
+    
+    async def handle(self, command: dict) -> dict:
+        """Ejecuta un comando del protocolo y retorna su respuesta."""
+        op = command.get("op")
+        if op == "attack":
+            return await self.submit_attack(
+                command["match"], command["attacker"], command["defender"]
+            )
+        if op == "create_match":
+            match = self.create_match(command["match"], command.get("characters", []))
+            return {"match": match.match_id, "characters": len(match.table)}
+        if op == "status":
+            return {"health": self._match(command["match"]).status()}
+        if op == "end_match":
+            self.end_match(command["match"])
+            return {}
+        raise ProtocolError(f"Operación desconocida: {op}")
+
+
+class ArenaServer:
+    """
+    Servidor del protocolo de marcos sobre una Arena.
+    
+    Cada conexión puede enviar varios comandos sin esperar respuesta; las
+    respuestas llevan el "id" del comando y pueden llegar en otro orden.
+    """
+    
+    def __init__(self, arena: Optional[Arena] = None):
+        self.arena = arena or Arena()
+        self._server: Optional[asyncio.AbstractServer] = None
+    
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0):
+        """Escucha por TCP (port=0 elige un puerto libre) y retorna la dirección."""
+        self._server = await asyncio.start_server(self._serve_connection, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+    
+    async def start_unix(self, path: str) -> str:
+        """Escucha en un socket Unix."""
+        self._server = await asyncio.start_unix_server(self._serve_connection, path)
+        return path
+    
+    async def serve_forever(self):
+        await self._server.serve_forever()
+    
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+    
+    async def _respond(self, command: dict, writer: asyncio.StreamWriter):
+        response = {"id": command.get("id")}
+        try:
+            response["result"] = await self.arena.handle(command)
+            response["ok"] = True
+        except (ProtocolError, KeyError, TypeError, ValueError) as error:
+            response["ok"] = False
+            response["error"] = str(error) if not isinstance(error, KeyError) else (
+                f"Falta el campo {error}"
+            )
+        if not writer.is_closing():
+            writer.write(encode_frame(response))
+    
+    async def _serve_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter):
+        tasks = set()
+        try:
+            while True:
+                try:
+                    command = await read_frame(reader)
+                except ProtocolError as error:
+                    writer.write(encode_frame({"id": None, "ok": False, "error": str(error)}))
+                    break
+                if command is None:
+                    break
+                task = asyncio.ensure_future(self._respond(command, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                if writer.transport.get_write_buffer_size() > MAX_FRAME_SIZE:
+                    await writer.drain()
+            if tasks:
+                await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
\ No newline at end of file
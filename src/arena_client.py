@@ -0,0 +1,187 @@
+"""
+Cliente asíncrono de la arena y prueba de carga.
+
+Uso desde la línea de comandos (levanta un servidor local si no se indica uno):
+    python -m src.arena_client --matches 1000 --attacks 20
+"""
+import argparse
+import asyncio
+import itertools
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from src.arena import ArenaServer, ProtocolError, encode_frame, read_frame
+
+
+class ArenaClient:
+    """
+    Conexión a un ArenaServer.
+    Permite tener muchos comandos en vuelo: las respuestas se emparejan por id.
+    """
+    
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count()
+        self._waiting: Dict[int, asyncio.Future] = {}
+        self._receiver = asyncio.ensure_future(self._receive())
+    
+    @classmethod
+    async def connect_tcp(cls, host: str, port: int) -> "ArenaClient":
+        return cls(*await asyncio.open_connection(host, port))
+    
+    @classmethod
+    async def connect_unix(cls, path: str) -> "ArenaClient":
+        return cls(*await asyncio.open_unix_connection(path))
+    
+    async def _receive(self):
+        error: Exception = ConnectionError("Conexión cerrada por el servidor")
+        try:
+            while True:
+                response = await read_frame(self._reader)
+                if response is None:
+                    break
+                future = self._waiting.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except (ProtocolError, ConnectionError) as exc:
+            error = exc
+        for future in self._waiting.values():
+            if not future.done():
+                future.set_exception(error)
+        self._waiting.clear()
+    
+    async def request(self, command: dict) -> dict:
+        """
+        Envía un comando y espera su resultado.
+        
+        Raises:
+            ProtocolError: Si el servidor rechazó el comando
+        """
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        self._writer.write(encode_frame(dict(command, id=request_id)))
+        await self._writer.drain()
+        response = await future
+        if not response.get("ok"):
+            raise ProtocolError(response.get("error", "Error desconocido"))
+        return response["result"]
+    
+    async def create_match(self, match_id: str, characters: List[dict]) -> dict:
+        return await self.request({"op": "create_match", "match": match_id,
+                                   "characters": characters})
+    
+    async def attack(self, match_id: str, attacker: str, defender: str) -> dict:
+        return await self.request({"op": "attack", "match": match_id,
+                                   "attacker": attacker, "defender": defender})
+    
+    async def status(self, match_id: str) -> dict:
+        return (await self.request({"op": "status", "match": match_id}))["health"]
+    
+    async def close(self):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self._receiver
+
+
+class LoadTestReport(NamedTuple):
+    """Resultado de una prueba de carga (latencias en milisegundos)."""
+    requests: int
+    elapsed: float
+    p50: float
+    p99: float
+    max: float
+    
+    def throughput(self) -> float:
+        """Comandos por segundo."""
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Percentil por rango más cercano de una lista ordenada."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+async def _play_match(client: ArenaClient, match_id: str, attacks: int,
+                      latencies: List[float]):
+    await client.create_match(match_id, [
+        {"name": "A", "health": 10 ** 9, "level": 5, "weapon": "sword", "armor": "plate"},
+        {"name": "B", "health": 10 ** 9, "level": 5, "weapon": "bow", "armor": "leather"},
+    ])
+    pairs = (("A", "B"), ("B", "A"))
+    clock = time.perf_counter
+    for turn in range(attacks):
+        attacker, defender = pairs[turn % 2]
+        start = clock()
+        await client.attack(match_id, attacker, defender)
+        latencies.append((clock() - start) * 1000.0)
+    await client.request({"op": "end_match", "match": match_id})
+
+
+async def load_test(host: Optional[str] = None, port: Optional[int] = None,
+                    unix_path: Optional[str] = None, matches: int = 100,
+                    attacks: int = 20, connections: int = 8) -> LoadTestReport:
+    """
+    Juega muchas partidas concurrentes contra un servidor y mide la latencia
+    de cada ataque. Las partidas se reparten entre varias conexiones.
+    """
+    if unix_path is not None:
+        clients = [await ArenaClient.connect_unix(unix_path) for _ in range(connections)]
+    else:
+        clients = [await ArenaClient.connect_tcp(host, port) for _ in range(connections)]
+    latencies: List[float] = []
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            _play_match(clients[index % connections], f"load-{index}", attacks, latencies)
+            for index in range(matches)
+        ))
+    finally:
+        for client in clients:
+            await client.close()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return LoadTestReport(
+        len(latencies), elapsed, percentile(latencies, 0.50), percentile(latencies, 0.99),
+        latencies[-1] if latencies else 0.0
+    )
+
+
+async def _main(args):
+    server = None
+    host, port = args.host, args.port
+    if args.unix is None and port is None:
+        server = ArenaServer()
+        host, port = await server.start_tcp()
+    try:
+        report = await load_test(host, port, args.unix, args.matches, args.attacks,
+                                 args.connections)
+    finally:
+        if server is not None:
+            await server.close()
+    print(f"{report.requests} ataques en {report.elapsed:.2f}s "
+          f"({report.throughput():.0f}/s) p50={report.p50:.3f}ms "
+          f"p99={report.p99:.3f}ms max={report.max:.3f}ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga de la arena")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None,
+                        help="Servidor existente; sin esto se levanta uno local")
+    parser.add_argument("--unix", default=None, help="Ruta de un socket Unix")
+    parser.add_argument("--matches", type=int, default=1000)
+    parser.add_argument("--attacks", type=int, default=20)
+    parser.add_argument("--connections", type=int, default=8)
+    asyncio.run(_main(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,269 @@
+"""
+Bancos de armaduras.
+Guardan el estado de muchas armaduras del mismo tipo en arreglos tipados y
+absorben vectores de daño completos, con las mismas reglas que las clases
+de src/armor_system.py. Cada fila se puede usar como un objeto Armor normal
+a través de una vista.
+"""
+import random
+from abc import ABC, abstractmethod
+from array import array
+from typing import List, Optional, Sequence
+
+from src.armor_system import LeatherArmor, PlateArmor, MagicShield, EnchantedArmor
+from src.rng import DefaultRandomState
+
+
+def _column_property(column: str, convert=None):
+    """Propiedad que lee y escribe la fila de la vista en una columna del banco."""
+    def getter(self):
+        value = getattr(self._bank, column)[self._row]
+        return convert(value) if convert else value
+    
+    def setter(self, value):
+        getattr(self._bank, column)[self._row] = value
+    
+    return property(getter, setter)
+
+
+class LeatherArmorView(LeatherArmor):
+    """Armadura de cuero respaldada por una fila de LeatherArmorBank."""
+    
+    def __init__(self, bank: "LeatherArmorBank", row: int):
+        self._bank = bank
+        self._row = row
+    
+    _defense = _column_property("defense")
+    _durability = _column_property("durability")
+
+
+class PlateArmorView(PlateArmor):
+    """Armadura de placas respaldada por una fila de PlateArmorBank."""
+    
+    def __init__(self, bank: "PlateArmorBank", row: int):
+        self._bank = bank
+        self._row = row
+    
+    _defense = _column_property("defense")
+    _durability = _column_property("durability")
+
+
+class MagicShieldView(MagicShield):
+    """Escudo mágico respaldado por una fila de MagicShieldBank."""
+    
+    def __init__(self, bank: "MagicShieldBank", row: int):
+        self._bank = bank
+        self._row = row
+    
+    _defense = _column_property("defense")
+    _mana = _column_property("mana")
+    _max_mana = _column_property("max_mana")
+
+
+class EnchantedArmorView(EnchantedArmor):
+    """Armadura encantada respaldada por una fila de EnchantedArmorBank."""
+    
+    def __init__(self, bank: "EnchantedArmorBank", row: int):
+        self._bank = bank
+        self._row = row
+    
+    _defense = _column_property("defense")
+    _durability = _column_property("durability")
+    _reflect_chance = _column_property("reflect_chance")
+    _last_reflected = _column_property("last_reflected", bool)
+    
+    @property
+    def rng(self):
+        """Las vistas comparten la fuente aleatoria del banco."""
+        return self._bank.rng
+    
+    @rng.setter
+    def rng(self, value):
+        self._bank.rng = value
+
+
+class ArmorBank(ABC):
+    """
+    Base de los bancos de armaduras.
+    
+    Las subclases definen las columnas y absorb(); la base se encarga de
+    las vistas y de validar los lotes.
+    """
+    
+    view_cls = None
+    
+    def __init__(self):
+        self.defense = array("q")
+    
+    def __len__(self) -> int:
+        return len(self.defense)
+    
+    def view(self, row: int):
+        """Retorna un objeto Armor que lee y escribe la fila indicada."""
+        if not 0 <= row < len(self):
+            raise IndexError("Fila fuera de rango")
+        return self.view_cls(self, row)
+    
+    def _rows(self, damages: Sequence[int], rows: Optional[Sequence[int]]) -> Sequence[int]:
+        if rows is None:
+            if len(damages) != len(self):
+                raise ValueError("Sin rows, damages debe tener una entrada por fila")
+            return range(len(self))
+        if len(rows) != len(damages):
+            raise ValueError("rows y damages deben tener la misma longitud")
+        return rows
+    
+    @abstractmethod
+    def absorb(self, damages: Sequence[int], rows: Optional[Sequence[int]] = None) -> List[int]:
+        """
+        Absorbe un vector de daños.
+        
+        Args:
+            damages: Daño entrante de cada golpe
+            rows: Fila que recibe cada golpe (pueden repetirse y se aplican en
+                orden); si se omite, el golpe i va a la fila i
+        
+        Returns:
+            Daño después de la absorción para cada golpe
+        """
+        pass
+
+
+class _DurabilityArmorBank(ArmorBank):
+    """Banco para armaduras que absorben un porcentaje fijo y se desgastan por golpe."""
+    
+    armor_cls = None
+    
+    def __init__(self):
+        super().__init__()
+        self.durability = array("q")
+    
+    def add(self, defense: Optional[int] = None, durability: Optional[int] = None) -> int:
+        """Agrega una armadura nueva y retorna su fila."""
+        template = self.armor_cls() if defense is None else self.armor_cls(defense)
+        self.defense.append(template.get_defense())
+        self.durability.append(template._durability if durability is None else durability)
+        return len(self) - 1
+    
+    def absorb(self, damages: Sequence[int], rows: Optional[Sequence[int]] = None) -> List[int]:
+        rows = self._rows(damages, rows)
+        rate = self.armor_cls.ABSORPTION_RATE
+        cost = self.armor_cls.DURABILITY_COST
+        durability = self.durability
+        results = []
+        for row, incoming in zip(rows, damages):
+            current = durability[row]
+            if current <= 0:
+                results.append(incoming)
+                continue
+            absorbed = int(incoming * rate)
+            durability[row] = current - cost if current > cost else 0
+            results.append(incoming - absorbed if incoming > absorbed else 0)
+        return results
+
+
+class LeatherArmorBank(_DurabilityArmorBank):
+    """Banco de armaduras de cuero."""
+    
+    armor_cls = LeatherArmor
+    view_cls = LeatherArmorView
+
+
+class PlateArmorBank(_DurabilityArmorBank):
+    """Banco de armaduras de placas."""
+    
+    armor_cls = PlateArmor
+    view_cls = PlateArmorView
+
+
+class MagicShieldBank(ArmorBank):
+    """Banco de escudos mágicos."""
+    
+    view_cls = MagicShieldView
+    
+    def __init__(self):
+        super().__init__()
+        self.mana = array("q")
+        self.max_mana = array("q")
+    
+    def add(self, defense: int = 20, mana: int = 100) -> int:
+        """Agrega un escudo nuevo con el maná al máximo y retorna su fila."""
+        self.defense.append(defense)
+        self.mana.append(mana)
+        self.max_mana.append(mana)
+        return len(self) - 1
+    
+    def absorb(self, damages: Sequence[int], rows: Optional[Sequence[int]] = None) -> List[int]:
+        rows = self._rows(damages, rows)
+        base = MagicShield.BASE_ABSORPTION
+        per_mana = MagicShield.MANA_ABSORPTION
+        mana = self.mana
+        max_mana = self.max_mana
+        results = []
+        for row, incoming in zip(rows, damages):
+            current = mana[row]
+            if current <= 0:
+                results.append(incoming)
+                continue
+            absorption_rate = base + ((current / max_mana[row]) * per_mana)
+            absorbed = int(incoming * absorption_rate)
+            mana_cost = absorbed // 2
+            mana[row] = current - mana_cost if mana_cost < current else 0
+            results.append(incoming - absorbed if incoming > absorbed else 0)
+        return results
+    
+    def recharge_mana(self, amount: int, rows: Optional[Sequence[int]] = None):
+        """Recarga el maná de varias filas (todas si se omite rows)."""
+        mana = self.mana
+        max_mana = self.max_mana
+        for row in (range(len(self)) if rows is None else rows):
+            recharged = mana[row] + amount
+            cap = max_mana[row]
+            mana[row] = recharged if recharged < cap else cap
+
+
+class EnchantedArmorBank(DefaultRandomState, ArmorBank):
+    """
+    Banco de armaduras encantadas.
+    Todas las filas comparten una fuente aleatoria que se consume en el orden
+    de los golpes, igual que las vistas.
+    """
+    
+    view_cls = EnchantedArmorView
+    
+    def __init__(self, rng=None):
+        super().__init__()
+        self.durability = array("q")
+        self.reflect_chance = array("d")
+        self.last_reflected = array("b")
+        self.rng = rng if rng is not None else random
+    
+    def add(self, defense: int = 25) -> int:
+        """Agrega una armadura nueva y retorna su fila."""
+        self.defense.append(defense)
+        self.durability.append(EnchantedArmor.MAX_DURABILITY)
+        self.reflect_chance.append(0.15)
+        self.last_reflected.append(0)
+        return len(self) - 1
+    
+    def absorb(self, damages: Sequence[int], rows: Optional[Sequence[int]] = None) -> List[int]:
+        rows = self._rows(damages, rows)
+        reflect_rate = EnchantedArmor.REFLECT_ABSORPTION_RATE
+        normal_rate = EnchantedArmor.ABSORPTION_RATE
+        cost = EnchantedArmor.DURABILITY_COST
+        durability = self.durability
+        reflect_chance = self.reflect_chance
+        last_reflected = self.last_reflected
+        draw = self.rng.random
+        results = []
+        for row, incoming in zip(rows, damages):
+            current = durability[row]
+            if current <= 0:
+                results.append(incoming)
+                continue
+            reflected = draw() < reflect_chance[row]
+            last_reflected[row] = reflected
+            absorbed = int(incoming * (reflect_rate if reflected else normal_rate))
+            durability[row] = current - cost if current > cost else 0
+            results.append(incoming - absorbed if incoming > absorbed else 0)
+        return results
\ No newline at end of file
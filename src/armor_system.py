@@ -2,21 +2,56 @@
 Sistema de armadura - Nueva funcionalidad para el laboratorio.
 Implementa diferentes tipos de armadura con distintas mecánicas de absorción.
 """
+import random
+
 from src.interfaces import Armor
+from src.rng import DefaultRandomState, draw_many
+
+
+class _CatalogArmor:
+    """
+    Plantilla del catálogo de las armaduras estándar. El nombre se resuelve al
+    asignar la plantilla, así get_name() no la consulta en cada llamada.
+    """
+    
+    _name = None  # Nombre por defecto, definido en cada clase
+    _template = None
+    
+    @property
+    def template(self):
+        """ArmorTemplate si la armadura viene del catálogo, o None."""
+        return self._template
+    
+    @template.setter
+    def template(self, template):
+        self._template = template
+        if template is None:
+            self.__dict__.pop("_name", None)
+        else:
+            self._name = template.name
+    
+    def get_name(self) -> str:
+        return self._name
 
 
-class LeatherArmor(Armor):
+class LeatherArmor(_CatalogArmor, Armor):
     """Armadura de cuero - protección ligera."""
     
+    ABSORPTION_RATE = 0.2  # 20% de absorción
+    DURABILITY_COST = 1
+    MAX_DURABILITY = 100
+    _name = "Leather Armor"
+    
     def __init__(self, defense: int = 10):
         self._defense = defense
-        self._durability = 100
+        self._durability = self.MAX_DURABILITY
     
     def get_defense(self) -> int:
         return self._defense
     
-    def get_name(self) -> str:
-        return "Leather Armor"
+    def is_broken(self) -> bool:
+        """Verifica si la armadura se agotó y ya no absorbe daño."""
+        return self._durability <= 0
     
     def absorb_damage(self, incoming_damage: int) -> int:
         """
@@ -25,24 +60,45 @@ class LeatherArmor(Armor):
         if self._durability <= 0:
             return incoming_damage
         
-        absorbed = int(incoming_damage * 0.2)  # 20% de absorción
-        self._durability = max(0, self._durability - 1)
+        absorbed = int(incoming_damage * self.ABSORPTION_RATE)
+        self._durability = max(0, self._durability - self.DURABILITY_COST)
         
         return max(0, incoming_damage - absorbed)
+    
+    def absorb_damage_n(self, incoming_damage: int, n: int) -> int:
+        """
+        Aplica n golpes idénticos en O(1).
+        Los primeros golpes absorben mientras haya durabilidad; el resto pasa completo.
+        """
+        if n <= 0:
+            return 0
+        durability = self._durability
+        absorbing = 0
+        if durability > 0:
+            absorbing = min(n, -(-durability // self.DURABILITY_COST))
+        passed = max(0, incoming_damage - int(incoming_damage * self.ABSORPTION_RATE))
+        self._durability = max(0, durability - absorbing * self.DURABILITY_COST)
+        return absorbing * passed + (n - absorbing) * incoming_damage
 
 
-class PlateArmor(Armor):
+class PlateArmor(_CatalogArmor, Armor):
     """Armadura de placas - protección pesada."""
     
+    ABSORPTION_RATE = 0.5  # 50% de absorción
+    DURABILITY_COST = 2
+    MAX_DURABILITY = 200
+    _name = "Plate Armor"
+    
     def __init__(self, defense: int = 30):
         self._defense = defense
-        self._durability = 200
+        self._durability = self.MAX_DURABILITY
     
     def get_defense(self) -> int:
         return self._defense
     
-    def get_name(self) -> str:
-        return "Plate Armor"
+    def is_broken(self) -> bool:
+        """Verifica si la armadura se agotó y ya no absorbe daño."""
+        return self._durability <= 0
     
     def absorb_damage(self, incoming_damage: int) -> int:
         """
@@ -51,15 +107,34 @@ class PlateArmor(Armor):
         if self._durability <= 0:
             return incoming_damage
         
-        absorbed = int(incoming_damage * 0.5)  # 50% de absorción
-        self._durability = max(0, self._durability - 2)
+        absorbed = int(incoming_damage * self.ABSORPTION_RATE)
+        self._durability = max(0, self._durability - self.DURABILITY_COST)
         
         return max(0, incoming_damage - absorbed)
+    
+    def absorb_damage_n(self, incoming_damage: int, n: int) -> int:
+        """
+        Aplica n golpes idénticos en O(1).
+        Los primeros golpes absorben mientras haya durabilidad; el resto pasa completo.
+        """
+        if n <= 0:
+            return 0
+        durability = self._durability
+        absorbing = 0
+        if durability > 0:
+            absorbing = min(n, -(-durability // self.DURABILITY_COST))
+        passed = max(0, incoming_damage - int(incoming_damage * self.ABSORPTION_RATE))
+        self._durability = max(0, durability - absorbing * self.DURABILITY_COST)
+        return absorbing * passed + (n - absorbing) * incoming_damage
 
 
-class MagicShield(Armor):
+class MagicShield(_CatalogArmor, Armor):
     """Escudo mágico - protección adaptativa."""
     
+    BASE_ABSORPTION = 0.3
+    MANA_ABSORPTION = 0.4  # 30-70% según maná
+    _name = "Magic Shield"
+    
     def __init__(self, defense: int = 20, mana: int = 100):
         self._defense = defense
         self._mana = mana
@@ -68,8 +143,9 @@ class MagicShield(Armor):
     def get_defense(self) -> int:
         return self._defense
     
-    def get_name(self) -> str:
-        return "Magic Shield"
+    def is_broken(self) -> bool:
+        """Verifica si el escudo se quedó sin maná y ya no absorbe daño."""
+        return self._mana <= 0
     
     def absorb_damage(self, incoming_damage: int) -> int:
         """
@@ -80,7 +156,7 @@ class MagicShield(Armor):
         
         # Porcentaje de absorción basado en maná disponible
         mana_ratio = self._mana / self._max_mana
-        absorption_rate = 0.3 + (mana_ratio * 0.4)  # 30-70% según maná
+        absorption_rate = self.BASE_ABSORPTION + (mana_ratio * self.MANA_ABSORPTION)
         
         absorbed = int(incoming_damage * absorption_rate)
         mana_cost = min(self._mana, absorbed // 2)
@@ -88,6 +164,34 @@ class MagicShield(Armor):
         
         return max(0, incoming_damage - absorbed)
     
+    def absorb_damage_n(self, incoming_damage: int, n: int) -> int:
+        """
+        Aplica n golpes idénticos.
+        
+        Solo se recorren los golpes que gastan maná, así que el costo está
+        acotado por el maná y no por n: cuando el costo por golpe llega a 0
+        el escudo queda en un punto fijo y el resto se resuelve de una vez.
+        """
+        total = 0
+        remaining = n
+        mana = self._mana
+        max_mana = self._max_mana
+        while remaining > 0 and mana > 0:
+            mana_ratio = mana / max_mana
+            absorption_rate = self.BASE_ABSORPTION + (mana_ratio * self.MANA_ABSORPTION)
+            absorbed = int(incoming_damage * absorption_rate)
+            passed = max(0, incoming_damage - absorbed)
+            mana_cost = min(mana, absorbed // 2)
+            if mana_cost == 0:
+                total += remaining * passed
+                remaining = 0
+                break
+            mana = max(0, mana - mana_cost)
+            total += passed
+            remaining -= 1
+        self._mana = mana
+        return total + remaining * incoming_damage
+    
     def recharge_mana(self, amount: int):
         """Recarga el maná del escudo."""
         self._mana = min(self._max_mana, self._mana + amount)
@@ -97,44 +201,76 @@ class MagicShield(Armor):
         return self._mana
 
 
-class EnchantedArmor(Armor):
+class EnchantedArmor(DefaultRandomState, _CatalogArmor, Armor):
     """Armadura encantada - protección con efectos especiales."""
     
-    def __init__(self, defense: int = 25):
+    ABSORPTION_RATE = 0.35  # Absorción normal
+    REFLECT_ABSORPTION_RATE = 0.7  # Refleja 30% y absorbe 40% adicional
+    DURABILITY_COST = 1
+    MAX_DURABILITY = 150
+    _name = "Enchanted Armor"
+    
+    def __init__(self, defense: int = 25, rng=None):
         self._defense = defense
-        self._durability = 150
+        self._durability = self.MAX_DURABILITY
         self._reflect_chance = 0.15  # 15% de chance de reflejar
         self._last_reflected = False
+        # Fuente aleatoria inyectable; por defecto el generador global
+        self.rng = rng if rng is not None else random
     
     def get_defense(self) -> int:
         return self._defense
     
-    def get_name(self) -> str:
-        return "Enchanted Armor"
+    def is_broken(self) -> bool:
+        """Verifica si la armadura se agotó y ya no absorbe daño."""
+        return self._durability <= 0
     
     def absorb_damage(self, incoming_damage: int) -> int:
         """
         Absorbe daño y tiene chance de reflejar parte del mismo.
         """
-        import random
-        
         if self._durability <= 0:
             return incoming_damage
         
         # Chance de reflejar daño
-        self._last_reflected = random.random() < self._reflect_chance
+        self._last_reflected = self.rng.random() < self._reflect_chance
         
         if self._last_reflected:
             # Refleja 30% del daño y absorbe 40% adicional
-            absorbed = int(incoming_damage * 0.7)
-            self._durability = max(0, self._durability - 1)
+            absorbed = int(incoming_damage * self.REFLECT_ABSORPTION_RATE)
+            self._durability = max(0, self._durability - self.DURABILITY_COST)
             return max(0, incoming_damage - absorbed)
         else:
             # Absorción normal de 35%
-            absorbed = int(incoming_damage * 0.35)
-            self._durability = max(0, self._durability - 1)
+            absorbed = int(incoming_damage * self.ABSORPTION_RATE)
+            self._durability = max(0, self._durability - self.DURABILITY_COST)
             return max(0, incoming_damage - absorbed)
     
+    def absorb_damage_n(self, incoming_damage: int, n: int) -> int:
+        """
+        Aplica n golpes idénticos tomando todos los números aleatorios de una vez.
+        Consume el flujo aleatorio igual que n llamadas a absorb_damage.
+        """
+        if n <= 0:
+            return 0
+        durability = self._durability
+        absorbing = 0
+        if durability > 0:
+            absorbing = min(n, -(-durability // self.DURABILITY_COST))
+        total = (n - absorbing) * incoming_damage
+        if absorbing == 0:
+            return total
+        
+        chance = self._reflect_chance
+        draws = draw_many(self.rng, absorbing)
+        reflected = sum(1 for draw in draws if draw < chance)
+        self._last_reflected = draws[-1] < chance
+        self._durability = max(0, durability - absorbing * self.DURABILITY_COST)
+        
+        reflected_pass = max(0, incoming_damage - int(incoming_damage * self.REFLECT_ABSORPTION_RATE))
+        normal_pass = max(0, incoming_damage - int(incoming_damage * self.ABSORPTION_RATE))
+        return total + reflected * reflected_pass + (absorbing - reflected) * normal_pass
+    
     def did_reflect(self) -> bool:
         """Verifica si el último ataque fue reflejado."""
         return self._last_reflected
@@ -158,4 +294,12 @@ class DummyArmor(Armor):
         """Absorbe un porcentaje fijo del daño."""
         self.damage_received_count += 1
         absorbed = int(incoming_damage * self._absorption_rate)
-        return max(0, incoming_damage - absorbed)
\ No newline at end of file
+        return max(0, incoming_damage - absorbed)
+    
+    def absorb_damage_n(self, incoming_damage: int, n: int) -> int:
+        """Absorbe n golpes idénticos en O(1)."""
+        if n <= 0:
+            return 0
+        self.damage_received_count += n
+        absorbed = int(incoming_damage * self._absorption_rate)
+        return n * max(0, incoming_damage - absorbed)
\ No newline at end of file
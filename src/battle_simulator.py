@@ -0,0 +1,193 @@
+"""
+Simulador Monte Carlo de duelos.
+Reparte millones de duelos entre un pool de procesos y agrega sus
+estadísticas; cada duelo usa sus propios flujos aleatorios, así el
+resultado no depende de la cantidad de procesos.
+"""
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+from src.combat_system import Character, CombatSystem
+from src.combat_log import CombatLog
+from src.damage_calculator import StandardDamageCalculator
+from src.interfaces import Weapon
+from src.rng import RandomStreams, derive_seed
+from src.weapons import Sword
+
+
+# Duelos por tarea; fijo para que el reparto no dependa de la cantidad de procesos
+CHUNK_SIZE = 1000
+
+
+def duel_seed(seed: int, index: int) -> int:
+    """Deriva la semilla de un duelo a partir de la semilla global."""
+    return derive_seed(seed, "duel", index)
+
+
+class CombatantSpec:
+    """
+    Descripción de un combatiente para la simulación.
+    Usa clases y argumentos en lugar de objetos para poder enviarse a otros procesos.
+    """
+    
+    def __init__(self, name: str, health: int, level: int, weapon_cls=Sword,
+                 weapon_kwargs: Optional[dict] = None, armor_cls=None,
+                 armor_kwargs: Optional[dict] = None):
+        self.name = name
+        self.health = health
+        self.level = level
+        self.weapon_cls = weapon_cls
+        self.weapon_kwargs = weapon_kwargs or {}
+        self.armor_cls = armor_cls
+        self.armor_kwargs = armor_kwargs or {}
+    
+    def build(self) -> Tuple[Character, Weapon]:
+        """Crea un personaje nuevo y su arma."""
+        armor = self.armor_cls(**self.armor_kwargs) if self.armor_cls else None
+        character = Character(self.name, self.health, self.level, armor=armor)
+        return character, self.weapon_cls(**self.weapon_kwargs)
+
+
+class DuelConfig:
+    """Configuración de un duelo: dos combatientes y el calculador de daño."""
+    
+    def __init__(self, challenger: CombatantSpec, opponent: CombatantSpec,
+                 calculator_cls=StandardDamageCalculator,
+                 calculator_kwargs: Optional[dict] = None,
+                 max_turns: int = 1000, damage_bucket: int = 10):
+        """
+        Args:
+            challenger: Combatiente que ataca primero
+            opponent: Combatiente que responde
+            calculator_cls: Clase del calculador de daño
+            calculator_kwargs: Argumentos del calculador
+            max_turns: Ataques máximos antes de declarar empate
+            damage_bucket: Ancho de los intervalos del histograma de daño
+        """
+        self.challenger = challenger
+        self.opponent = opponent
+        self.calculator_cls = calculator_cls
+        self.calculator_kwargs = calculator_kwargs or {}
+        self.max_turns = max_turns
+        self.damage_bucket = damage_bucket
+
+
+class DuelStats:
+    """Estadísticas agregadas de un conjunto de duelos."""
+    
+    def __init__(self):
+        self.duels = 0
+        self.wins = Counter()
+        # Ataques hasta la muerte -> cantidad de duelos
+        self.time_to_kill = Counter()
+        # Inicio del intervalo de daño por golpe -> cantidad de golpes
+        self.damage_histogram = Counter()
+    
+    def merge(self, other: "DuelStats"):
+        """Suma las estadísticas de otro conjunto de duelos."""
+        self.duels += other.duels
+        self.wins.update(other.wins)
+        self.time_to_kill.update(other.time_to_kill)
+        self.damage_histogram.update(other.damage_histogram)
+    
+    def win_rates(self) -> dict:
+        """Porcentaje de victorias de cada resultado (challenger, opponent, draw)."""
+        if not self.duels:
+            return {}
+        return {outcome: count / self.duels for outcome, count in self.wins.items()}
+    
+    def mean_time_to_kill(self) -> float:
+        """Promedio de ataques hasta la muerte en los duelos sin empate."""
+        finished = sum(self.time_to_kill.values())
+        if not finished:
+            return 0.0
+        return sum(turns * count for turns, count in self.time_to_kill.items()) / finished
+    
+    def __eq__(self, other):
+        if not isinstance(other, DuelStats):
+            return NotImplemented
+        return (self.duels, self.wins, self.time_to_kill, self.damage_histogram) == (
+            other.duels, other.wins, other.time_to_kill, other.damage_histogram
+        )
+
+
+def run_duel(config: DuelConfig, combat: CombatSystem, stats: DuelStats,
+             streams: Optional[RandomStreams] = None):
+    """
+    Ejecuta un duelo y acumula su resultado en stats.
+    
+    Si se indican streams, el calculador y las armaduras que usan azar
+    reciben cada uno su propio flujo derivado de la semilla del duelo.
+    """
+    challenger, challenger_weapon = config.challenger.build()
+    opponent, opponent_weapon = config.opponent.build()
+    if streams is not None:
+        for key, component in (("calculator", combat.damage_calculator),
+                               ("challenger", challenger.armor),
+                               ("opponent", opponent.armor)):
+            if hasattr(component, "rng"):
+                component.rng = streams.stream(key)
+    turns = (
+        (challenger, opponent, challenger_weapon, "challenger"),
+        (opponent, challenger, opponent_weapon, "opponent"),
+    )
+    bucket = config.damage_bucket
+    
+    outcome = "draw"
+    turn = 0
+    while turn < config.max_turns:
+        attacker, defender, weapon, side = turns[turn % 2]
+        turn += 1
+        result = combat.attack(attacker, defender, weapon)
+        stats.damage_histogram[result["damage"] // bucket * bucket] += 1
+        if not result["defender_alive"]:
+            outcome = side
+            stats.time_to_kill[turn] += 1
+            break
+    
+    stats.duels += 1
+    stats.wins[outcome] += 1
+    combat.clear_log()
+
+
+def _run_chunk(config: DuelConfig, seed: int, start: int, stop: int) -> DuelStats:
+    """Ejecuta los duelos [start, stop), cada uno con su semilla derivada."""
+    calculator = config.calculator_cls(**config.calculator_kwargs)
+    combat = CombatSystem(calculator, CombatLog(capacity=1))
+    stats = DuelStats()
+    for index in range(start, stop):
+        run_duel(config, combat, stats, RandomStreams(duel_seed(seed, index), block_size=64))
+    return stats
+
+
+def simulate_duels(config: DuelConfig, n: int, workers: Optional[int] = None,
+                   seed: int = 0) -> DuelStats:
+    """
+    Simula n duelos en paralelo.
+    
+    Args:
+        config: Configuración del duelo
+        n: Cantidad de duelos
+        workers: Procesos a usar (por defecto, uno por núcleo; 1 ejecuta en este proceso)
+        seed: Semilla global; el resultado es el mismo para cualquier cantidad de procesos
+    
+    Returns:
+        Estadísticas agregadas de todos los duelos
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = [(start, min(start + CHUNK_SIZE, n)) for start in range(0, n, CHUNK_SIZE)]
+    
+    total = DuelStats()
+    if workers <= 1 or len(chunks) <= 1:
+        for start, stop in chunks:
+            total.merge(_run_chunk(config, seed, start, stop))
+        return total
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_chunk, config, seed, start, stop) for start, stop in chunks]
+        for future in futures:
+            total.merge(future.result())
+    return total
\ No newline at end of file
@@ -0,0 +1,243 @@
+"""
+Formato binario para el log de combate.
+Cada ataque se guarda como un registro de ancho fijo (RECORD_FIELDS enteros
+de 64 bits), lo que permite leer millones de registros con mmap sin copiarlos.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import List, Optional, Tuple
+
+from src.combat_log import RECORD_FIELDS, LogRecord
+
+
+MAGIC = b"CLOG"
+FORMAT_VERSION = 1
+# Cabecera: magic, versión, campos por registro, orden de bytes (0 little, 1 big)
+HEADER = struct.Struct("<4sHHB7x")
+RECORD_SIZE = RECORD_FIELDS * 8
+
+# Posición de cada campo dentro de un registro
+FIELD_INDEX = {
+    "sequence": 0,
+    "attacker": 1,
+    "attacker_level": 2,
+    "defender": 3,
+    "defender_level": 4,
+    "weapon": 5,
+    "damage": 6,
+}
+
+
+def names_path(path: str) -> str:
+    """Ruta del archivo auxiliar con los nombres internados."""
+    return path + ".names"
+
+
+class BinaryLogWriter:
+    """
+    Escritor de solo anexado para el formato binario.
+    
+    Los registros se acumulan en memoria y se escriben por bloques; los
+    nombres nuevos se anexan al archivo auxiliar antes que los registros que
+    los usan, así un lector concurrente siempre puede resolverlos.
+    """
+    
+    def __init__(self, path: str, buffer_records: int = 1024):
+        """
+        Crea (o reemplaza) un archivo de log binario.
+        
+        Args:
+            path: Ruta del archivo de registros
+            buffer_records: Registros a acumular antes de escribir al disco
+        """
+        self.path = path
+        self._buffer_records = max(1, buffer_records)
+        self._buffer = array("q")
+        self._name_ids = {}
+        self._pending_names: List[str] = []
+        self._names_file = open(names_path(path), "w", encoding="utf-8")
+        self._file = open(path, "wb")
+        byteorder = 0 if sys.byteorder == "little" else 1
+        self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD_FIELDS, byteorder))
+        self._file.flush()
+        self.records_written = 0
+    
+    def _name_id(self, name: str) -> int:
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self._name_ids)
+            self._pending_names.append(name)
+        return name_id
+    
+    def write(self, sequence: int, attacker: str, attacker_level: int, defender: str,
+              defender_level: int, weapon: str, damage: int):
+        """Anexa un registro de ataque."""
+        self._buffer.extend((
+            sequence, self._name_id(attacker), attacker_level, self._name_id(defender),
+            defender_level, self._name_id(weapon), damage
+        ))
+        if len(self._buffer) >= self._buffer_records * RECORD_FIELDS:
+            self.flush()
+    
+    def flush(self):
+        """Escribe al disco los nombres y registros pendientes."""
+        if self._pending_names:
+            self._names_file.writelines(json.dumps(name) + "\n" for name in self._pending_names)
+            self._names_file.flush()
+            self._pending_names.clear()
+        if self._buffer:
+            self._file.write(self._buffer.tobytes())
+            self.records_written += len(self._buffer) // RECORD_FIELDS
+            del self._buffer[:]
+        self._file.flush()
+    
+    def close(self):
+        """Escribe lo pendiente y cierra los archivos."""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+        self._names_file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+class BinaryLogReader:
+    """
+    Lector de acceso aleatorio respaldado por mmap.
+    
+    Las columnas y rangos se entregan como memoryview sobre el archivo
+    mapeado, sin copiar datos; con NumPy se pueden envolver directamente con
+    numpy.frombuffer(reader.buffer(), dtype="<i8").reshape(-1, RECORD_FIELDS).
+    Llamar refresh() hace visibles los registros que el escritor anexó.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._names: List[str] = []
+        self._names_offset = 0
+        self._mmap: Optional[mmap.mmap] = None
+        self._records: Optional[memoryview] = None
+        self._count = 0
+        
+        magic, version, fields, byteorder = HEADER.unpack(self._file.read(HEADER.size))
+        if magic != MAGIC or fields != RECORD_FIELDS:
+            raise ValueError(f"{path} no es un log binario de combate")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Versión de log no soportada: {version}")
+        if byteorder != (0 if sys.byteorder == "little" else 1):
+            raise ValueError("El log se escribió con otro orden de bytes")
+        self.refresh()
+    
+    def refresh(self) -> int:
+        """
+        Vuelve a mapear el archivo para ver los registros anexados.
+        
+        Returns:
+            Cantidad de registros completos disponibles
+        """
+        size = os.fstat(self._file.fileno()).st_size
+        count = (size - HEADER.size) // RECORD_SIZE
+        if self._mmap is None or count != self._count:
+            self._release()
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            end = HEADER.size + count * RECORD_SIZE
+            self._records = memoryview(self._mmap)[HEADER.size:end].cast("q")
+            self._count = count
+        self._load_names()
+        return self._count
+    
+    def _load_names(self):
+        path = names_path(self.path)
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as names_file:
+            names_file.seek(self._names_offset)
+            data = names_file.read()
+        complete = data.rfind(b"\n") + 1
+        for line in data[:complete].splitlines():
+            self._names.append(json.loads(line))
+        self._names_offset += complete
+    
+    def _release(self):
+        """Suelta el mapeo actual (si hay vistas vivas, se libera al recolectarlas)."""
+        if self._records is not None:
+            self._records.release()
+            self._records = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+            self._mmap = None
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def buffer(self) -> memoryview:
+        """Vista plana (int64) de todos los registros, sin copiar."""
+        return self._records[:]
+    
+    def column(self, field: str) -> memoryview:
+        """Vista sin copia de un campo de todos los registros."""
+        return self._records[FIELD_INDEX[field]::RECORD_FIELDS]
+    
+    def rows(self, start: int, stop: int) -> memoryview:
+        """Vista plana sin copia de los registros en [start, stop)."""
+        start, stop, _ = slice(start, stop).indices(self._count)
+        return self._records[start * RECORD_FIELDS:stop * RECORD_FIELDS]
+    
+    def sequence_range(self, first: int, last: int) -> Tuple[int, int]:
+        """
+        Busca los registros cuyo número de secuencia está en [first, last).
+        
+        Returns:
+            Posiciones (start, stop) de esos registros en el archivo
+        """
+        sequences = self.column("sequence")
+        return bisect_left(sequences, first), bisect_left(sequences, last)
+    
+    def slice_by_sequence(self, first: int, last: int) -> memoryview:
+        """Vista sin copia de los registros con secuencia en [first, last)."""
+        return self.rows(*self.sequence_range(first, last))
+    
+    def name(self, name_id: int) -> str:
+        """Retorna el nombre asociado a un id."""
+        return self._names[name_id]
+    
+    def record(self, index: int) -> LogRecord:
+        """Retorna el registro en la posición indicada con los nombres resueltos."""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Índice de log fuera de rango")
+        base = index * RECORD_FIELDS
+        sequence, attacker, attacker_level, defender, defender_level, weapon, damage = (
+            self._records[base:base + RECORD_FIELDS].tolist()
+        )
+        names = self._names
+        return LogRecord(
+            sequence, names[attacker], attacker_level, names[defender],
+            defender_level, names[weapon], damage
+        )
+    
+    def close(self):
+        """Cierra el mapeo y el archivo."""
+        self._release()
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
\ No newline at end of file
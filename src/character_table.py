@@ -0,0 +1,229 @@
+"""
+Almacenamiento columnar de personajes.
+Guarda los atributos de muchos personajes en arreglos tipados contiguos
+y expone vistas compatibles con Character sobre cada fila.
+"""
+from array import array
+from typing import Iterable, List, Optional, Sequence
+
+from src.interfaces import Armor
+from src.combat_system import Character
+
+
+# Códigos de tipo de armadura para la columna armor_kind
+ARMOR_NONE = 0
+ARMOR_OTHER = 1
+ARMOR_LEATHER = 2
+ARMOR_PLATE = 3
+ARMOR_MAGIC_SHIELD = 4
+ARMOR_ENCHANTED = 5
+
+
+def armor_kind_of(armor: Optional[Armor]) -> int:
+    """Retorna el código de tipo de una armadura."""
+    from src.armor_system import LeatherArmor, PlateArmor, MagicShield, EnchantedArmor
+    
+    if armor is None:
+        return ARMOR_NONE
+    if isinstance(armor, LeatherArmor):
+        return ARMOR_LEATHER
+    if isinstance(armor, PlateArmor):
+        return ARMOR_PLATE
+    if isinstance(armor, MagicShield):
+        return ARMOR_MAGIC_SHIELD
+    if isinstance(armor, EnchantedArmor):
+        return ARMOR_ENCHANTED
+    return ARMOR_OTHER
+
+
+class CharacterView(Character):
+    """
+    Vista ligera sobre una fila de CharacterTable.
+    Se comporta como un Character, pero lee y escribe en las columnas de la tabla.
+    """
+    
+    def __init__(self, table: "CharacterTable", row: int):
+        self._table = table
+        self._row = row
+    
+    @property
+    def row(self) -> int:
+        """Fila de la tabla a la que apunta la vista."""
+        return self._row
+    
+    @property
+    def name(self) -> str:
+        return self._table.names[self._row]
+    
+    @name.setter
+    def name(self, value: str):
+        self._table.names[self._row] = value
+    
+    @property
+    def current_health(self) -> int:
+        return self._table.health[self._row]
+    
+    @current_health.setter
+    def current_health(self, value: int):
+        self._table.health[self._row] = value
+    
+    @property
+    def max_health(self) -> int:
+        return self._table.max_health[self._row]
+    
+    @max_health.setter
+    def max_health(self, value: int):
+        self._table.max_health[self._row] = value
+    
+    @property
+    def level(self) -> int:
+        return self._table.level[self._row]
+    
+    @level.setter
+    def level(self, value: int):
+        self._table.level[self._row] = value
+    
+    @property
+    def armor(self) -> Optional[Armor]:
+        return self._table.armors[self._row]
+    
+    @armor.setter
+    def armor(self, value: Optional[Armor]):
+        self._table.set_armor(self._row, value)
+    
+    def __eq__(self, other):
+        if isinstance(other, CharacterView):
+            return self._table is other._table and self._row == other._row
+        return NotImplemented
+    
+    def __hash__(self):
+        return hash((id(self._table), self._row))
+    
+    def __repr__(self):
+        return f"CharacterView({self.name!r}, row={self._row})"
+
+
+class CharacterTable:
+    """
+    Tabla de personajes en formato struct-of-arrays.
+    
+    La vida, la vida máxima, el nivel y el tipo de armadura viven en arreglos
+    tipados contiguos; las armaduras se guardan por fila porque conservan su
+    propio estado mutable.
+    """
+    
+    def __init__(self):
+        self.names: List[str] = []
+        self.health = array("q")
+        self.max_health = array("q")
+        self.level = array("q")
+        self.armor_kind = array("b")
+        self.armors: List[Optional[Armor]] = []
+    
+    def add(self, name: str, health: int, level: int, armor: Optional[Armor] = None) -> int:
+        """
+        Agrega un personaje a la tabla.
+        
+        Returns:
+            Fila asignada al personaje
+        """
+        self.names.append(name)
+        self.health.append(health)
+        self.max_health.append(health)
+        self.level.append(level)
+        self.armor_kind.append(armor_kind_of(armor))
+        self.armors.append(armor)
+        return len(self.names) - 1
+    
+    def extend(self, characters: Iterable[Character]) -> range:
+        """
+        Copia personajes existentes al final de la tabla.
+        
+        Returns:
+            Rango de filas asignadas
+        """
+        start = len(self)
+        for character in characters:
+            row = self.add(character.name, character.max_health, character.level, character.armor)
+            self.health[row] = character.current_health
+        return range(start, len(self))
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def __getitem__(self, row: int) -> CharacterView:
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("Fila fuera de rango")
+        return CharacterView(self, row)
+    
+    def __iter__(self):
+        for row in range(len(self)):
+            yield CharacterView(self, row)
+    
+    def set_armor(self, row: int, armor: Optional[Armor]):
+        """Equipa una armadura en una fila."""
+        self.armors[row] = armor
+        self.armor_kind[row] = armor_kind_of(armor)
+    
+    def is_alive(self, rows: Optional[Sequence[int]] = None) -> List[bool]:
+        """
+        Verifica qué personajes están vivos.
+        
+        Args:
+            rows: Filas a consultar; todas si se omite
+        
+        Returns:
+            Lista de booleanos en el mismo orden que las filas
+        """
+        health = self.health
+        if rows is None:
+            return [value > 0 for value in health]
+        return [health[row] > 0 for row in rows]
+    
+    def alive_rows(self) -> List[int]:
+        """Retorna las filas de los personajes vivos."""
+        return [row for row, value in enumerate(self.health) if value > 0]
+    
+    def alive_count(self) -> int:
+        """Cuenta los personajes vivos."""
+        return len(self.health) - self.health.count(0)
+    
+    def take_damage(self, rows: Sequence[int], damages: Sequence[int]) -> List[int]:
+        """
+        Aplica daño a varias filas, en orden.
+        
+        Args:
+            rows: Filas que reciben daño (pueden repetirse)
+            damages: Daño a recibir por cada fila
+        
+        Returns:
+            Daño real recibido por cada fila después de aplicar armadura
+        """
+        if len(rows) != len(damages):
+            raise ValueError("rows y damages deben tener la misma longitud")
+        
+        health = self.health
+        armors = self.armors
+        results = []
+        for row, damage in zip(rows, damages):
+            armor = armors[row]
+            if armor:
+                damage = armor.absorb_damage(damage)
+            remaining = health[row] - damage
+            health[row] = remaining if remaining > 0 else 0
+            results.append(damage)
+        return results
+    
+    def heal(self, rows: Sequence[int], amounts: Sequence[int]):
+        """Cura varias filas sin superar su vida máxima."""
+        if len(rows) != len(amounts):
+            raise ValueError("rows y amounts deben tener la misma longitud")
+        
+        health = self.health
+        max_health = self.max_health
+        for row, amount in zip(rows, amounts):
+            healed = health[row] + amount
+            cap = max_health[row]
+            health[row] = healed if healed < cap else cap
\ No newline at end of file
@@ -0,0 +1,286 @@
+"""
+Análisis cerrado de enfrentamientos.
+Responde "cuántos golpes hacen falta para matar" sin simular combates:
+las armaduras deterministas se resuelven con fórmulas por fases y las
+fuentes aleatorias (críticos, reflejo) con valores esperados exactos.
+"""
+import copy
+import math
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from src.armor_system import (
+    LeatherArmor, PlateArmor, MagicShield, EnchantedArmor, DummyArmor
+)
+from src.damage_calculator import StandardDamageCalculator, CriticalDamageCalculator
+from src.interfaces import Armor, DamageCalculator
+
+
+class KillAnalysis(NamedTuple):
+    """Resultado exacto de un enfrentamiento determinista."""
+    hits: Optional[int]  # Golpes para matar (None si el daño nunca mata)
+    total_absorbed: int  # Daño absorbido por la armadura hasta la muerte
+    armor_broken_at: Optional[int]  # Golpe que agota la armadura (0 si ya estaba agotada)
+
+
+class Moments(NamedTuple):
+    """Valor esperado y varianza de una variable aleatoria."""
+    mean: float
+    variance: float
+
+
+class ExpectedKill(NamedTuple):
+    """Resultado esperado de un enfrentamiento con azar."""
+    hits: Moments
+    expected_absorbed: float
+
+
+def _ceil_div(numerator: int, denominator: int) -> int:
+    return -(-numerator // denominator)
+
+
+def _phase_kill(health: int, incoming: int, phase_hits: int, phase_pass: int) -> KillAnalysis:
+    """
+    Resuelve una armadura de dos fases: phase_hits golpes dejando pasar
+    phase_pass de daño y, después, el daño completo.
+    """
+    absorbed_per_hit = incoming - phase_pass
+    if phase_hits and phase_pass > 0 and health <= phase_hits * phase_pass:
+        hits = _ceil_div(health, phase_pass)
+        return KillAnalysis(hits, hits * absorbed_per_hit, phase_hits if hits == phase_hits else None)
+    
+    health_after = health - phase_hits * phase_pass
+    if incoming <= 0:
+        return KillAnalysis(None, phase_hits * absorbed_per_hit, phase_hits)
+    hits = phase_hits + _ceil_div(health_after, incoming)
+    return KillAnalysis(hits, phase_hits * absorbed_per_hit, phase_hits)
+
+
+def _magic_shield_kill(health: int, incoming: int, shield: MagicShield) -> KillAnalysis:
+    """
+    Resuelve el escudo mágico.
+    
+    La fase con maná se recorre golpe a golpe, pero cada golpe gasta al
+    menos 1 de maná o deja el escudo en un punto fijo que se resuelve en
+    forma cerrada, así que el costo está acotado por el maná y no por la vida.
+    """
+    mana = shield._mana
+    max_mana = shield._max_mana
+    hits = 0
+    absorbed_total = 0
+    while mana > 0:
+        mana_ratio = mana / max_mana
+        absorption_rate = shield.BASE_ABSORPTION + (mana_ratio * shield.MANA_ABSORPTION)
+        absorbed = int(incoming * absorption_rate)
+        mana_cost = min(mana, absorbed // 2)
+        passed = max(0, incoming - absorbed)
+        
+        if mana_cost == 0:
+            # Punto fijo: el escudo absorbe lo mismo para siempre
+            if passed <= 0:
+                return KillAnalysis(None, absorbed_total, None)
+            extra = _ceil_div(health, passed)
+            return KillAnalysis(hits + extra, absorbed_total + extra * absorbed, None)
+        
+        hits += 1
+        absorbed_total += absorbed
+        mana -= mana_cost
+        health -= passed
+        if health <= 0:
+            return KillAnalysis(hits, absorbed_total, hits if mana == 0 else None)
+    
+    if incoming <= 0:
+        return KillAnalysis(None, absorbed_total, hits)
+    return KillAnalysis(hits + _ceil_div(health, incoming), absorbed_total, hits)
+
+
+def hits_to_kill(health: int, incoming_damage: int, armor: Optional[Armor] = None) -> KillAnalysis:
+    """
+    Calcula exactamente cuántos golpes de daño constante matan a un defensor.
+    
+    Args:
+        health: Vida actual del defensor
+        incoming_damage: Daño por golpe que llega a la armadura (salida del calculador)
+        armor: Armadura del defensor en su estado actual (no se modifica)
+    
+    Returns:
+        Golpes necesarios, daño absorbido y golpe en que se agota la armadura
+    """
+    if health <= 0:
+        return KillAnalysis(0, 0, None)
+    
+    if armor is None:
+        if incoming_damage <= 0:
+            return KillAnalysis(None, 0, None)
+        return KillAnalysis(_ceil_div(health, incoming_damage), 0, None)
+    
+    if isinstance(armor, (LeatherArmor, PlateArmor)):
+        durability = armor._durability
+        phase_hits = _ceil_div(durability, armor.DURABILITY_COST) if durability > 0 else 0
+        phase_pass = max(0, incoming_damage - int(incoming_damage * armor.ABSORPTION_RATE))
+        return _phase_kill(health, incoming_damage, phase_hits, phase_pass)
+    
+    if isinstance(armor, MagicShield):
+        return _magic_shield_kill(health, incoming_damage, armor)
+    
+    if isinstance(armor, DummyArmor):
+        passed = max(0, incoming_damage - int(incoming_damage * armor._absorption_rate))
+        if passed <= 0:
+            return KillAnalysis(None, 0, None)
+        hits = _ceil_div(health, passed)
+        return KillAnalysis(hits, hits * (incoming_damage - passed), None)
+    
+    if isinstance(armor, EnchantedArmor):
+        raise ValueError("EnchantedArmor es aleatoria; use expected_hits_to_kill")
+    raise TypeError(f"Armadura no soportada: {type(armor).__name__}")
+
+
+def analyze_matchup(base_damage: int, attacker_level: int, defender_level: int,
+                    defender_health: int, armor: Optional[Armor] = None,
+                    calculator: Optional[StandardDamageCalculator] = None) -> KillAnalysis:
+    """Aplica hits_to_kill al daño que produce el calculador estándar."""
+    calculator = calculator or StandardDamageCalculator()
+    incoming = calculator.calculate_damage(base_damage, attacker_level, defender_level)
+    return hits_to_kill(defender_health, incoming, armor)
+
+
+def incoming_distribution(base_damage: int, attacker_level: int, defender_level: int,
+                          calculator: DamageCalculator) -> List[Tuple[float, int]]:
+    """
+    Distribución del daño que sale del calculador.
+    
+    Returns:
+        Lista de pares (probabilidad, daño)
+    """
+    if isinstance(calculator, CriticalDamageCalculator):
+        chance, multiplier, critical_multiplier = calculator._lookup(attacker_level - defender_level)
+        normal = max(1, int(base_damage * multiplier))
+        critical = max(1, int(base_damage * critical_multiplier))
+        return [(1 - chance, normal), (chance, critical)]
+    if isinstance(calculator, StandardDamageCalculator):
+        return [(1.0, calculator.calculate_damage(base_damage, attacker_level, defender_level))]
+    raise TypeError(f"Calculador no soportado: {type(calculator).__name__}")
+
+
+class _ArmorModel:
+    """Reglas de una armadura como función pura de su estado."""
+    
+    def __init__(self, armor: Optional[Armor]):
+        if armor is not None and not isinstance(
+                armor, (LeatherArmor, PlateArmor, MagicShield, EnchantedArmor, DummyArmor)):
+            raise TypeError(f"Armadura no soportada: {type(armor).__name__}")
+        self._armor = armor
+        self._probe = copy.copy(armor) if armor is not None else None
+        self._cache: Dict[Tuple, list] = {}
+    
+    def initial_state(self):
+        armor = self._armor
+        if isinstance(armor, MagicShield):
+            return armor._mana
+        if isinstance(armor, (LeatherArmor, PlateArmor, EnchantedArmor)):
+            return armor._durability
+        return None
+    
+    def outcomes(self, state, incoming: int) -> list:
+        """Lista de (probabilidad, daño que pasa, nuevo estado) para un golpe."""
+        key = (state, incoming)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
+        armor = self._armor
+        if armor is None:
+            result = [(1.0, incoming, state)]
+        elif isinstance(armor, EnchantedArmor):
+            if state <= 0:
+                result = [(1.0, incoming, state)]
+            else:
+                new_state = max(0, state - armor.DURABILITY_COST)
+                chance = armor._reflect_chance
+                reflected = max(0, incoming - int(incoming * armor.REFLECT_ABSORPTION_RATE))
+                normal = max(0, incoming - int(incoming * armor.ABSORPTION_RATE))
+                result = [(chance, reflected, new_state), (1 - chance, normal, new_state)]
+        else:
+            # Armaduras deterministas: se reutilizan sus propias reglas sobre una copia
+            probe = self._probe
+            if isinstance(probe, MagicShield):
+                probe._mana = state
+            elif state is not None:
+                probe._durability = state
+            passed = probe.absorb_damage(incoming)
+            if isinstance(probe, MagicShield):
+                new_state = probe._mana
+            elif state is not None:
+                new_state = probe._durability
+            else:
+                new_state = None
+            result = [(1.0, passed, new_state)]
+        
+        self._cache[key] = result
+        return result
+
+
+def expected_damage_per_hit(base_damage: int, attacker_level: int, defender_level: int,
+                            calculator: DamageCalculator, armor: Optional[Armor] = None) -> Moments:
+    """Valor esperado y varianza del daño del próximo golpe, con la armadura en su estado actual."""
+    model = _ArmorModel(armor)
+    state = model.initial_state()
+    mean = 0.0
+    second = 0.0
+    for probability, incoming in incoming_distribution(
+            base_damage, attacker_level, defender_level, calculator):
+        for armor_probability, passed, _ in model.outcomes(state, incoming):
+            weight = probability * armor_probability
+            mean += weight * passed
+            second += weight * passed * passed
+    return Moments(mean, second - mean * mean)
+
+
+def expected_hits_to_kill(health: int, base_damage: int, attacker_level: int,
+                          defender_level: int, calculator: DamageCalculator,
+                          armor: Optional[Armor] = None, tolerance: float = 1e-12,
+                          max_hits: int = 1_000_000) -> ExpectedKill:
+    """
+    Valor esperado y varianza de los golpes necesarios para matar.
+    
+    Propaga la distribución exacta de (vida restante, estado de armadura)
+    golpe a golpe; el soporte está acotado por la vida, así que el costo es
+    O(golpes × vida) y no depende de la cantidad de simulaciones.
+    """
+    distribution = incoming_distribution(base_damage, attacker_level, defender_level, calculator)
+    model = _ArmorModel(armor)
+    states = {(health, model.initial_state()): 1.0}
+    mean = 0.0
+    second = 0.0
+    expected_absorbed = 0.0
+    hits = 0
+    
+    while states:
+        hits += 1
+        if hits > max_hits:
+            return ExpectedKill(Moments(math.inf, math.inf), math.inf)
+        next_states: Dict[Tuple, float] = {}
+        killed = 0.0
+        for (remaining, state), probability in states.items():
+            for incoming_probability, incoming in distribution:
+                for armor_probability, passed, new_state in model.outcomes(state, incoming):
+                    weight = probability * incoming_probability * armor_probability
+                    if weight <= 0:
+                        continue
+                    expected_absorbed += weight * (incoming - passed)
+                    left = remaining - passed
+                    if left <= 0:
+                        killed += weight
+                    else:
+                        key = (left, new_state)
+                        next_states[key] = next_states.get(key, 0.0) + weight
+        mean += killed * hits
+        second += killed * hits * hits
+        
+        if next_states and next_states.keys() == states.keys() and killed == 0:
+            # Ningún golpe cambia el estado: el defensor nunca muere
+            return ExpectedKill(Moments(math.inf, math.inf), math.inf)
+        if sum(next_states.values()) < tolerance:
+            break
+        states = next_states
+    
+    return ExpectedKill(Moments(mean, second - mean * mean), expected_absorbed)
\ No newline at end of file
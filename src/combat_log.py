@@ -0,0 +1,280 @@
+"""
+Log de combate estructurado.
+Guarda cada ataque como un registro compacto de enteros y solo construye
+el mensaje legible cuando alguien lo pide.
+"""
+from array import array
+from collections.abc import Sequence
+from typing import Iterator, List, NamedTuple, Optional
+
+
+# Campos por registro: secuencia, atacante, nivel atacante, defensor,
+# nivel defensor, arma y daño (los nombres se guardan como ids internados)
+RECORD_FIELDS = 7
+
+
+def format_attack_message(attacker: str, attacker_level: int, defender: str,
+                          defender_level: int, weapon: str, damage: int) -> str:
+    """Construye el mensaje legible de un ataque."""
+    return (
+        f"{attacker} (Lvl {attacker_level}) atacó a {defender} "
+        f"(Lvl {defender_level}) con {weapon} causando {damage} daño"
+    )
+
+
+class LogRecord(NamedTuple):
+    """Registro de un ataque con los nombres ya resueltos."""
+    sequence: int
+    attacker: str
+    attacker_level: int
+    defender: str
+    defender_level: int
+    weapon: str
+    damage: int
+    
+    def message(self) -> str:
+        """Retorna el mensaje legible del registro."""
+        return format_attack_message(
+            self.attacker, self.attacker_level, self.defender,
+            self.defender_level, self.weapon, self.damage
+        )
+
+
+class CombatLog:
+    """
+    Log de ataques en formato columnar.
+    
+    Los nombres de personajes y armas se internan una sola vez y cada ataque
+    ocupa RECORD_FIELDS enteros en un arreglo contiguo. Iterar el log o
+    indexarlo retorna los mensajes de texto, igual que la lista anterior.
+    
+    Con capacity el log se vuelve un buffer circular de tamaño fijo que
+    descarta los registros más antiguos. Si además se indica spill_path, los
+    registros descartados se escriben por segmentos en ese archivo de texto,
+    que queda abierto hasta close() (o el fin de un bloque with).
+    """
+    
+    def __init__(self, capacity: Optional[int] = None, spill_path: Optional[str] = None,
+                 spill_segment: Optional[int] = None):
+        """
+        Inicializa el log.
+        
+        Args:
+            capacity: Máximo de registros en memoria; ilimitado si se omite
+            spill_path: Archivo donde volcar los registros desalojados
+            spill_segment: Registros desalojados por volcado (por defecto capacity // 4)
+        """
+        if capacity is not None and capacity <= 0:
+            raise ValueError("capacity debe ser positiva")
+        if spill_path is not None and capacity is None:
+            raise ValueError("spill_path requiere una capacidad fija")
+        
+        self._capacity = capacity
+        self._spill_path = spill_path
+        self._spill_segment = max(1, spill_segment or (capacity or 0) // 4)
+        if capacity is None:
+            self._records = array("q")
+        else:
+            self._records = array("q", bytes(8 * RECORD_FIELDS * capacity))
+        self._start = 0
+        self._size = 0
+        self._names: List[str] = []
+        self._name_ids = {}
+        # En modo circular, los nombres huérfanos se compactan al superar este límite
+        self._names_limit = float("inf") if capacity is None else 6 * capacity + 1024
+        self._next_sequence = 0
+        self.evicted = 0
+        self._spill_file = None
+        # Escritor opcional (p. ej. BinaryLogWriter) que recibe cada registro
+        self.writer = None
+    
+    @property
+    def capacity(self) -> Optional[int]:
+        """Capacidad máxima del log (None si es ilimitado)."""
+        return self._capacity
+    
+    def _intern(self, name: str) -> int:
+        """Asigna un id a un nombre nuevo."""
+        name_id = len(self._names)
+        self._names.append(name)
+        self._name_ids[name] = name_id
+        return name_id
+    
+    def _compact_names(self):
+        """Descarta los nombres que ya no usa ningún registro en memoria."""
+        old_names = self._names
+        self._names = []
+        self._name_ids = {}
+        records = self._records
+        for index in range(self._size):
+            base = self._slot(index) * RECORD_FIELDS
+            for offset in (1, 3, 5):
+                name = old_names[records[base + offset]]
+                name_id = self._name_ids.get(name)
+                if name_id is None:
+                    name_id = len(self._names)
+                    self._names.append(name)
+                    self._name_ids[name] = name_id
+                records[base + offset] = name_id
+    
+    def append(self, attacker: str, attacker_level: int, defender: str,
+               defender_level: int, weapon: str, damage: int) -> int:
+        """
+        Registra un ataque sin formatear su mensaje.
+        
+        Returns:
+            Número de secuencia asignado al registro
+        """
+        if len(self._names) >= self._names_limit:
+            self._compact_names()
+        name_ids = self._name_ids
+        attacker_id = name_ids.get(attacker)
+        if attacker_id is None:
+            attacker_id = self._intern(attacker)
+        defender_id = name_ids.get(defender)
+        if defender_id is None:
+            defender_id = self._intern(defender)
+        weapon_id = name_ids.get(weapon)
+        if weapon_id is None:
+            weapon_id = self._intern(weapon)
+        
+        sequence = self._next_sequence
+        self._next_sequence = sequence + 1
+        if self.writer is not None:
+            self.writer.write(
+                sequence, attacker, attacker_level, defender, defender_level, weapon, damage
+            )
+        if self._capacity is None:
+            self._records.extend((
+                sequence, attacker_id, attacker_level, defender_id,
+                defender_level, weapon_id, damage
+            ))
+            self._size += 1
+            return sequence
+        
+        if self._size == self._capacity:
+            self._evict()
+        base = ((self._start + self._size) % self._capacity) * RECORD_FIELDS
+        records = self._records
+        records[base] = sequence
+        records[base + 1] = attacker_id
+        records[base + 2] = attacker_level
+        records[base + 3] = defender_id
+        records[base + 4] = defender_level
+        records[base + 5] = weapon_id
+        records[base + 6] = damage
+        self._size += 1
+        return sequence
+    
+    def _evict(self):
+        """Libera espacio descartando (o volcando) los registros más antiguos."""
+        if self._spill_path is None:
+            count = 1
+        else:
+            count = min(self._spill_segment, self._size)
+            if self._spill_file is None:
+                self._spill_file = open(self._spill_path, "a", encoding="utf-8")
+            self._spill_file.writelines(self[index] + "\n" for index in range(count))
+            self._spill_file.flush()
+        self._start = (self._start + count) % self._capacity
+        self._size -= count
+        self.evicted += count
+    
+    def _slot(self, index: int) -> int:
+        """Traduce una posición lógica a la posición física en el buffer."""
+        if self._capacity is None:
+            return index
+        return (self._start + index) % self._capacity
+    
+    def name(self, name_id: int) -> str:
+        """Retorna el nombre asociado a un id."""
+        return self._names[name_id]
+    
+    def record(self, index: int) -> LogRecord:
+        """Retorna el registro estructurado en la posición indicada."""
+        size = self._size
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("Índice de log fuera de rango")
+        
+        start = self._slot(index) * RECORD_FIELDS
+        sequence, attacker_id, attacker_level, defender_id, defender_level, weapon_id, damage = (
+            self._records[start:start + RECORD_FIELDS]
+        )
+        names = self._names
+        return LogRecord(
+            sequence, names[attacker_id], attacker_level, names[defender_id],
+            defender_level, names[weapon_id], damage
+        )
+    
+    def records(self) -> Iterator[LogRecord]:
+        """Itera los registros estructurados en orden."""
+        for index in range(self._size):
+            yield self.record(index)
+    
+    def view(self) -> "CombatLogView":
+        """Retorna una vista de solo lectura sobre el log, sin copiarlo."""
+        return CombatLogView(self)
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.record(i).message() for i in range(*index.indices(self._size))]
+        return self.record(index).message()
+    
+    def __iter__(self) -> Iterator[str]:
+        for record in self.records():
+            yield record.message()
+    
+    def copy(self) -> List[str]:
+        """Retorna los mensajes del log como una lista nueva."""
+        return list(self)
+    
+    def clear(self):
+        """Elimina todos los registros (la secuencia sigue avanzando)."""
+        if self._capacity is None:
+            del self._records[:]
+        self._start = 0
+        self._size = 0
+        self._names.clear()
+        self._name_ids.clear()
+    
+    def close(self):
+        """Cierra el archivo de volcado si está abierto (se reabre si hace falta)."""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CombatLogView(Sequence):
+    """
+    Vista de solo lectura sobre un CombatLog.
+    
+    No copia los registros: refleja el estado actual del log, de modo que
+    los índices se desplazan cuando el buffer circular descarta entradas.
+    """
+    
+    def __init__(self, log: CombatLog):
+        self._log = log
+    
+    def __len__(self) -> int:
+        return len(self._log)
+    
+    def __getitem__(self, index):
+        return self._log[index]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._log)
+    
+    def records(self) -> Iterator[LogRecord]:
+        """Itera los registros estructurados en orden."""
+        return self._log.records()
\ No newline at end of file
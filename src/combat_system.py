@@ -2,13 +2,21 @@
 Sistema de combate principal.
 Utiliza inyección de dependencias para ser fácilmente testeable.
 """
-from src.interfaces import Weapon, DamageCalculator, Armor
-from typing import Optional
+from src.interfaces import Weapon, DamageCalculator, Armor, CombatHook
+from src.damage_calculator import StandardDamageCalculator
+from src.combat_log import CombatLog, CombatLogView, format_attack_message
+from src.profiling import AttackProfiler
+from collections.abc import Mapping
+from time import perf_counter_ns
+from typing import List, Optional, Sequence, Tuple
 
 
 class Character:
     """Representa un personaje en el combate."""
     
+    # Posición (x, y) en el campo de batalla; la asigna un SpatialIndex
+    position: Optional[Tuple[float, float]] = None
+    
     def __init__(self, name: str, health: int, level: int, armor: Optional[Armor] = None):
         self.name = name
         self.max_health = health
@@ -47,23 +55,123 @@ class Character:
         self.armor = armor
 
 
+_STOCK_TAKE_DAMAGE = Character.take_damage
+_new_result = object.__new__
+
+
+def uses_stock_take_damage(character_type: type) -> bool:
+    """
+    Indica si character_type usa el take_damage original de Character.
+    
+    Los caminos rápidos aplican la armadura y la vida en línea solo en ese
+    caso; si una subclase lo redefine o CombatMetrics.instrument() lo
+    envolvió, llaman al método.
+    """
+    return character_type.take_damage is _STOCK_TAKE_DAMAGE
+
+
+def _armor_is_broken(armor: Optional[Armor]) -> bool:
+    return armor is not None and armor.is_broken()
+
+
+class AttackResult(Mapping):
+    """
+    Resultado de un ataque, con los campos guardados en slots.
+    
+    Se lee como atributos o como un mapeo de solo lectura con las claves del
+    diccionario de siempre ("success", "message" y, si el ataque se hizo,
+    "attacker", "defender", "weapon", "damage", "defender_health" y
+    "defender_alive"). message se arma recién al consultarlo; dict(result)
+    o to_dict() dan un diccionario común.
+    
+    attack() retorna uno nuevo por golpe exitoso; a attack_fast() se le
+    puede pasar la misma instancia como out en cada llamada para no crear
+    objetos por ataque.
+    """
+    
+    __slots__ = ("success", "attacker", "defender", "weapon", "damage", "defender_health",
+                 "defender_alive", "attacker_alive", "attacker_level", "defender_level")
+    
+    _KEYS = ("success", "attacker", "defender", "weapon", "damage", "defender_health",
+             "defender_alive", "message")
+    _FAILED_KEYS = ("success", "message")
+    
+    def __init__(self):
+        self.success = False
+        self.attacker = None
+        self.defender = None
+        self.weapon = None
+        self.damage = 0
+        self.defender_health = 0
+        self.defender_alive = False
+        self.attacker_alive = False
+        self.attacker_level = 0
+        self.defender_level = 0
+    
+    @property
+    def message(self) -> str:
+        if self.success:
+            return format_attack_message(self.attacker, self.attacker_level, self.defender,
+                                         self.defender_level, self.weapon, self.damage)
+        if not self.attacker_alive:
+            return f"{self.attacker} está muerto y no puede atacar"
+        return f"{self.defender} ya está muerto"
+    
+    def __getitem__(self, key):
+        if key in (self._KEYS if self.success else self._FAILED_KEYS):
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def __contains__(self, key):
+        return key in (self._KEYS if self.success else self._FAILED_KEYS)
+    
+    def __iter__(self):
+        return iter(self._KEYS if self.success else self._FAILED_KEYS)
+    
+    def __len__(self) -> int:
+        return len(self._KEYS if self.success else self._FAILED_KEYS)
+    
+    def to_dict(self) -> dict:
+        """Retorna el diccionario que habría retornado attack()."""
+        if not self.success:
+            return {"success": False, "message": self.message}
+        return {
+            "success": True,
+            "attacker": self.attacker,
+            "defender": self.defender,
+            "weapon": self.weapon,
+            "damage": self.damage,
+            "defender_health": self.defender_health,
+            "defender_alive": self.defender_alive,
+            "message": self.message,
+        }
+    
+    def __repr__(self):
+        return (f"AttackResult(success={self.success}, attacker={self.attacker!r}, "
+                f"defender={self.defender!r}, damage={self.damage})")
+
+
 class CombatSystem:
     """
     Sistema de combate que utiliza inyección de dependencias.
     Esto permite cambiar el comportamiento sin modificar la clase.
     """
     
-    def __init__(self, damage_calculator: DamageCalculator):
+    def __init__(self, damage_calculator: DamageCalculator, combat_log: Optional[CombatLog] = None):
         """
         Inicializa el sistema de combate.
         
         Args:
             damage_calculator: Implementación del calculador de daño
+            combat_log: Log donde registrar los ataques (ilimitado por defecto)
         """
         self.damage_calculator = damage_calculator
-        self.combat_log = []
+        self.combat_log = combat_log if combat_log is not None else CombatLog()
+        self.profiler: Optional[AttackProfiler] = None
+        self.profiling = False
+        self.hooks: List[CombatHook] = []
     
-    def attack(self, attacker: Character, defender: Character, weapon: Weapon) -> dict:
+    def attack(self, attacker: Character, defender: Character, weapon: Weapon) -> Mapping:
         """
         Ejecuta un ataque de un personaje a otro.
         
@@ -73,8 +181,29 @@ class CombatSystem:
             weapon: Arma utilizada
             
         Returns:
-            Diccionario con información del ataque
+            Mapeo con información del ataque: un dict si el ataque no se
+            hizo, o un AttackResult cuyo mensaje se arma al consultarlo
         """
+        failed = self._check_alive(attacker, defender)
+        if failed is not None:
+            return failed
+        
+        # Calcular daño usando el calculador inyectado
+        calculated_damage = self.damage_calculator.calculate_damage(
+            weapon.get_damage(), attacker.level, defender.level
+        )
+        
+        # Aplicar daño al defensor (la armadura se maneja internamente)
+        actual_damage = defender.take_damage(calculated_damage)
+        
+        # Registrar en log (el log guarda el registro sin formatear)
+        weapon_name = self._log_attack(attacker, defender, weapon, actual_damage)
+        return self._attack_result(attacker, defender, weapon_name, actual_damage)
+    
+    # Fases de attack(); la versión instrumentada las mide por separado
+    @staticmethod
+    def _check_alive(attacker: Character, defender: Character) -> Optional[dict]:
+        """Resultado fallido si alguno está muerto, None si el ataque puede hacerse."""
         if not attacker.is_alive():
             return {
                 "success": False,
@@ -86,40 +215,468 @@ class CombatSystem:
                 "success": False,
                 "message": f"{defender.name} ya está muerto"
             }
+        return None
+    
+    def _log_attack(self, attacker: Character, defender: Character, weapon: Weapon,
+                    actual_damage: int) -> str:
+        """Registra el ataque y retorna el nombre del arma."""
+        weapon_name = weapon.get_name()
+        self.combat_log.append(
+            attacker.name, attacker.level, defender.name, defender.level,
+            weapon_name, actual_damage
+        )
+        return weapon_name
+    
+    @staticmethod
+    def _attack_result(attacker: Character, defender: Character, weapon_name: str,
+                       actual_damage: int) -> AttackResult:
+        # Sin pasar por __init__: todos los slots se asignan aquí
+        result = _new_result(AttackResult)
+        result.success = True
+        result.attacker = attacker.name
+        result.defender = defender.name
+        result.weapon = weapon_name
+        result.damage = actual_damage
+        result.defender_health = defender.current_health
+        result.defender_alive = defender.is_alive()
+        result.attacker_alive = True
+        result.attacker_level = attacker.level
+        result.defender_level = defender.level
+        return result
+    
+    def attack_fast(self, attacker: Character, defender: Character, weapon: Weapon,
+                    out: Optional[AttackResult] = None) -> AttackResult:
+        """
+        Variante de attack() que escribe el resultado en un AttackResult reutilizable.
+        
+        Aplica el mismo daño y registra lo mismo en el log que attack(), pero
+        escribe el resultado en out (o en un AttackResult nuevo si no se
+        indica). Con el perfilado u oyentes activos pasa por attack() para
+        que sigan recibiendo el resultado.
+        
+        Returns:
+            out, con los campos del ataque
+        """
+        if out is None:
+            out = AttackResult()
+        attacker_level = attacker.level
+        defender_level = defender.level
+        out.attacker = attacker.name
+        out.defender = defender.name
+        out.attacker_level = attacker_level
+        out.defender_level = defender_level
+        out.attacker_alive = attacker.current_health > 0
+        
+        if "attack" in self.__dict__:
+            result = self.attack(attacker, defender, weapon)
+            out.success = result["success"]
+            if out.success:
+                out.weapon = result["weapon"]
+                out.damage = result["damage"]
+            else:
+                out.weapon = None
+                out.damage = 0
+            out.defender_health = defender.current_health
+            out.defender_alive = defender.current_health > 0
+            return out
+        
+        if not out.attacker_alive or defender.current_health <= 0:
+            out.success = False
+            out.weapon = None
+            out.damage = 0
+            out.defender_health = defender.current_health
+            out.defender_alive = defender.current_health > 0
+            return out
         
-        # Calcular daño usando el calculador inyectado
-        base_damage = weapon.get_damage()
         calculated_damage = self.damage_calculator.calculate_damage(
-            base_damage,
-            attacker.level,
-            defender.level
+            weapon.get_damage(), attacker_level, defender_level
         )
-        
-        # Aplicar daño al defensor (la armadura se maneja internamente)
         actual_damage = defender.take_damage(calculated_damage)
-        
-        # Registrar en log
-        log_entry = (
-            f"{attacker.name} (Lvl {attacker.level}) atacó a {defender.name} "
-            f"(Lvl {defender.level}) con {weapon.get_name()} causando {actual_damage} daño"
+        weapon_name = weapon.get_name()
+        self.combat_log.append(
+            out.attacker, attacker_level, out.defender, defender_level,
+            weapon_name, actual_damage
         )
-        self.combat_log.append(log_entry)
+        
+        health = defender.current_health
+        out.success = True
+        out.weapon = weapon_name
+        out.damage = actual_damage
+        out.defender_health = health
+        out.defender_alive = health > 0
+        return out
+    
+    def attack_many(self, attacker: Character, defenders: Sequence[Character],
+                    weapon: Weapon) -> dict:
+        """
+        Ataque de área: un atacante golpea a varios defensores con la misma arma.
+        
+        Equivale a llamar attack() en orden para cada defensor (mismas
+        entradas en el log y mismos defensores omitidos por estar muertos),
+        pero lee el arma una sola vez y, si el calculador es determinista,
+        calcula el daño una sola vez por nivel de defensor distinto.
+        
+        Args:
+            attacker: Personaje atacante
+            defenders: Defensores en el orden en que reciben el golpe
+            weapon: Arma utilizada
+            
+        Los oyentes (add_hook) reciben after_hit() por cada defensor en lugar
+        de before_attack()/after_attack(); el perfilado no mide estos golpes.
+        
+        Returns:
+            Diccionario con el daño a cada defensor (None si ya estaba
+            muerto), la cantidad de golpes, el daño total y los muertos
+        """
+        hooks = self.hooks
+        if not attacker.is_alive():
+            for defender in (defenders if hooks else ()):
+                self._notify_hit(attacker, defender, None, False)
+            return {
+                "success": False,
+                "message": f"{attacker.name} está muerto y no puede atacar"
+            }
+        
+        base_damage = weapon.get_damage()
+        weapon_name = weapon.get_name()
+        attacker_name = attacker.name
+        attacker_level = attacker.level
+        calculator = self.damage_calculator
+        calculate = calculator.calculate_damage
+        by_level = {} if calculator.deterministic else None
+        append = self.combat_log.append
+        
+        damages = []
+        killed = []
+        total = 0
+        for defender in defenders:
+            if defender.current_health <= 0:
+                damages.append(None)
+                if hooks:
+                    self._notify_hit(attacker, defender, None, False)
+                continue
+            
+            defender_level = defender.level
+            if by_level is None:
+                calculated = calculate(base_damage, attacker_level, defender_level)
+            else:
+                calculated = by_level.get(defender_level)
+                if calculated is None:
+                    calculated = by_level[defender_level] = calculate(
+                        base_damage, attacker_level, defender_level
+                    )
+            
+            if hooks:
+                armor_was_broken = _armor_is_broken(defender.armor)
+            actual_damage = defender.take_damage(calculated)
+            append(attacker_name, attacker_level, defender.name, defender_level,
+                   weapon_name, actual_damage)
+            if hooks:
+                self._notify_hit(attacker, defender, actual_damage, armor_was_broken)
+            damages.append(actual_damage)
+            total += actual_damage
+            if defender.current_health <= 0:
+                killed.append(defender.name)
         
         return {
             "success": True,
-            "attacker": attacker.name,
-            "defender": defender.name,
-            "weapon": weapon.get_name(),
-            "damage": actual_damage,
-            "defender_health": defender.current_health,
-            "defender_alive": defender.is_alive(),
-            "message": log_entry
+            "attacker": attacker_name,
+            "weapon": weapon_name,
+            "damages": damages,
+            "hits": len(damages) - damages.count(None),
+            "total_damage": total,
+            "killed": killed,
         }
     
+    def attack_batch(self, characters: Sequence[Character], attacker_indices: Sequence[int],
+                     defender_indices: Sequence[int], weapon_damages: Sequence[int],
+                     defender_health: Optional[list] = None) -> list:
+        """
+        Resuelve un tick completo de ataques en lote.
+        
+        Equivale a llamar attack() en orden para cada terna, pero calcula los
+        multiplicadores por diferencia de nivel una sola vez por tick y evita
+        construir diccionarios y mensajes por ataque. Diferencias con attack():
+        
+        - Los ataques en lote no se registran en el log de combate.
+        - Los oyentes (add_hook) reciben after_hit() por cada ataque en lugar
+          de before_attack()/after_attack(); el perfilado no los mide.
+        - Si el defensor usa el take_damage original (uses_stock_take_damage),
+          la armadura y la vida se actualizan en línea; si no, se llama a su
+          take_damage.
+        
+        Args:
+            characters: Personajes indexables por posición
+            attacker_indices: Índice del atacante de cada ataque
+            defender_indices: Índice del defensor de cada ataque
+            weapon_damages: Daño base del arma de cada ataque
+            defender_health: Lista opcional donde se agrega la vida del
+                defensor justo después de cada ataque
+            
+        Returns:
+            Lista con el daño real de cada ataque (0 si no pudo realizarse)
+        """
+        from src.character_table import CharacterTable
+        
+        count = len(attacker_indices)
+        if len(defender_indices) != count or len(weapon_damages) != count:
+            raise ValueError("Los arreglos del lote deben tener la misma longitud")
+        
+        if isinstance(characters, CharacterTable):
+            return self._attack_batch_columns(
+                characters, attacker_indices, defender_indices, weapon_damages, defender_health
+            )
+        
+        calculated = None
+        if type(self.damage_calculator) is StandardDamageCalculator:
+            levels = {
+                index: characters[index].level
+                for index in set(attacker_indices).union(defender_indices)
+            }
+            calculated = self._standard_batch_damages(
+                levels, attacker_indices, defender_indices, weapon_damages
+            )
+        
+        # La vida y la armadura dependen del orden, así que se aplican en secuencia
+        calculator = self.damage_calculator
+        base_take_damage = _STOCK_TAKE_DAMAGE
+        hooks = self.hooks
+        results = []
+        for i in range(count):
+            attacker = characters[attacker_indices[i]]
+            defender = characters[defender_indices[i]]
+            if attacker.current_health <= 0 or defender.current_health <= 0:
+                results.append(0)
+                if defender_health is not None:
+                    defender_health.append(defender.current_health)
+                if hooks:
+                    self._notify_hit(attacker, defender, None, False)
+                continue
+            
+            if calculated is None:
+                damage = calculator.calculate_damage(
+                    weapon_damages[i], attacker.level, defender.level
+                )
+            else:
+                damage = calculated[i]
+            
+            armor = defender.armor
+            if hooks:
+                armor_was_broken = _armor_is_broken(armor)
+            if type(defender).take_damage is not base_take_damage:
+                damage = defender.take_damage(damage)
+            else:
+                if armor:
+                    damage = armor.absorb_damage(damage)
+                health = defender.current_health - damage
+                defender.current_health = health if health > 0 else 0
+            results.append(damage)
+            if defender_health is not None:
+                defender_health.append(defender.current_health)
+            if hooks:
+                self._notify_hit(attacker, defender, damage, armor_was_broken)
+        
+        return results
+    
+    def _attack_batch_columns(self, table, attacker_indices, defender_indices,
+                              weapon_damages, defender_health=None) -> list:
+        """Variante de attack_batch que opera directamente sobre las columnas de una tabla."""
+        health = table.health
+        levels = table.level
+        armors = table.armors
+        
+        calculated = None
+        if type(self.damage_calculator) is StandardDamageCalculator:
+            calculated = self._standard_batch_damages(
+                levels, attacker_indices, defender_indices, weapon_damages
+            )
+        
+        calculator = self.damage_calculator
+        hooks = self.hooks
+        # Con take_damage envuelto (CombatMetrics.instrument()) se pasa por las vistas
+        inline = uses_stock_take_damage(Character)
+        results = []
+        for i in range(len(attacker_indices)):
+            attacker_row = attacker_indices[i]
+            defender_row = defender_indices[i]
+            if health[attacker_row] <= 0 or health[defender_row] <= 0:
+                results.append(0)
+                if defender_health is not None:
+                    defender_health.append(health[defender_row])
+                if hooks:
+                    self._notify_hit(table[attacker_row], table[defender_row], None, False)
+                continue
+            
+            if calculated is None:
+                damage = calculator.calculate_damage(
+                    weapon_damages[i], levels[attacker_row], levels[defender_row]
+                )
+            else:
+                damage = calculated[i]
+            
+            armor = armors[defender_row]
+            if hooks:
+                armor_was_broken = _armor_is_broken(armor)
+            if not inline:
+                damage = table[defender_row].take_damage(damage)
+            else:
+                if armor:
+                    damage = armor.absorb_damage(damage)
+                remaining = health[defender_row] - damage
+                health[defender_row] = remaining if remaining > 0 else 0
+            results.append(damage)
+            if defender_health is not None:
+                defender_health.append(health[defender_row])
+            if hooks:
+                self._notify_hit(table[attacker_row], table[defender_row], damage,
+                                 armor_was_broken)
+        
+        return results
+    
+    def _standard_batch_damages(self, levels, attacker_indices, defender_indices,
+                                weapon_damages) -> list:
+        """
+        Aplica StandardDamageCalculator a todo un lote.
+        
+        El calculador estándar es una función pura, así que el lote se resuelve
+        antes de aplicar el daño.
+        """
+        return self.damage_calculator.calculate_damage_batch(
+            weapon_damages,
+            [levels[index] for index in attacker_indices],
+            [levels[index] for index in defender_indices],
+        )
+    
+    def _notify_hit(self, attacker: Character, defender: Character, damage: Optional[int],
+                    armor_was_broken: bool):
+        for hook in self.hooks:
+            hook.after_hit(attacker, defender, damage, armor_was_broken)
+    
+    def enable_profiling(self, profiler: Optional[AttackProfiler] = None) -> AttackProfiler:
+        """
+        Activa la medición por fases de attack().
+        
+        Reemplaza attack en esta instancia por una versión instrumentada, así
+        que mientras está desactivada la ruta normal no paga ningún costo.
+        attack_fast() pasa por ella; attack_many() y attack_batch() no.
+        
+        Returns:
+            El perfilador que acumula las mediciones
+        """
+        if profiler is not None or self.profiler is None:
+            self.profiler = profiler or AttackProfiler()
+        self.profiling = True
+        self._update_attack_path()
+        return self.profiler
+    
+    def disable_profiling(self):
+        """Desactiva la medición; lo acumulado sigue disponible en stats()."""
+        self.profiling = False
+        self._update_attack_path()
+    
+    def add_hook(self, hook: CombatHook):
+        """
+        Registra un oyente que se llama antes y después de cada attack(), y
+        con after_hit() por cada golpe de attack_many() y attack_batch().
+        """
+        self.hooks.append(hook)
+        self._update_attack_path()
+    
+    def remove_hook(self, hook: CombatHook):
+        """Quita un oyente registrado."""
+        self.hooks.remove(hook)
+        self._update_attack_path()
+    
+    def stats(self) -> dict:
+        """Desglose acumulado por el perfilador (vacío si nunca se activó)."""
+        return self.profiler.stats() if self.profiler is not None else {}
+    
+    def _update_attack_path(self):
+        if self.profiling or self.hooks:
+            self.attack = self._instrumented_attack
+        else:
+            self.__dict__.pop("attack", None)
+    
+    def _instrumented_attack(self, attacker: Character, defender: Character,
+                             weapon: Weapon) -> Mapping:
+        """attack() con medición por fases y llamadas a los oyentes."""
+        profiler = self.profiler if self.profiling else None
+        hooks = self.hooks
+        for hook in hooks:
+            hook.before_attack(attacker, defender, weapon)
+        
+        start = perf_counter_ns()
+        result = self._check_alive(attacker, defender)
+        if result is not None:
+            if profiler is not None:
+                profiler.attacks += 1
+                profiler.failed += 1
+                profiler.total_ns += perf_counter_ns() - start
+        else:
+            calculated_damage = self.damage_calculator.calculate_damage(
+                weapon.get_damage(), attacker.level, defender.level
+            )
+            after_calculator = perf_counter_ns()
+            
+            actual_damage = defender.take_damage(calculated_damage)
+            after_armor = perf_counter_ns()
+            
+            weapon_name = self._log_attack(attacker, defender, weapon, actual_damage)
+            after_log = perf_counter_ns()
+            
+            result = self._attack_result(attacker, defender, weapon_name, actual_damage)
+            end = perf_counter_ns()
+            
+            if profiler is not None:
+                phase_ns = profiler.phase_ns
+                phase_ns["calculator"] += after_calculator - start
+                phase_ns["armor"] += after_armor - after_calculator
+                phase_ns["log"] += after_log - after_armor
+                phase_ns["result"] += end - after_log
+                profiler.attacks += 1
+                profiler.total_ns += end - start
+                profiler.weapons[type(weapon).__name__] += 1
+                profiler.calculators[type(self.damage_calculator).__name__] += 1
+                armor = defender.armor
+                profiler.armors[type(armor).__name__ if armor else "None"] += 1
+        
+        for hook in hooks:
+            hook.after_attack(attacker, defender, weapon, result)
+        return result
+    
     def get_combat_log(self) -> list:
-        """Retorna el log de combate."""
+        """
+        Retorna el log de combate como lista de mensajes.
+        
+        Formatea todos los registros en cada llamada; para recorrerlo sin
+        copiar ni guardar los mensajes usar view_combat_log().
+        """
         return self.combat_log.copy()
     
+    def attach_log_writer(self, writer):
+        """
+        Conecta un escritor que recibe cada ataque registrado.
+        
+        Args:
+            writer: Objeto con método write(), p. ej. un BinaryLogWriter;
+                None para desconectarlo
+        """
+        self.combat_log.writer = writer
+    
+    def view_combat_log(self) -> CombatLogView:
+        """Retorna una vista de solo lectura del log, sin copiarlo."""
+        return self.combat_log.view()
+    
     def clear_log(self):
         """Limpia el log de combate."""
-        self.combat_log.clear()
\ No newline at end of file
+        self.combat_log.clear()
+    
+    def close(self):
+        """Libera los recursos del log (el archivo de volcado, si lo hay)."""
+        self.combat_log.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
\ No newline at end of file
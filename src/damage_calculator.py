@@ -1,48 +1,175 @@
 """
 Implementaciones de calculadores de daño.
 """
+import random
+from functools import lru_cache
+from typing import List, Sequence
+
 from src.interfaces import DamageCalculator
+from src.rng import DefaultRandomState, draw_many
+
+
+# Las tablas cubren diferencias de nivel en [-LEVEL_DIFF_RANGE, LEVEL_DIFF_RANGE];
+# fuera de ese rango se usa la fórmula directamente.
+LEVEL_DIFF_RANGE = 100
+
+
+def level_multiplier(level_difference: int) -> float:
+    """Multiplicador de daño por diferencia de nivel."""
+    return 1 + (level_difference * 0.1)
+
+
+def crit_chance(level_difference: int) -> float:
+    """Probabilidad de crítico por diferencia de nivel (entre 10% y 30%)."""
+    return min(0.3, max(0.1, 0.1 + level_difference * 0.05))
+
+
+def build_level_table(function, level_range: int = LEVEL_DIFF_RANGE) -> List[float]:
+    """Evalúa function para cada diferencia de nivel; el índice es diferencia + level_range."""
+    return [function(level_difference) for level_difference in range(-level_range, level_range + 1)]
 
 
 class StandardDamageCalculator(DamageCalculator):
     """Calculador estándar de daño."""
     
+    deterministic = True
+    
+    def __init__(self, damage_cache_size: int = 0):
+        """
+        Args:
+            damage_cache_size: Si es mayor que 0, guarda el daño final de las
+                combinaciones (base_damage, diferencia de nivel) en un LRU acotado
+        """
+        self._multipliers = build_level_table(level_multiplier)
+        self._damage_cache = None
+        if damage_cache_size > 0:
+            self._damage_cache = lru_cache(maxsize=damage_cache_size)(self._compute_damage)
+    
+    def _multiplier(self, level_difference: int) -> float:
+        index = level_difference + LEVEL_DIFF_RANGE
+        if 0 <= index < len(self._multipliers):
+            return self._multipliers[index]
+        return level_multiplier(level_difference)
+    
+    def _compute_damage(self, base_damage: int, level_difference: int) -> int:
+        damage = int(base_damage * self._multiplier(level_difference))
+        return max(1, damage)  # Mínimo 1 de daño
+    
     def calculate_damage(self, base_damage: int, attacker_level: int, defender_level: int) -> int:
         """
         Fórmula: daño = base_damage * (1 + (attacker_level - defender_level) * 0.1)
         """
         level_difference = attacker_level - defender_level
-        multiplier = 1 + (level_difference * 0.1)
-        damage = int(base_damage * multiplier)
-        return max(1, damage)  # Mínimo 1 de daño
+        if self._damage_cache is not None:
+            return self._damage_cache(base_damage, level_difference)
+        return self._compute_damage(base_damage, level_difference)
+    
+    def calculate_damage_batch(self, base_damages: Sequence[int], attacker_levels: Sequence[int],
+                               defender_levels: Sequence[int]) -> List[int]:
+        """Aplica la fórmula a un lote leyendo las mismas tablas que la ruta escalar."""
+        if self._damage_cache is not None:
+            cached = self._damage_cache
+            return [
+                cached(base_damage, attacker_level - defender_level)
+                for base_damage, attacker_level, defender_level in zip(
+                    base_damages, attacker_levels, defender_levels)
+            ]
+        
+        multipliers = self._multipliers
+        table_size = len(multipliers)
+        results = []
+        for base_damage, attacker_level, defender_level in zip(
+                base_damages, attacker_levels, defender_levels):
+            index = attacker_level - defender_level + LEVEL_DIFF_RANGE
+            if 0 <= index < table_size:
+                multiplier = multipliers[index]
+            else:
+                multiplier = level_multiplier(attacker_level - defender_level)
+            damage = int(base_damage * multiplier)
+            results.append(damage if damage > 1 else 1)
+        return results
+    
+    def damage_cache_info(self):
+        """Estadísticas del LRU de daño final (None si está desactivado)."""
+        if self._damage_cache is None:
+            return None
+        return self._damage_cache.cache_info()
 
 
-class CriticalDamageCalculator(DamageCalculator):
+class CriticalDamageCalculator(DefaultRandomState, DamageCalculator):
     """Calculador con posibilidad de crítico."""
     
-    def __init__(self, crit_multiplier: float = 2.0):
+    def __init__(self, crit_multiplier: float = 2.0, rng=None):
+        """
+        Args:
+            crit_multiplier: Multiplicador aplicado en los críticos
+            rng: Fuente aleatoria con método random() (p. ej. BufferedRandom);
+                por defecto el generador global del módulo random
+        """
+        self._crit_chances = build_level_table(crit_chance)
+        self._multipliers = build_level_table(level_multiplier)
         self.crit_multiplier = crit_multiplier
         self.last_was_critical = False
+        self.rng = rng if rng is not None else random
+    
+    @property
+    def crit_multiplier(self) -> float:
+        """Multiplicador de los críticos; al cambiarlo se reconstruyen las tablas."""
+        return self._crit_multiplier
+    
+    @crit_multiplier.setter
+    def crit_multiplier(self, value: float):
+        self._crit_multiplier = value
+        self.invalidate_tables()
+    
+    def invalidate_tables(self):
+        """Reconstruye las tablas que dependen de crit_multiplier."""
+        crit_multiplier = self._crit_multiplier
+        self._crit_multipliers = [multiplier * crit_multiplier for multiplier in self._multipliers]
+    
+    def _lookup(self, level_difference: int):
+        """Retorna (probabilidad de crítico, multiplicador, multiplicador crítico)."""
+        index = level_difference + LEVEL_DIFF_RANGE
+        if 0 <= index < len(self._multipliers):
+            return (self._crit_chances[index], self._multipliers[index],
+                    self._crit_multipliers[index])
+        multiplier = level_multiplier(level_difference)
+        return crit_chance(level_difference), multiplier, multiplier * self._crit_multiplier
     
     def calculate_damage(self, base_damage: int, attacker_level: int, defender_level: int) -> int:
         """
         Calcula daño con posibilidad de crítico basado en diferencia de nivel.
         """
-        level_difference = attacker_level - defender_level
-        
         # Probabilidad de crítico aumenta con nivel
-        crit_chance = min(0.3, max(0.1, 0.1 + level_difference * 0.05))
+        chance, multiplier, critical_multiplier = self._lookup(attacker_level - defender_level)
         
-        import random
-        is_critical = random.random() < crit_chance
+        is_critical = self.rng.random() < chance
         self.last_was_critical = is_critical
         
-        multiplier = 1 + (level_difference * 0.1)
         if is_critical:
-            multiplier *= self.crit_multiplier
+            multiplier = critical_multiplier
         
         damage = int(base_damage * multiplier)
         return max(1, damage)
+    
+    def calculate_damage_batch(self, base_damages: Sequence[int], attacker_levels: Sequence[int],
+                               defender_levels: Sequence[int]) -> List[int]:
+        """
+        Calcula un lote de golpes tomando todos los números aleatorios de una vez.
+        Consume el flujo en el mismo orden que llamadas sucesivas a calculate_damage.
+        """
+        draws = draw_many(self.rng, len(base_damages))
+        lookup = self._lookup
+        results = []
+        is_critical = self.last_was_critical
+        for base_damage, attacker_level, defender_level, draw in zip(
+                base_damages, attacker_levels, defender_levels, draws):
+            chance, multiplier, critical_multiplier = lookup(attacker_level - defender_level)
+            is_critical = draw < chance
+            damage = int(base_damage * (critical_multiplier if is_critical else multiplier))
+            results.append(damage if damage > 1 else 1)
+        self.last_was_critical = is_critical
+        return results
 
 
 class MockDamageCalculator(DamageCalculator):
@@ -0,0 +1,554 @@
+"""
+Pipeline de daño fusionado.
+
+Un golpe normal pasa por Weapon.get_damage, DamageCalculator.calculate_damage,
+Character.take_damage y Armor.absorb_damage. DamagePipeline arma, para cada
+combinación de calculador y armadura, un cierre que calcula el daño con las
+tablas del calculador y aplica la armadura y la vida en línea, con las
+constantes de la armadura ya resueltas, y produce exactamente el mismo daño,
+el mismo consumo de números aleatorios y los mismos cambios de estado. Las
+combinaciones que no conoce usan los métodos de siempre.
+
+Entre el calculador y la armadura se pueden encadenar etapas (DamageStage)
+como bonificaciones o resistencias.
+"""
+from typing import Callable, Dict, Sequence, Tuple
+
+from src.armor_system import LeatherArmor, PlateArmor, MagicShield, EnchantedArmor
+from src.combat_system import Character, uses_stock_take_damage
+from src.damage_calculator import (
+    LEVEL_DIFF_RANGE, CriticalDamageCalculator, StandardDamageCalculator, level_multiplier
+)
+from src.interfaces import DamageCalculator, Weapon
+
+
+class DamageStage:
+    """Etapa que modifica el daño calculado antes de la armadura."""
+    
+    def __call__(self, damage: int, attacker: Character, defender: Character) -> int:
+        return damage
+
+
+class Buff(DamageStage):
+    """Multiplica el daño (p. ej. 1.5 para +50 %)."""
+    
+    def __init__(self, multiplier: float):
+        self.multiplier = multiplier
+    
+    def __call__(self, damage: int, attacker: Character, defender: Character) -> int:
+        return int(damage * self.multiplier)
+
+
+class Resistance(DamageStage):
+    """Reduce el daño en una fracción (0.25 resiste el 25 %)."""
+    
+    def __init__(self, fraction: float):
+        self.fraction = fraction
+    
+    def __call__(self, damage: int, attacker: Character, defender: Character) -> int:
+        return damage - int(damage * self.fraction)
+
+
+# Pasos de cálculo por calculador: (attacker, defender, base_damage) -> daño
+def _standard_step(calculator: DamageCalculator) -> Callable:
+    multipliers = calculator._multipliers
+    table_size = len(multipliers)
+    
+    def calculate(attacker, defender, base_damage):
+        level_difference = attacker.level - defender.level
+        index = level_difference + LEVEL_DIFF_RANGE
+        if 0 <= index < table_size:
+            damage = int(base_damage * multipliers[index])
+        else:
+            damage = int(base_damage * level_multiplier(level_difference))
+        return damage if damage > 1 else 1
+    return calculate
+
+
+def _critical_step(calculator: DamageCalculator) -> Callable:
+    multipliers = calculator._multipliers
+    table_size = len(multipliers)
+    crit_chances = calculator._crit_chances
+    fallback = calculator.calculate_damage
+    
+    def calculate(attacker, defender, base_damage):
+        level_difference = attacker.level - defender.level
+        index = level_difference + LEVEL_DIFF_RANGE
+        if 0 <= index < table_size:
+            critical = calculator.rng.random() < crit_chances[index]
+            calculator.last_was_critical = critical
+            if critical:
+                damage = int(base_damage * calculator._crit_multipliers[index])
+            else:
+                damage = int(base_damage * multipliers[index])
+            return damage if damage > 1 else 1
+        return fallback(base_damage, attacker.level, defender.level)
+    return calculate
+
+
+def _generic_step(calculator: DamageCalculator) -> Callable:
+    fallback = calculator.calculate_damage
+    
+    def calculate(attacker, defender, base_damage):
+        return fallback(base_damage, attacker.level, defender.level)
+    return calculate
+
+
+def _with_stages(calculate: Callable, stages: Tuple[DamageStage, ...]) -> Callable:
+    if not stages:
+        return calculate
+    
+    def staged(attacker, defender, base_damage):
+        damage = calculate(attacker, defender, base_damage)
+        for stage in stages:
+            damage = stage(damage, attacker, defender)
+        return damage
+    return staged
+
+
+# Resolvedores por armadura: aplican la armadura y la vida en línea
+def _no_armor_resolver(calculate: Callable, armor_type: type) -> Callable:
+    def resolve(attacker, defender, base_damage):
+        damage = calculate(attacker, defender, base_damage)
+        health = defender.current_health - damage
+        defender.current_health = health if health > 0 else 0
+        return damage
+    return resolve
+
+
+def _durability_resolver(calculate: Callable, armor_type: type) -> Callable:
+    absorption_rate = armor_type.ABSORPTION_RATE
+    durability_cost = armor_type.DURABILITY_COST
+    
+    def resolve(attacker, defender, base_damage):
+        damage = calculate(attacker, defender, base_damage)
+        armor = defender.armor
+        durability = armor._durability
+        if durability > 0:
+            durability -= durability_cost
+            armor._durability = durability if durability > 0 else 0
+            damage -= int(damage * absorption_rate)
+            if damage < 0:
+                damage = 0
+        health = defender.current_health - damage
+        defender.current_health = health if health > 0 else 0
+        return damage
+    return resolve
+
+
+def _magic_shield_resolver(calculate: Callable, armor_type: type) -> Callable:
+    base_absorption = armor_type.BASE_ABSORPTION
+    mana_absorption = armor_type.MANA_ABSORPTION
+    
+    def resolve(attacker, defender, base_damage):
+        damage = calculate(attacker, defender, base_damage)
+        armor = defender.armor
+        mana = armor._mana
+        if mana > 0:
+            absorbed = int(damage * (base_absorption + (mana / armor._max_mana) * mana_absorption))
+            mana_cost = absorbed // 2
+            mana -= mana_cost if mana_cost < mana else mana
+            armor._mana = mana if mana > 0 else 0
+            damage -= absorbed
+            if damage < 0:
+                damage = 0
+        health = defender.current_health - damage
+        defender.current_health = health if health > 0 else 0
+        return damage
+    return resolve
+
+
+def _enchanted_resolver(calculate: Callable, armor_type: type) -> Callable:
+    absorption_rate = armor_type.ABSORPTION_RATE
+    reflect_absorption_rate = armor_type.REFLECT_ABSORPTION_RATE
+    durability_cost = armor_type.DURABILITY_COST
+    
+    def resolve(attacker, defender, base_damage):
+        damage = calculate(attacker, defender, base_damage)
+        armor = defender.armor
+        durability = armor._durability
+        if durability > 0:
+            reflected = armor.rng.random() < armor._reflect_chance
+            armor._last_reflected = reflected
+            if reflected:
+                absorbed = int(damage * reflect_absorption_rate)
+            else:
+                absorbed = int(damage * absorption_rate)
+            durability -= durability_cost
+            armor._durability = durability if durability > 0 else 0
+            damage -= absorbed
+            if damage < 0:
+                damage = 0
+        health = defender.current_health - damage
+        defender.current_health = health if health > 0 else 0
+        return damage
+    return resolve
+
+
+def _generic_armor_resolver(calculate: Callable, armor_type: type) -> Callable:
+    def resolve(attacker, defender, base_damage):
+        damage = calculate(attacker, defender, base_damage)
+        armor = defender.armor
+        if armor:
+            damage = armor.absorb_damage(damage)
+        health = defender.current_health - damage
+        defender.current_health = health if health > 0 else 0
+        return damage
+    return resolve
+
+
+# Si el defensor redefine take_damage se le entrega el daño sin tocar la armadura
+def _take_damage_resolver(calculate: Callable, armor_type: type) -> Callable:
+    def resolve(attacker, defender, base_damage):
+        return defender.take_damage(calculate(attacker, defender, base_damage))
+    return resolve
+
+
+# Sin etapas, el paso de los calculadores conocidos va copiado dentro de cada
+# resolvedor para ahorrar una llamada por golpe. Cada fábrica arma la versión
+# del calculador estándar o, con critical, la del calculador con críticos.
+def _fused_no_armor_resolver(calculator: DamageCalculator, armor_type: type,
+                             critical: bool) -> Callable:
+    multipliers = calculator._multipliers
+    table_size = len(multipliers)
+    if critical:
+        crit_chances = calculator._crit_chances
+        fallback = calculator.calculate_damage
+        
+        def resolve(attacker, defender, base_damage):
+            level_difference = attacker.level - defender.level
+            index = level_difference + LEVEL_DIFF_RANGE
+            if 0 <= index < table_size:
+                critical = calculator.rng.random() < crit_chances[index]
+                calculator.last_was_critical = critical
+                if critical:
+                    damage = int(base_damage * calculator._crit_multipliers[index])
+                else:
+                    damage = int(base_damage * multipliers[index])
+                if damage < 1:
+                    damage = 1
+            else:
+                damage = fallback(base_damage, attacker.level, defender.level)
+            health = defender.current_health - damage
+            defender.current_health = health if health > 0 else 0
+            return damage
+        return resolve
+    
+    def resolve(attacker, defender, base_damage):
+        level_difference = attacker.level - defender.level
+        index = level_difference + LEVEL_DIFF_RANGE
+        if 0 <= index < table_size:
+            damage = int(base_damage * multipliers[index])
+        else:
+            damage = int(base_damage * level_multiplier(level_difference))
+        if damage < 1:
+            damage = 1
+        health = defender.current_health - damage
+        defender.current_health = health if health > 0 else 0
+        return damage
+    return resolve
+
+
+def _fused_durability_resolver(calculator: DamageCalculator, armor_type: type,
+                               critical: bool) -> Callable:
+    multipliers = calculator._multipliers
+    table_size = len(multipliers)
+    absorption_rate = armor_type.ABSORPTION_RATE
+    durability_cost = armor_type.DURABILITY_COST
+    if critical:
+        crit_chances = calculator._crit_chances
+        fallback = calculator.calculate_damage
+        
+        def resolve(attacker, defender, base_damage):
+            level_difference = attacker.level - defender.level
+            index = level_difference + LEVEL_DIFF_RANGE
+            if 0 <= index < table_size:
+                critical = calculator.rng.random() < crit_chances[index]
+                calculator.last_was_critical = critical
+                if critical:
+                    damage = int(base_damage * calculator._crit_multipliers[index])
+                else:
+                    damage = int(base_damage * multipliers[index])
+                if damage < 1:
+                    damage = 1
+            else:
+                damage = fallback(base_damage, attacker.level, defender.level)
+            armor = defender.armor
+            durability = armor._durability
+            if durability > 0:
+                durability -= durability_cost
+                armor._durability = durability if durability > 0 else 0
+                damage -= int(damage * absorption_rate)
+                if damage < 0:
+                    damage = 0
+            health = defender.current_health - damage
+            defender.current_health = health if health > 0 else 0
+            return damage
+        return resolve
+    
+    def resolve(attacker, defender, base_damage):
+        level_difference = attacker.level - defender.level
+        index = level_difference + LEVEL_DIFF_RANGE
+        if 0 <= index < table_size:
+            damage = int(base_damage * multipliers[index])
+        else:
+            damage = int(base_damage * level_multiplier(level_difference))
+        if damage < 1:
+            damage = 1
+        armor = defender.armor
+        durability = armor._durability
+        if durability > 0:
+            durability -= durability_cost
+            armor._durability = durability if durability > 0 else 0
+            damage -= int(damage * absorption_rate)
+            if damage < 0:
+                damage = 0
+        health = defender.current_health - damage
+        defender.current_health = health if health > 0 else 0
+        return damage
+    return resolve
+
+
+def _fused_magic_shield_resolver(calculator: DamageCalculator, armor_type: type,
+                                 critical: bool) -> Callable:
+    multipliers = calculator._multipliers
+    table_size = len(multipliers)
+    base_absorption = armor_type.BASE_ABSORPTION
+    mana_absorption = armor_type.MANA_ABSORPTION
+    if critical:
+        crit_chances = calculator._crit_chances
+        fallback = calculator.calculate_damage
+        
+        def resolve(attacker, defender, base_damage):
+            level_difference = attacker.level - defender.level
+            index = level_difference + LEVEL_DIFF_RANGE
+            if 0 <= index < table_size:
+                critical = calculator.rng.random() < crit_chances[index]
+                calculator.last_was_critical = critical
+                if critical:
+                    damage = int(base_damage * calculator._crit_multipliers[index])
+                else:
+                    damage = int(base_damage * multipliers[index])
+                if damage < 1:
+                    damage = 1
+            else:
+                damage = fallback(base_damage, attacker.level, defender.level)
+            armor = defender.armor
+            mana = armor._mana
+            if mana > 0:
+                absorbed = int(damage * (base_absorption + (mana / armor._max_mana) * mana_absorption))
+                mana_cost = absorbed // 2
+                mana -= mana_cost if mana_cost < mana else mana
+                armor._mana = mana if mana > 0 else 0
+                damage -= absorbed
+                if damage < 0:
+                    damage = 0
+            health = defender.current_health - damage
+            defender.current_health = health if health > 0 else 0
+            return damage
+        return resolve
+    
+    def resolve(attacker, defender, base_damage):
+        level_difference = attacker.level - defender.level
+        index = level_difference + LEVEL_DIFF_RANGE
+        if 0 <= index < table_size:
+            damage = int(base_damage * multipliers[index])
+        else:
+            damage = int(base_damage * level_multiplier(level_difference))
+        if damage < 1:
+            damage = 1
+        armor = defender.armor
+        mana = armor._mana
+        if mana > 0:
+            absorbed = int(damage * (base_absorption + (mana / armor._max_mana) * mana_absorption))
+            mana_cost = absorbed // 2
+            mana -= mana_cost if mana_cost < mana else mana
+            armor._mana = mana if mana > 0 else 0
+            damage -= absorbed
+            if damage < 0:
+                damage = 0
+        health = defender.current_health - damage
+        defender.current_health = health if health > 0 else 0
+        return damage
+    return resolve
+
+
+def _fused_enchanted_resolver(calculator: DamageCalculator, armor_type: type,
+                              critical: bool) -> Callable:
+    multipliers = calculator._multipliers
+    table_size = len(multipliers)
+    absorption_rate = armor_type.ABSORPTION_RATE
+    reflect_absorption_rate = armor_type.REFLECT_ABSORPTION_RATE
+    durability_cost = armor_type.DURABILITY_COST
+    if critical:
+        crit_chances = calculator._crit_chances
+        fallback = calculator.calculate_damage
+        
+        def resolve(attacker, defender, base_damage):
+            level_difference = attacker.level - defender.level
+            index = level_difference + LEVEL_DIFF_RANGE
+            if 0 <= index < table_size:
+                critical = calculator.rng.random() < crit_chances[index]
+                calculator.last_was_critical = critical
+                if critical:
+                    damage = int(base_damage * calculator._crit_multipliers[index])
+                else:
+                    damage = int(base_damage * multipliers[index])
+                if damage < 1:
+                    damage = 1
+            else:
+                damage = fallback(base_damage, attacker.level, defender.level)
+            armor = defender.armor
+            durability = armor._durability
+            if durability > 0:
+                reflected = armor.rng.random() < armor._reflect_chance
+                armor._last_reflected = reflected
+                if reflected:
+                    absorbed = int(damage * reflect_absorption_rate)
+                else:
+                    absorbed = int(damage * absorption_rate)
+                durability -= durability_cost
+                armor._durability = durability if durability > 0 else 0
+                damage -= absorbed
+                if damage < 0:
+                    damage = 0
+            health = defender.current_health - damage
+            defender.current_health = health if health > 0 else 0
+            return damage
+        return resolve
+    
+    def resolve(attacker, defender, base_damage):
+        level_difference = attacker.level - defender.level
+        index = level_difference + LEVEL_DIFF_RANGE
+        if 0 <= index < table_size:
+            damage = int(base_damage * multipliers[index])
+        else:
+            damage = int(base_damage * level_multiplier(level_difference))
+        if damage < 1:
+            damage = 1
+        armor = defender.armor
+        durability = armor._durability
+        if durability > 0:
+            reflected = armor.rng.random() < armor._reflect_chance
+            armor._last_reflected = reflected
+            if reflected:
+                absorbed = int(damage * reflect_absorption_rate)
+            else:
+                absorbed = int(damage * absorption_rate)
+            durability -= durability_cost
+            armor._durability = durability if durability > 0 else 0
+            damage -= absorbed
+            if damage < 0:
+                damage = 0
+        health = defender.current_health - damage
+        defender.current_health = health if health > 0 else 0
+        return damage
+    return resolve
+
+
+_CALCULATOR_STEPS = {
+    "standard": _standard_step,
+    "critical": _critical_step,
+    "generic": _generic_step,
+}
+
+_ARMOR_RESOLVERS = {
+    "none": _no_armor_resolver,
+    "durability": _durability_resolver,
+    "magic_shield": _magic_shield_resolver,
+    "enchanted": _enchanted_resolver,
+    "generic": _generic_armor_resolver,
+}
+
+_FUSED_RESOLVERS = {
+    "none": _fused_no_armor_resolver,
+    "durability": _fused_durability_resolver,
+    "magic_shield": _fused_magic_shield_resolver,
+    "enchanted": _fused_enchanted_resolver,
+}
+
+
+def _calculator_kernel(calculator: DamageCalculator) -> str:
+    calculate = type(calculator).calculate_damage
+    if calculate is StandardDamageCalculator.calculate_damage:
+        if calculator._damage_cache is None and "calculate_damage" not in vars(calculator):
+            return "standard"
+    elif calculate is CriticalDamageCalculator.calculate_damage:
+        if "calculate_damage" not in vars(calculator):
+            return "critical"
+    return "generic"
+
+
+# absorb_damage originales; si alguien los envuelve (p. ej. CombatMetrics.instrument())
+# la armadura pasa por el método
+_ARMOR_KERNELS = {
+    LeatherArmor.absorb_damage: "durability",
+    PlateArmor.absorb_damage: "durability",
+    MagicShield.absorb_damage: "magic_shield",
+    EnchantedArmor.absorb_damage: "enchanted",
+}
+
+
+def _armor_kernel(armor_type: type) -> str:
+    if armor_type is type(None):
+        return "none"
+    return _ARMOR_KERNELS.get(getattr(armor_type, "absorb_damage", None), "generic")
+
+
+class DamagePipeline:
+    """
+    Resuelve golpes con funciones especializadas por calculador y armadura.
+    
+    resolve(attacker, defender, base_damage) equivale a
+    defender.take_damage(calculator.calculate_damage(base_damage, attacker.level,
+    defender.level)) con las etapas aplicadas en medio. Las funciones se
+    arman la primera vez que aparece cada tipo de defensor y de armadura.
+    """
+    
+    def __init__(self, calculator: DamageCalculator, stages: Sequence[DamageStage] = ()):
+        self.calculator = calculator
+        self.stages: Tuple[DamageStage, ...] = tuple(stages)
+        kernel = _calculator_kernel(calculator)
+        self._calculate = _with_stages(_CALCULATOR_STEPS[kernel](calculator), self.stages)
+        # Solo sin etapas el cálculo se copia dentro del resolvedor
+        self._fused_critical = None
+        if not self.stages and kernel != "generic":
+            self._fused_critical = kernel == "critical"
+        self._resolvers: Dict[Tuple[type, type], Callable] = {}
+    
+    def with_stages(self, *stages: DamageStage) -> "DamagePipeline":
+        """Retorna un pipeline nuevo con estas etapas agregadas al final."""
+        return DamagePipeline(self.calculator, self.stages + stages)
+    
+    def resolver(self, defender_type: type, armor_type: type) -> Callable:
+        """Función resolve(attacker, defender, base_damage) para esa combinación de tipos."""
+        key = (defender_type, armor_type)
+        resolver = self._resolvers.get(key)
+        if resolver is None:
+            if not uses_stock_take_damage(defender_type):
+                resolver = _take_damage_resolver(self._calculate, armor_type)
+            else:
+                armor_kernel = _armor_kernel(armor_type)
+                fused = _FUSED_RESOLVERS.get(armor_kernel)
+                if fused is not None and self._fused_critical is not None:
+                    resolver = fused(self.calculator, armor_type, self._fused_critical)
+                else:
+                    resolver = _ARMOR_RESOLVERS[armor_kernel](self._calculate, armor_type)
+            self._resolvers[key] = resolver
+        return resolver
+    
+    def resolve(self, attacker: Character, defender: Character, base_damage: int) -> int:
+        """
+        Aplica un golpe al defensor.
+        
+        Returns:
+            Daño real recibido después de las etapas y la armadura
+        """
+        resolver = self._resolvers.get((type(defender), type(defender.armor)))
+        if resolver is None:
+            resolver = self.resolver(type(defender), type(defender.armor))
+        return resolver(attacker, defender, base_damage)
+    
+    def attack(self, attacker: Character, defender: Character, weapon: Weapon) -> int:
+        """Aplica un golpe con el arma; no revisa si los personajes están vivos ni registra."""
+        return self.resolve(attacker, defender, weapon.get_damage())
\ No newline at end of file
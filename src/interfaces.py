@@ -23,6 +23,10 @@ class Weapon(ABC):
 class DamageCalculator(ABC):
     """Interfaz para calcular daño en combate."""
     
+    # True si calculate_damage es una función pura de sus argumentos, lo que
+    # permite reutilizar su resultado entre golpes con los mismos niveles
+    deterministic = False
+    
     @abstractmethod
     def calculate_damage(self, base_damage: int, attacker_level: int, defender_level: int) -> int:
         """
@@ -37,6 +41,20 @@ class DamageCalculator(ABC):
             Daño final calculado
         """
         pass
+    
+    def calculate_damage_batch(self, base_damages, attacker_levels, defender_levels) -> list:
+        """
+        Calcula el daño de un lote de golpes.
+        
+        La implementación por defecto llama a calculate_damage en orden; las
+        implementaciones pueden sobrescribirla con una versión más rápida que
+        dé los mismos resultados.
+        """
+        return [
+            self.calculate_damage(base_damage, attacker_level, defender_level)
+            for base_damage, attacker_level, defender_level in zip(
+                base_damages, attacker_levels, defender_levels)
+        ]
 
 
 class Armor(ABC):
@@ -63,4 +81,62 @@ class Armor(ABC):
         Returns:
             Daño después de la absorción
         """
+        pass
+    
+    def is_broken(self) -> bool:
+        """
+        Verifica si la armadura se agotó y ya no absorbe daño.
+        
+        Por defecto las armaduras no se agotan.
+        """
+        return False
+    
+    def absorb_damage_n(self, incoming_damage: int, n: int) -> int:
+        """
+        Aplica n golpes idénticos y retorna el daño total que pasa.
+        
+        Deja la armadura en el mismo estado que n llamadas sucesivas a
+        absorb_damage. Esta implementación genérica las hace una a una; las
+        armaduras concretas la sobrescriben con una versión que no recorre
+        cada golpe.
+        
+        Args:
+            incoming_damage: Daño entrante de cada golpe
+            n: Cantidad de golpes
+            
+        Returns:
+            Suma del daño después de la absorción
+        """
+        total = 0
+        for _ in range(n):
+            total += self.absorb_damage(incoming_damage)
+        return total
+
+
+class CombatHook:
+    """
+    Oyente de ataques para CombatSystem.add_hook.
+    
+    Los métodos no hacen nada por defecto; se sobrescriben los que interesen.
+    """
+    
+    def before_attack(self, attacker, defender, weapon):
+        """Se llama antes de resolver cada ataque."""
+        pass
+    
+    def after_attack(self, attacker, defender, weapon, result: dict):
+        """Se llama con el resultado de cada ataque, exitoso o no."""
+        pass
+    
+    def after_hit(self, attacker, defender, damage, armor_was_broken: bool):
+        """
+        Se llama por cada golpe de attack_many() y attack_batch(), que no
+        pasan por before_attack() ni after_attack().
+        
+        Args:
+            damage: Daño real recibido, o None si el golpe no se hizo porque
+                el atacante o el defensor estaba muerto
+            armor_was_broken: Si la armadura del defensor ya estaba agotada
+                antes del golpe
+        """
         pass
\ No newline at end of file
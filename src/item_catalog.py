@@ -0,0 +1,251 @@
+"""
+Catálogo de objetos cargado desde datos.
+
+Las definiciones de armas y armaduras se cargan en bloque desde JSON o CSV y
+se buscan por id en O(1). Las armas no tienen estado, así que la plantilla
+misma es el arma que comparten todos sus portadores. Las armaduras son de
+las clases de siempre y guardan una referencia a su plantilla compartida,
+de donde toman el nombre (resuelto al asignarla) y la durabilidad máxima
+(max_durability); por instancia solo queda esa referencia, el nombre, la
+defensa y el desgaste (durabilidad, maná y reflejo).
+"""
+import csv
+import json
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from src.armor_system import LeatherArmor, PlateArmor, MagicShield, EnchantedArmor
+from src.interfaces import Armor, Weapon
+
+
+# Tipo de armadura -> clase base
+ARMOR_KINDS = {
+    "leather": LeatherArmor,
+    "plate": PlateArmor,
+    "magic_shield": MagicShield,
+    "enchanted": EnchantedArmor,
+}
+
+CSV_FIELDS = ("type", "id", "name", "damage", "intelligence_bonus", "kind", "defense",
+              "durability", "mana", "reflect_chance")
+
+
+class WeaponTemplate(NamedTuple):
+    """Arma inmutable compartida por todos sus portadores."""
+    id: str
+    name: str
+    damage: int
+    intelligence_bonus: int = 0
+    
+    def get_damage(self) -> int:
+        return self.damage + self.intelligence_bonus
+    
+    def get_name(self) -> str:
+        return self.name
+
+
+Weapon.register(WeaponTemplate)
+
+
+class ArmorTemplate(NamedTuple):
+    """Estadísticas inmutables de una armadura del catálogo."""
+    id: str
+    name: str
+    kind: str
+    defense: int
+    durability: int        # Durabilidad inicial (no se usa en MagicShield)
+    mana: int              # Maná inicial y máximo (solo MagicShield)
+    reflect_chance: float  # Solo EnchantedArmor
+
+
+def _armor_defaults(kind: str) -> dict:
+    base = ARMOR_KINDS[kind]
+    prototype = base()
+    return {
+        "defense": prototype._defense,
+        "durability": getattr(base, "MAX_DURABILITY", 0),
+        "mana": getattr(prototype, "_max_mana", 0),
+        "reflect_chance": getattr(prototype, "_reflect_chance", 0.0),
+    }
+
+
+_DEFAULTS = {kind: _armor_defaults(kind) for kind in ARMOR_KINDS}
+
+
+def max_durability(armor: Armor) -> Optional[int]:
+    """
+    Durabilidad inicial de una armadura: la de su plantilla del catálogo si la
+    tiene, o la de su clase. None si la armadura no se desgasta por durabilidad.
+    """
+    default = getattr(type(armor), "MAX_DURABILITY", None)
+    if default is None:
+        return None
+    template = getattr(armor, "template", None)
+    return template.durability if template is not None else default
+
+
+class ItemCatalog:
+    """
+    Definiciones de armas y armaduras indexadas por id.
+    
+    Las armas y las armaduras tienen espacios de ids separados.
+    """
+    
+    def __init__(self):
+        self._weapons: Dict[str, WeaponTemplate] = {}
+        self._armors: Dict[str, ArmorTemplate] = {}
+    
+    def __len__(self) -> int:
+        return len(self._weapons) + len(self._armors)
+    
+    def add_weapon(self, id: str, name: str, damage: int,
+                   intelligence_bonus: int = 0) -> WeaponTemplate:
+        """
+        Agrega una definición de arma.
+        
+        Raises:
+            ValueError: Si el id ya existe
+        """
+        if id in self._weapons:
+            raise ValueError(f"Arma repetida en el catálogo: {id}")
+        weapon = self._weapons[id] = WeaponTemplate(id, name, int(damage), int(intelligence_bonus))
+        return weapon
+    
+    def add_armor(self, id: str, name: str, kind: str, defense: Optional[int] = None,
+                  durability: Optional[int] = None, mana: Optional[int] = None,
+                  reflect_chance: Optional[float] = None) -> ArmorTemplate:
+        """
+        Agrega una definición de armadura; lo no indicado toma el valor por
+        defecto de la armadura base.
+        
+        Raises:
+            ValueError: Si el id ya existe o el tipo no es conocido
+        """
+        if id in self._armors:
+            raise ValueError(f"Armadura repetida en el catálogo: {id}")
+        defaults = _DEFAULTS.get(kind)
+        if defaults is None:
+            raise ValueError(f"Tipo de armadura desconocido: {kind}")
+        template = self._armors[id] = ArmorTemplate(
+            id, name, kind,
+            defaults["defense"] if defense is None else int(defense),
+            defaults["durability"] if durability is None else int(durability),
+            defaults["mana"] if mana is None else int(mana),
+            defaults["reflect_chance"] if reflect_chance is None else float(reflect_chance),
+        )
+        return template
+    
+    def weapon(self, id: str) -> WeaponTemplate:
+        """Retorna el arma compartida con ese id (KeyError si no existe)."""
+        return self._weapons[id]
+    
+    def armor_template(self, id: str) -> ArmorTemplate:
+        return self._armors[id]
+    
+    def create_armor(self, id: str, rng=None) -> Armor:
+        """
+        Crea una armadura nueva de ese tipo.
+        
+        Args:
+            id: Id de la plantilla
+            rng: Fuente aleatoria (solo para armaduras encantadas)
+        """
+        template = self._armors[id]
+        kind = template.kind
+        if kind == "magic_shield":
+            armor = MagicShield(template.defense, template.mana)
+        else:
+            if kind == "enchanted":
+                armor = EnchantedArmor(template.defense, rng)
+                armor._reflect_chance = template.reflect_chance
+            else:
+                armor = ARMOR_KINDS[kind](template.defense)
+            armor._durability = template.durability
+        armor.template = template
+        return armor
+    
+    def weapons(self) -> Iterable[WeaponTemplate]:
+        return self._weapons.values()
+    
+    def armors(self) -> Iterable[ArmorTemplate]:
+        return self._armors.values()
+    
+    def load_records(self, records: Iterable[dict]) -> int:
+        """
+        Carga definiciones; cada registro indica "type" ("weapon" o "armor").
+        Los campos vacíos o ausentes toman el valor por defecto.
+        
+        Returns:
+            Cantidad de definiciones cargadas
+        
+        Raises:
+            ValueError: Si un registro es inválido
+        """
+        add_weapon = self.add_weapon
+        add_armor = self.add_armor
+        loaded = 0
+        for record in records:
+            item_type = record.get("type")
+            try:
+                if item_type == "weapon":
+                    bonus = record.get("intelligence_bonus")
+                    add_weapon(record["id"], record["name"], record["damage"], bonus or 0)
+                elif item_type == "armor":
+                    add_armor(record["id"], record["name"], record["kind"],
+                              _optional(record.get("defense")),
+                              _optional(record.get("durability")),
+                              _optional(record.get("mana")),
+                              _optional(record.get("reflect_chance")))
+                else:
+                    raise ValueError(f"Tipo de objeto desconocido: {item_type!r}")
+            except KeyError as error:
+                raise ValueError(f"Falta el campo {error.args[0]!r} en {record!r}") from None
+            loaded += 1
+        return loaded
+    
+    def load_json(self, source) -> int:
+        """
+        Carga un JSON con una lista de registros, o con las listas
+        "weapons" y "armors" (donde "type" se puede omitir).
+        
+        Args:
+            source: Ruta o archivo de texto abierto
+        """
+        if hasattr(source, "read"):
+            document = json.load(source)
+        else:
+            with open(source, encoding="utf-8") as json_file:
+                document = json.load(json_file)
+        if isinstance(document, dict):
+            loaded = self.load_records(
+                dict(record, type="weapon") for record in document.get("weapons", ())
+            )
+            return loaded + self.load_records(
+                dict(record, type="armor") for record in document.get("armors", ())
+            )
+        return self.load_records(document)
+    
+    def load_csv(self, source) -> int:
+        """
+        Carga un CSV con encabezado (columnas de CSV_FIELDS; las que no
+        aplican al tipo de objeto quedan vacías).
+        
+        Args:
+            source: Ruta o archivo de texto abierto
+        """
+        if hasattr(source, "read"):
+            return self.load_records(csv.DictReader(source))
+        with open(source, encoding="utf-8", newline="") as csv_file:
+            return self.load_records(csv.DictReader(csv_file))
+    
+    def dump_json(self, path: str):
+        """Guarda todas las definiciones en el formato de load_json."""
+        document = {
+            "weapons": [weapon._asdict() for weapon in self._weapons.values()],
+            "armors": [armor._asdict() for armor in self._armors.values()],
+        }
+        with open(path, "w", encoding="utf-8") as json_file:
+            json.dump(document, json_file)
+
+
+def _optional(value):
+    return None if value is None or value == "" else value
\ No newline at end of file
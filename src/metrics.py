@@ -0,0 +1,492 @@
+"""
+Métricas del combate.
+Contadores e histogramas de intervalos fijos, seguros entre hilos, con
+salida en el formato de texto de Prometheus (por HTTP) y una API de
+snapshot para consultarlos dentro del proceso.
+
+Uso típico:
+    metrics = CombatMetrics()
+    combat.add_hook(metrics)
+    server = MetricsServer(metrics.registry, port=9100)
+    server.start()
+"""
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.armor_system import LeatherArmor, PlateArmor, MagicShield, EnchantedArmor
+from src.combat_system import Character
+from src.interfaces import CombatHook
+
+
+# Intervalos por defecto (límites superiores inclusivos, como "le" en Prometheus)
+DAMAGE_BUCKETS = (0, 5, 10, 25, 50, 75, 100, 150, 250, 500, 1000)
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3, 1e-2)
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float):
+        if value == float("inf"):
+            return "+Inf"
+        return repr(value)
+    return str(value)
+
+
+class _CellOwner:
+    """Testigo guardado en el threading.local; muere junto con el hilo."""
+    
+    __slots__ = ("cell", "__weakref__")
+    
+    def __init__(self, cell: list):
+        self.cell = cell
+
+
+def _fold(ref: "weakref.ref", key: int):
+    value = ref()
+    if value is not None:
+        value._fold(key)
+
+
+class _ShardedValue:
+    """
+    Suma repartida en una celda por hilo.
+    
+    Cada hilo solo escribe su propia celda, así que incrementar no necesita
+    candado; el candado solo protege la creación de celdas. Leer suma todas
+    las celdas. Cuando un hilo termina, su celda se suma a una base común y
+    se descarta, así que los hilos de corta vida no acumulan memoria.
+    """
+    
+    __slots__ = ("_cells", "_base", "_keys", "_local", "_lock", "_width", "__weakref__")
+    
+    def __init__(self, width: int = 1):
+        self._cells: Dict[int, list] = {}
+        self._base = [0] * width
+        self._keys = count()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._width = width
+    
+    def cell(self) -> list:
+        """Celda del hilo actual."""
+        local = self._local
+        try:
+            return local.owner.cell
+        except AttributeError:
+            pass
+        cell = [0] * self._width
+        owner = local.owner = _CellOwner(cell)
+        with self._lock:
+            key = next(self._keys)
+            self._cells[key] = cell
+        # El threading.local suelta al testigo cuando el hilo termina
+        weakref.finalize(owner, _fold, weakref.ref(self), key)
+        return cell
+    
+    def _fold(self, key: int):
+        with self._lock:
+            cell = self._cells.pop(key, None)
+            if cell is not None:
+                base = self._base
+                for i, value in enumerate(cell):
+                    base[i] += value
+    
+    def inc(self, amount: float = 1):
+        try:
+            cell = self._local.owner.cell
+        except AttributeError:
+            cell = self.cell()
+        cell[0] += amount
+    
+    def totals(self) -> list:
+        with self._lock:
+            totals = list(self._base)
+            cells = list(self._cells.values())
+        for cell in cells:
+            for i, value in enumerate(cell):
+                totals[i] += value
+        return totals
+    
+    def value(self) -> float:
+        return self.totals()[0]
+
+
+class Counter(_ShardedValue):
+    """
+    Contador monótono, opcionalmente con etiquetas.
+    
+    Sin etiquetas se usa inc() (el de _ShardedValue: el contador guarda sus
+    propias celdas); con etiquetas, labels(...) retorna el contador hijo
+    correspondiente, que se puede guardar para no buscarlo en cada
+    incremento.
+    """
+    
+    kind = "counter"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__()
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children_lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], _ShardedValue] = {}
+        if not labelnames:
+            self._children[()] = self
+    
+    def cell(self) -> list:
+        # inc() solo llega aquí la primera vez en cada hilo; un contador con
+        # etiquetas nunca tiene celdas propias
+        if self.labelnames:
+            raise ValueError(f"{self.name} tiene etiquetas; use labels(...).inc()")
+        return super().cell()
+    
+    def labels(self, *values) -> _ShardedValue:
+        """Retorna el contador hijo para los valores de etiqueta indicados."""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} espera las etiquetas {self.labelnames}")
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._children_lock:
+                child = self._children.setdefault(key, _ShardedValue())
+        return child
+    
+    def value(self, *values) -> float:
+        child = self._children.get(tuple(str(value) for value in values))
+        return child.totals()[0] if child is not None else 0
+    
+    def _items(self):
+        with self._children_lock:
+            return list(self._children.items())
+    
+    def snapshot(self):
+        if not self.labelnames:
+            return self.totals()[0]
+        return {",".join(key): child.totals()[0] for key, child in self._items()}
+    
+    def samples(self) -> List[Tuple[str, str, float]]:
+        return [(self.name, _format_labels(self.labelnames, key), child.totals()[0])
+                for key, child in self._items()]
+
+
+class Histogram:
+    """
+    Histograma de intervalos fijos.
+    
+    observe() cuesta una búsqueda binaria y tres sumas en la celda del hilo;
+    los acumulados que pide Prometheus se calculan solo al exportar.
+    """
+    
+    kind = "histogram"
+    
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float]):
+        bounds = sorted(buckets)
+        if not bounds:
+            raise ValueError("Un histograma necesita al menos un intervalo")
+        self.name = name
+        self.documentation = documentation
+        self.bounds = tuple(bounds)
+        # Un contador por intervalo, uno para lo que supera el último límite,
+        # la suma y la cantidad de observaciones
+        self._sum_index = len(bounds) + 1
+        self._values = _ShardedValue(len(bounds) + 3)
+    
+    def observe(self, value: float):
+        try:
+            cell = self._values._local.owner.cell
+        except AttributeError:
+            cell = self._values.cell()
+        cell[bisect_left(self.bounds, value)] += 1
+        cell[self._sum_index] += value
+        cell[-1] += 1
+    
+    def _totals(self):
+        totals = self._values.totals()
+        return totals[:self._sum_index], totals[self._sum_index], totals[-1]
+    
+    def snapshot(self) -> dict:
+        """Conteo por intervalo (no acumulado), suma y cantidad de observaciones."""
+        counts, total, count = self._totals()
+        buckets = {_format_value(bound): counts[i] for i, bound in enumerate(self.bounds)}
+        buckets["+Inf"] = counts[-1]
+        return {"buckets": buckets, "sum": total, "count": count}
+    
+    def samples(self) -> List[Tuple[str, str, float]]:
+        counts, total, count = self._totals()
+        samples = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.bounds + (float("inf"),), counts):
+            cumulative += bucket_count
+            samples.append((f"{self.name}_bucket",
+                            _format_labels((), (), f'le="{_format_value(float(bound))}"'),
+                            cumulative))
+        samples.append((f"{self.name}_sum", "", total))
+        samples.append((f"{self.name}_count", "", count))
+        return samples
+
+
+class MetricsRegistry:
+    """Conjunto de métricas con nombre único."""
+    
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Métrica repetida: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+    
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+    
+    def histogram(self, name: str, documentation: str, buckets: Sequence[float]) -> Histogram:
+        return self.register(Histogram(name, documentation, buckets))
+    
+    def snapshot(self) -> dict:
+        """Valores actuales de todas las métricas, por nombre."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+    
+    def render_prometheus(self) -> str:
+        """Todas las métricas en el formato de texto de Prometheus 0.0.4."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class CombatMetrics(CombatHook):
+    """
+    Oyente de CombatSystem que alimenta las métricas del combate.
+    
+    Registra ataques, ataques fallidos, muertes, el daño de cada golpe, la
+    latencia de attack y las armaduras que se agotan (según is_broken()).
+    
+    Los golpes de attack_many() y attack_batch() llegan por after_hit() y
+    cuentan igual que los de attack(), salvo en la latencia, que solo mide
+    attack().
+    
+    Como oyente solo ve lo que pasa por CombatSystem. instrument() envuelve
+    además Character.take_damage y absorb_damage de las armaduras para
+    medir todo el daño recibido y absorbido, también el de DamagePipeline y
+    el de las llamadas directas.
+    """
+    
+    ARMOR_TYPES = (LeatherArmor, PlateArmor, MagicShield, EnchantedArmor)
+    
+    def __init__(self, registry: Optional[MetricsRegistry] = None,
+                 damage_buckets: Sequence[float] = DAMAGE_BUCKETS,
+                 latency_buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.attacks = self.registry.counter("combat_attacks_total", "Ataques exitosos")
+        self.failed = self.registry.counter(
+            "combat_failed_attacks_total", "Ataques rechazados por atacante o defensor muerto"
+        )
+        self.kills = self.registry.counter("combat_kills_total", "Defensores muertos por un ataque")
+        self.damage = self.registry.histogram(
+            "combat_damage", "Daño real por golpe después de la armadura", damage_buckets
+        )
+        self.latency = self.registry.histogram(
+            "combat_attack_latency_seconds", "Duración de CombatSystem.attack", latency_buckets
+        )
+        self.armor_broken = self.registry.counter(
+            "combat_armor_broken_total", "Armaduras agotadas durante un ataque", ("armor",)
+        )
+        self.damage_taken = self.registry.histogram(
+            "combat_damage_taken", "Daño recibido por Character.take_damage (con instrument())",
+            damage_buckets
+        )
+        self.deaths = self.registry.counter(
+            "combat_deaths_total", "Personajes muertos en take_damage (con instrument())"
+        )
+        self.armor_absorbed = self.registry.counter(
+            "combat_armor_absorbed_total", "Daño absorbido por la armadura (con instrument())",
+            ("armor",)
+        )
+        self._armor_children: Dict[type, _ShardedValue] = {}
+        self._local = threading.local()
+        # (clase, nombre del método, función original) de lo que envolvió instrument()
+        self._originals: List[Tuple[type, str, object]] = []
+    
+    def before_attack(self, attacker, defender, weapon):
+        armor = defender.armor
+        local = self._local
+        local.armor_was_broken = armor.is_broken() if armor else True
+        local.start = time.perf_counter_ns()
+    
+    def after_attack(self, attacker, defender, weapon, result: dict):
+        local = self._local
+        self.latency.observe((time.perf_counter_ns() - local.start) / 1e9)
+        if not result["success"]:
+            self.failed.inc()
+            return
+        self.attacks.inc()
+        self.damage.observe(result["damage"])
+        if not result["defender_alive"]:
+            self.kills.inc()
+        if not local.armor_was_broken and not self._originals:
+            self._count_broken(defender.armor)
+    
+    def after_hit(self, attacker, defender, damage, armor_was_broken: bool):
+        if damage is None:
+            self.failed.inc()
+            return
+        self.attacks.inc()
+        self.damage.observe(damage)
+        if defender.current_health <= 0:
+            self.kills.inc()
+        armor = defender.armor
+        if armor and not armor_was_broken and not self._originals:
+            self._count_broken(armor)
+    
+    def _count_broken(self, armor):
+        if not armor.is_broken():
+            return
+        armor_type = type(armor)
+        child = self._armor_children.get(armor_type)
+        if child is None:
+            child = self._armor_children[armor_type] = self.armor_broken.labels(
+                armor_type.__name__
+            )
+        child.inc()
+    
+    def instrument(self, armor_types: Sequence[type] = ARMOR_TYPES) -> "CombatMetrics":
+        """
+        Envuelve Character.take_damage y absorb_damage de armor_types.
+        
+        El cambio es global, para todos los personajes y armaduras, hasta
+        uninstrument(). Mientras dura, attack_batch() y DamagePipeline pasan
+        por los métodos en lugar de aplicar el daño en línea, y las
+        armaduras agotadas se cuentan aquí y no en los oyentes. Los
+        DamagePipeline arman sus funciones la primera vez que ven cada tipo,
+        así que conviene instrumentar antes de crearlos.
+        
+        Raises:
+            ValueError: Si ya hay métodos envueltos por estas métricas
+        """
+        if self._originals:
+            raise ValueError("Las métricas ya están instrumentadas")
+        self._wrap(Character, "take_damage", self._wrap_take_damage)
+        for armor_type in armor_types:
+            self._wrap(armor_type, "absorb_damage", self._wrap_absorb_damage)
+        return self
+    
+    def uninstrument(self):
+        """Restaura los métodos que envolvió instrument()."""
+        while self._originals:
+            owner, name, original = self._originals.pop()
+            setattr(owner, name, original)
+    
+    def _wrap(self, owner: type, name: str, wrapper):
+        original = owner.__dict__[name]
+        self._originals.append((owner, name, original))
+        wrapped = wrapper(owner, original)
+        wrapped.__name__ = name
+        wrapped.__doc__ = original.__doc__
+        wrapped.__wrapped__ = original
+        setattr(owner, name, wrapped)
+    
+    def _wrap_take_damage(self, owner: type, original):
+        damage_taken = self.damage_taken
+        deaths = self.deaths
+        
+        def take_damage(character, damage):
+            was_alive = character.current_health > 0
+            actual_damage = original(character, damage)
+            damage_taken.observe(actual_damage)
+            if was_alive and character.current_health <= 0:
+                deaths.inc()
+            return actual_damage
+        return take_damage
+    
+    def _wrap_absorb_damage(self, owner: type, original):
+        absorbed = self.armor_absorbed.labels(owner.__name__)
+        count_broken = self._count_broken
+        
+        def absorb_damage(armor, incoming_damage):
+            was_broken = armor.is_broken()
+            damage = original(armor, incoming_damage)
+            absorbed.inc(incoming_damage - damage)
+            if not was_broken:
+                count_broken(armor)
+            return damage
+        return absorb_damage
+    
+    def snapshot(self) -> dict:
+        return self.registry.snapshot()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: Optional[MetricsRegistry] = None
+    
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsServer:
+    """Servidor HTTP local que expone /metrics en un hilo aparte."""
+    
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 0):
+        handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address[:2]
+    
+    def start(self) -> Tuple[str, int]:
+        """Empieza a atender en segundo plano y retorna (host, puerto)."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.address
+    
+    def close(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
\ No newline at end of file
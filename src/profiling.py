@@ -0,0 +1,56 @@
+"""
+Perfilado de CombatSystem.attack.
+Acumula el tiempo de cada fase del ataque y cuenta los ataques por clase de
+arma, armadura y calculador. Solo se usa mientras el perfilado está
+habilitado; la ruta normal de attack no lo toca.
+"""
+from collections import Counter
+from typing import Dict
+
+
+# Fases medidas dentro de attack, en orden
+PHASES = ("calculator", "armor", "log", "result")
+
+
+class AttackProfiler:
+    """Acumulador de tiempos por fase (en nanosegundos) y contadores por clase."""
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        """Descarta lo acumulado."""
+        self.attacks = 0
+        self.failed = 0
+        self.total_ns = 0
+        self.phase_ns: Dict[str, int] = dict.fromkeys(PHASES, 0)
+        self.weapons = Counter()
+        self.armors = Counter()
+        self.calculators = Counter()
+    
+    def stats(self) -> dict:
+        """
+        Resumen de lo acumulado.
+        
+        Returns:
+            Diccionario con la cantidad de ataques, el tiempo total y por fase
+            (total, promedio y proporción) y los contadores por clase
+        """
+        completed = self.attacks - self.failed
+        phases = {}
+        for phase, total in self.phase_ns.items():
+            phases[phase] = {
+                "total_ns": total,
+                "mean_ns": total / completed if completed else 0.0,
+                "share": total / self.total_ns if self.total_ns else 0.0,
+            }
+        return {
+            "attacks": self.attacks,
+            "failed": self.failed,
+            "total_ns": self.total_ns,
+            "mean_ns": self.total_ns / self.attacks if self.attacks else 0.0,
+            "phases": phases,
+            "weapons": dict(self.weapons),
+            "armors": dict(self.armors),
+            "calculators": dict(self.calculators),
+        }
\ No newline at end of file
@@ -0,0 +1,328 @@
+"""
+Grabación y reproducción determinista de batallas.
+
+BattleRecorder envuelve las fuentes aleatorias del calculador y de las
+armaduras para registrar cada número que consumen, y guarda la secuencia de
+ataques como índices. replay() vuelve a ejecutar la batalla con esos mismos
+números, en lote y sin log, y compara el hash del estado final. Cada
+checkpoint_interval turnos se guarda un snapshot para poder saltar a
+cualquier turno sin reproducir desde el principio.
+"""
+import hashlib
+import json
+import pickle
+import random
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.combat_system import Character, CombatSystem
+from src.interfaces import Weapon
+from src.rng import RandomStreams, draw_many
+from src.snapshot import (
+    CHARACTER_COLUMNS, SECTION_HEADER, Snapshot, restore, snapshot
+)
+
+
+MAGIC = b"CRPL"
+FORMAT_VERSION = 1
+RECORDING_HEADER = struct.Struct("<4sHBxI")
+# Campos por comando: atacante, defensor, arma
+COMMAND_FIELDS = 3
+
+
+class ReplayMismatchError(Exception):
+    """La reproducción no coincide con lo grabado."""
+    pass
+
+
+def _source_rng(source):
+    return random if source is None else source
+
+
+class RecordingRandom:
+    """
+    Fuente aleatoria que anota cada número entregado.
+    Todas las fuentes de una grabación anotan en el mismo arreglo, en el
+    orden en que la batalla las consume.
+    """
+    
+    def __init__(self, source, draws: array):
+        self.source = source
+        self._draws = draws
+    
+    def random(self) -> float:
+        value = self.source.random()
+        self._draws.append(value)
+        return value
+    
+    def take(self, count: int) -> List[float]:
+        values = draw_many(self.source, count)
+        self._draws.extend(values)
+        return values
+    
+    def __reduce__(self):
+        # En un snapshot se guarda la fuente original, no lo anotado
+        return _source_rng, (None if self.source is random else self.source,)
+
+
+class ReplayRandom:
+    """Fuente que entrega los números grabados, en orden."""
+    
+    def __init__(self, draws: Sequence[float], position: int = 0):
+        self._draws = draws
+        self.position = position
+    
+    def random(self) -> float:
+        position = self.position
+        if position >= len(self._draws):
+            raise ReplayMismatchError("La reproducción consumió más números que la grabación")
+        self.position = position + 1
+        return self._draws[position]
+    
+    def take(self, count: int) -> List[float]:
+        start = self.position
+        if start + count > len(self._draws):
+            raise ReplayMismatchError("La reproducción consumió más números que la grabación")
+        self.position = start + count
+        return list(self._draws[start:start + count])
+
+
+def state_hash(characters) -> str:
+    """Hash del estado de los personajes (vida, nivel y estado de armaduras)."""
+    snap = snapshot(characters)
+    digest = hashlib.blake2b(digest_size=16)
+    for name in ("names",) + tuple(CHARACTER_COLUMNS):
+        digest.update(snap.columns[name].tobytes())
+    return digest.hexdigest()
+
+
+def _random_components(characters, combat_system: CombatSystem):
+    """Pares (clave, objeto) de los componentes que tienen una fuente rng."""
+    components = []
+    if hasattr(combat_system.damage_calculator, "rng"):
+        components.append((("calculator",), combat_system.damage_calculator))
+    for index, character in enumerate(characters):
+        armor = character.armor
+        if armor is not None and hasattr(armor, "rng"):
+            components.append((("armor", index), armor))
+    return components
+
+
+class Recording:
+    """Grabación de una batalla: estado inicial, comandos, números y checkpoints."""
+    
+    def __init__(self, meta: dict, initial: Snapshot, weapons: List[Weapon],
+                 commands: array, draws: array,
+                 checkpoints: List[Tuple[int, int, Snapshot]]):
+        self.meta = meta
+        self.initial = initial
+        self.weapons = weapons
+        self.commands = commands
+        self.draws = draws
+        # (turno, números consumidos antes del turno, snapshot de los personajes)
+        self.checkpoints = checkpoints
+    
+    @property
+    def turns(self) -> int:
+        return len(self.commands) // COMMAND_FIELDS
+    
+    def to_bytes(self) -> bytes:
+        """Serializa la grabación (mismas secciones que los snapshots)."""
+        meta = dict(self.meta, checkpoints=[[turn, cursor] for turn, cursor, _ in self.checkpoints])
+        sections = [
+            ("meta", "J", json.dumps(meta).encode("utf-8")),
+            ("commands", self.commands.typecode, self.commands),
+            ("draws", self.draws.typecode, self.draws),
+            ("weapons", "P", pickle.dumps(self.weapons, protocol=pickle.HIGHEST_PROTOCOL)),
+            ("initial", "S", self.initial.to_bytes()),
+        ]
+        sections.extend((f"checkpoint{i}", "S", checkpoint.to_bytes())
+                        for i, (_, _, checkpoint) in enumerate(self.checkpoints))
+        
+        byteorder = 0 if sys.byteorder == "little" else 1
+        parts = [RECORDING_HEADER.pack(MAGIC, FORMAT_VERSION, byteorder, len(sections))]
+        for name, typecode, data in sections:
+            view = memoryview(data).cast("B")
+            parts.append(SECTION_HEADER.pack(name.encode("ascii"), typecode.encode("ascii"),
+                                             view.nbytes))
+            parts.append(view)
+        return b"".join(parts)
+    
+    @classmethod
+    def from_bytes(cls, data) -> "Recording":
+        view = memoryview(data).cast("B")
+        if view.nbytes < RECORDING_HEADER.size:
+            raise ReplayMismatchError("Grabación truncada")
+        magic, version, byteorder, count = RECORDING_HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ReplayMismatchError("Los datos no son una grabación de batalla")
+        if version != FORMAT_VERSION:
+            raise ReplayMismatchError(f"Versión de grabación no soportada: {version}")
+        if byteorder != (0 if sys.byteorder == "little" else 1):
+            raise ReplayMismatchError("La grabación se escribió con otro orden de bytes")
+        
+        sections: Dict[str, Tuple[str, memoryview]] = {}
+        offset = RECORDING_HEADER.size
+        for _ in range(count):
+            raw_name, raw_typecode, size = SECTION_HEADER.unpack_from(view, offset)
+            offset += SECTION_HEADER.size
+            sections[raw_name.rstrip(b"\0").decode("ascii")] = (
+                raw_typecode.decode("ascii"), view[offset:offset + size]
+            )
+            offset += size
+        
+        def column(name):
+            typecode, payload = sections[name]
+            values = array(typecode)
+            values.frombytes(payload)
+            return values
+        
+        meta = json.loads(bytes(sections["meta"][1]))
+        checkpoints = [
+            (turn, cursor, Snapshot.from_bytes(sections[f"checkpoint{i}"][1]))
+            for i, (turn, cursor) in enumerate(meta.pop("checkpoints"))
+        ]
+        return cls(meta, Snapshot.from_bytes(sections["initial"][1]),
+                   pickle.loads(bytes(sections["weapons"][1])),
+                   column("commands"), column("draws"), checkpoints)
+    
+    def save(self, path: str):
+        with open(path, "wb") as recording_file:
+            recording_file.write(self.to_bytes())
+    
+    @classmethod
+    def load(cls, path: str) -> "Recording":
+        with open(path, "rb") as recording_file:
+            return cls.from_bytes(recording_file.read())
+
+
+class BattleRecorder:
+    """
+    Graba una batalla sobre un conjunto fijo de personajes.
+    
+    Los ataques se hacen con recorder.attack() en lugar de
+    combat_system.attack(); solo se graban los ataques, así que otros
+    cambios de estado durante la grabación harán fallar la verificación.
+    """
+    
+    def __init__(self, characters: Sequence[Character], combat_system: CombatSystem,
+                 seed: Optional[int] = None, checkpoint_interval: int = 1000):
+        """
+        Args:
+            characters: Personajes de la batalla (no cambian durante la grabación)
+            combat_system: Sistema de combate a usar
+            seed: Si se indica, cada componente aleatorio recibe un flujo
+                derivado de esta semilla antes de empezar
+            checkpoint_interval: Turnos entre checkpoints (0 los desactiva)
+        """
+        self.characters = list(characters)
+        self.combat_system = combat_system
+        self.checkpoint_interval = checkpoint_interval
+        self._indices = {id(character): index for index, character in enumerate(self.characters)}
+        self._weapons: List[Weapon] = []
+        self._weapon_indices: Dict[int, int] = {}
+        self.commands = array("q")
+        self.draws = array("d")
+        self.checkpoints: List[Tuple[int, int, Snapshot]] = []
+        
+        components = _random_components(self.characters, combat_system)
+        if seed is not None:
+            streams = RandomStreams(seed)
+            for key, component in components:
+                component.rng = streams.stream(*key)
+        self.initial = snapshot(self.characters, combat_system)
+        self._wrapped = []
+        for _, component in components:
+            self._wrapped.append((component, component.rng))
+            component.rng = RecordingRandom(component.rng, self.draws)
+        self.meta = {"seed": seed, "checkpoint_interval": checkpoint_interval}
+    
+    def _weapon_index(self, weapon: Weapon) -> int:
+        index = self._weapon_indices.get(id(weapon))
+        if index is None:
+            index = self._weapon_indices[id(weapon)] = len(self._weapons)
+            self._weapons.append(weapon)
+        return index
+    
+    def attack(self, attacker: Character, defender: Character, weapon: Weapon) -> dict:
+        """Ejecuta y graba un ataque."""
+        try:
+            attacker_index = self._indices[id(attacker)]
+            defender_index = self._indices[id(defender)]
+        except KeyError:
+            raise ValueError("Solo se pueden grabar ataques entre personajes de la batalla")
+        turn = len(self.commands) // COMMAND_FIELDS
+        interval = self.checkpoint_interval
+        if interval and turn and turn % interval == 0:
+            self.checkpoints.append((turn, len(self.draws), snapshot(self.characters)))
+        self.commands.extend((attacker_index, defender_index, self._weapon_index(weapon)))
+        return self.combat_system.attack(attacker, defender, weapon)
+    
+    def finish(self) -> Recording:
+        """Termina la grabación, devuelve las fuentes originales y retorna la grabación."""
+        for component, rng in self._wrapped:
+            component.rng = rng
+        self._wrapped = []
+        meta = dict(self.meta, final_hash=state_hash(self.characters))
+        return Recording(meta, self.initial, list(self._weapons), self.commands,
+                         self.draws, list(self.checkpoints))
+
+
+def replay(recording: Recording, until_turn: Optional[int] = None,
+           verify: bool = True) -> Tuple[List[Character], CombatSystem]:
+    """
+    Reproduce una grabación.
+    
+    Args:
+        recording: Grabación a reproducir
+        until_turn: Turno donde detenerse (por defecto, el final); parte del
+            último checkpoint anterior a ese turno
+        verify: Si se reproduce hasta el final, compara el hash del estado
+            final y que se hayan consumido exactamente los números grabados
+    
+    Returns:
+        Personajes y sistema de combate en el estado de ese turno. El log del
+        sistema es el del inicio de la grabación: la reproducción no registra.
+    
+    Raises:
+        ReplayMismatchError: Si el resultado no coincide con la grabación
+    """
+    turns = recording.turns
+    until_turn = turns if until_turn is None else until_turn
+    if not 0 <= until_turn <= turns:
+        raise ValueError(f"El turno debe estar entre 0 y {turns}")
+    
+    characters, combat_system = restore(recording.initial)
+    start_turn, cursor = 0, 0
+    checkpoint_turns = [turn for turn, _, _ in recording.checkpoints]
+    position = bisect_right(checkpoint_turns, until_turn) - 1
+    if position >= 0:
+        start_turn, cursor, checkpoint = recording.checkpoints[position]
+        characters, _ = restore(checkpoint)
+    
+    rng = ReplayRandom(recording.draws, cursor)
+    for _, component in _random_components(characters, combat_system):
+        component.rng = rng
+    
+    commands = recording.commands
+    start = start_turn * COMMAND_FIELDS
+    stop = until_turn * COMMAND_FIELDS
+    weapon_damages = [weapon.get_damage() for weapon in recording.weapons]
+    combat_system.attack_batch(
+        characters,
+        commands[start:stop:COMMAND_FIELDS],
+        commands[start + 1:stop:COMMAND_FIELDS],
+        [weapon_damages[index] for index in commands[start + 2:stop:COMMAND_FIELDS]],
+    )
+    
+    if verify and until_turn == turns:
+        if rng.position != len(recording.draws):
+            raise ReplayMismatchError(
+                f"Se consumieron {rng.position} de {len(recording.draws)} números grabados"
+            )
+        if state_hash(characters) != recording.meta["final_hash"]:
+            raise ReplayMismatchError("El estado final no coincide con la grabación")
+    return characters, combat_system
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""
+Fuentes de números aleatorios inyectables.
+Permiten reproducir combates con una semilla y pre-generar números por
+bloques para las rutas en lote.
+"""
+import hashlib
+import random
+from typing import List, Optional
+
+
+def derive_seed(seed: int, *keys) -> int:
+    """
+    Deriva una semilla independiente a partir de una semilla base y claves.
+    
+    Sirve para dar a cada batalla o entidad su propio flujo, p. ej.
+    derive_seed(battle_seed, "armor", character_id).
+    """
+    text = ":".join(str(part) for part in (seed,) + keys)
+    digest = hashlib.blake2b(text.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class BufferedRandom:
+    """
+    Generador que pre-genera números en bloques.
+    
+    Produce exactamente la misma secuencia que random.Random(seed).random(),
+    así que la ruta escalar (random) y la ruta en lote (take) consumen el
+    flujo en el mismo orden y dan el mismo resultado para la misma semilla.
+    """
+    
+    def __init__(self, seed: Optional[int] = None, block_size: int = 1024):
+        self._generator = random.Random(seed)
+        self._block_size = max(1, block_size)
+        self._block: List[float] = []
+        self._position = 0
+    
+    def _refill(self):
+        draw = self._generator.random
+        self._block = [draw() for _ in range(self._block_size)]
+        self._position = 0
+    
+    def random(self) -> float:
+        """Retorna el siguiente número en [0, 1)."""
+        position = self._position
+        if position == len(self._block):
+            self._refill()
+            position = 0
+        self._position = position + 1
+        return self._block[position]
+    
+    def take(self, count: int) -> List[float]:
+        """Retorna los siguientes count números, en el mismo orden que random()."""
+        values = self._block[self._position:self._position + count]
+        self._position += len(values)
+        while len(values) < count:
+            self._refill()
+            chunk = self._block[:count - len(values)]
+            self._position = len(chunk)
+            values.extend(chunk)
+        return values
+
+
+class DefaultRandomState:
+    """
+    Mezcla para clases cuyo atributo rng es por defecto el módulo random.
+    
+    Un módulo no se puede serializar, así que pickle y copy.deepcopy guardan
+    ese valor como None y al restaurar vuelve a ser el generador global. Las
+    fuentes inyectadas (p. ej. BufferedRandom) se copian tal cual.
+    """
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if state.get("rng") is random:
+            state["rng"] = None
+        return state
+    
+    def __setstate__(self, state):
+        if "rng" in state and state["rng"] is None:
+            state = dict(state, rng=random)
+        self.__dict__.update(state)
+
+
+class RandomStreams:
+    """Reparte flujos independientes y reproducibles a partir de una semilla de batalla."""
+    
+    def __init__(self, seed: int, block_size: int = 1024):
+        self.seed = seed
+        self._block_size = block_size
+    
+    def stream(self, *keys) -> BufferedRandom:
+        """Retorna el flujo asociado a las claves (p. ej. "armor", id del personaje)."""
+        return BufferedRandom(derive_seed(self.seed, *keys), self._block_size)
+
+
+def draw_many(rng, count: int) -> List[float]:
+    """Toma count números de cualquier fuente, usando take() si la fuente lo ofrece."""
+    take = getattr(rng, "take", None)
+    if take is not None:
+        return take(count)
+    draw = rng.random
+    return [draw() for _ in range(count)]
\ No newline at end of file
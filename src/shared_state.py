@@ -0,0 +1,499 @@
+"""
+Estado de personajes en memoria compartida para workers multiproceso.
+
+SharedCharacterState guarda las columnas de CHARACTER_COLUMNS (vida, nivel y
+estado de armadura) en un solo segmento de multiprocessing.shared_memory.
+Cada proceso se conecta al segmento por nombre y trabaja con vistas sin
+copias: state[row] es un Character cuyas propiedades leen y escriben la fila,
+con una armadura que también vive en las columnas compartidas.
+
+Las filas se reparten en shards contiguos (partition). Un proceso puede leer
+cualquier fila, pero solo escribir en las que posee; escribir en otra lanza
+OwnershipError. Los ataques contra un defensor de otro shard no se aplican
+ahí: ShardWorker los acumula por destino y los manda en lote por un
+CrossShardQueue, y el dueño del defensor los resuelve en su turno.
+
+Formato del segmento:
+    cabecera    SHARED_HEADER: magic, versión, cantidad de filas
+    columnas    en el orden de CHARACTER_COLUMNS, cada una alineada a 8 bytes
+"""
+import multiprocessing
+import random
+import struct
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from src.armor_system import LeatherArmor, PlateArmor, MagicShield, EnchantedArmor
+from src.character_table import (
+    ARMOR_OTHER, ARMOR_LEATHER, ARMOR_PLATE, ARMOR_MAGIC_SHIELD, ARMOR_ENCHANTED,
+    CharacterTable
+)
+from src.combat_system import Character, CombatSystem
+from src.snapshot import CHARACTER_COLUMNS, snapshot
+
+
+MAGIC = b"CSHM"
+FORMAT_VERSION = 1
+SHARED_HEADER = struct.Struct("<4sHxxQ")
+
+# Campos de cada ataque en los lotes entre shards: atacante, defensor, daño del arma
+MESSAGE_FIELDS = 3
+
+
+class OwnershipError(Exception):
+    """Se intentó escribir una fila que pertenece a otro shard."""
+
+
+def _layout(count: int) -> Tuple[Dict[str, Tuple[int, str]], int]:
+    """Desplazamiento y código de tipo de cada columna, y el tamaño total del segmento."""
+    offsets = {}
+    offset = SHARED_HEADER.size
+    for name, typecode in CHARACTER_COLUMNS.items():
+        offset = (offset + 7) & ~7
+        offsets[name] = (offset, typecode)
+        offset += count * array(typecode).itemsize
+    return offsets, max(offset, 1)
+
+
+def _attach_segment(name: str) -> shared_memory.SharedMemory:
+    """Se conecta a un segmento existente sin hacerse cargo de borrarlo."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    # Antes de Python 3.13 conectarse registra el segmento en el resource_tracker.
+    # Los hijos de multiprocessing comparten el del creador y el registro repetido
+    # no cambia nada, pero un proceso independiente tiene el suyo y borraría el
+    # segmento al salir, así que ahí se quita el registro
+    segment = shared_memory.SharedMemory(name=name)
+    if multiprocessing.parent_process() is None:
+        resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+
+def partition(count: int, shards: int) -> List[range]:
+    """
+    Reparte count filas en shards rangos contiguos de tamaño parejo.
+    
+    Raises:
+        ValueError: Si shards no es positivo
+    """
+    if shards <= 0:
+        raise ValueError("La cantidad de shards debe ser positiva")
+    size, extra = divmod(count, shards)
+    ranges = []
+    start = 0
+    for shard in range(shards):
+        stop = start + size + (1 if shard < extra else 0)
+        ranges.append(range(start, stop))
+        start = stop
+    return ranges
+
+
+def shard_of(ranges: Sequence[range], row: int) -> int:
+    """Índice del rango de partition() que contiene la fila."""
+    size = len(ranges[-1]) if ranges else 0
+    # Los primeros rangos tienen una fila más; la estimación se corrige hacia atrás
+    shard = min(row // size, len(ranges) - 1) if size else len(ranges) - 1
+    while row < ranges[shard].start:
+        shard -= 1
+    if row not in ranges[shard]:
+        raise IndexError(f"Fila fuera de rango: {row}")
+    return shard
+
+
+def _shared_property(column: str, convert=None):
+    """Propiedad que lee cualquier fila y solo escribe las filas propias."""
+    def getter(self):
+        value = self._state.columns[column][self._row]
+        return convert(value) if convert else value
+    
+    def setter(self, value):
+        state = self._state
+        row = self._row
+        if not state._start <= row < state._stop:
+            raise OwnershipError(f"La fila {row} no pertenece a este shard")
+        state.columns[column][row] = value
+    
+    return property(getter, setter)
+
+
+class SharedLeatherArmor(LeatherArmor):
+    """Armadura de cuero respaldada por una fila del estado compartido."""
+    
+    def __init__(self, state: "SharedCharacterState", row: int):
+        self._state = state
+        self._row = row
+    
+    _defense = _shared_property("armor_defense")
+    _durability = _shared_property("armor_state")
+
+
+class SharedPlateArmor(PlateArmor):
+    """Armadura de placas respaldada por una fila del estado compartido."""
+    
+    def __init__(self, state: "SharedCharacterState", row: int):
+        self._state = state
+        self._row = row
+    
+    _defense = _shared_property("armor_defense")
+    _durability = _shared_property("armor_state")
+
+
+class SharedMagicShield(MagicShield):
+    """Escudo mágico respaldado por una fila del estado compartido."""
+    
+    def __init__(self, state: "SharedCharacterState", row: int):
+        self._state = state
+        self._row = row
+    
+    _defense = _shared_property("armor_defense")
+    _mana = _shared_property("armor_state")
+    _max_mana = _shared_property("armor_max")
+
+
+class SharedEnchantedArmor(EnchantedArmor):
+    """Armadura encantada respaldada por una fila del estado compartido."""
+    
+    def __init__(self, state: "SharedCharacterState", row: int):
+        self._state = state
+        self._row = row
+    
+    _defense = _shared_property("armor_defense")
+    _durability = _shared_property("armor_state")
+    _reflect_chance = _shared_property("armor_chance")
+    _last_reflected = _shared_property("armor_reflected", bool)
+    
+    @property
+    def rng(self):
+        """Cada proceso usa su propia fuente aleatoria, la del estado."""
+        return self._state.rng
+    
+    @rng.setter
+    def rng(self, value):
+        self._state.rng = value
+
+
+_ARMOR_VIEWS = {
+    ARMOR_LEATHER: SharedLeatherArmor,
+    ARMOR_PLATE: SharedPlateArmor,
+    ARMOR_MAGIC_SHIELD: SharedMagicShield,
+    ARMOR_ENCHANTED: SharedEnchantedArmor,
+}
+
+
+class SharedCharacter(Character):
+    """
+    Vista sobre una fila del estado compartido.
+    Se comporta como un Character; la armadura no se puede reemplazar.
+    """
+    
+    def __init__(self, state: "SharedCharacterState", row: int):
+        self._state = state
+        self._row = row
+        armor_view = _ARMOR_VIEWS.get(state.columns["armor_kind"][row])
+        self._armor = armor_view(state, row) if armor_view is not None else None
+    
+    @property
+    def row(self) -> int:
+        """Fila del estado a la que apunta la vista."""
+        return self._row
+    
+    @property
+    def name(self) -> str:
+        return self._state.names[self._row]
+    
+    current_health = _shared_property("health")
+    max_health = _shared_property("max_health")
+    level = _shared_property("level")
+    
+    @property
+    def armor(self):
+        return self._armor
+    
+    @armor.setter
+    def armor(self, value):
+        raise ValueError("La armadura de un personaje compartido no se puede reemplazar")
+    
+    def __eq__(self, other):
+        if isinstance(other, SharedCharacter):
+            return self._state.segment_name == other._state.segment_name and self._row == other._row
+        return NotImplemented
+    
+    def __hash__(self):
+        return hash((self._state.segment_name, self._row))
+
+
+class SharedCharacterState:
+    """
+    Columnas de personajes en un segmento de memoria compartida.
+    
+    Se crea una vez con create() en el proceso principal, que es el dueño del
+    segmento y debe llamar a unlink() al terminar. Al serializarse con pickle
+    (por ejemplo como argumento de un Process) solo viaja el nombre del
+    segmento y los nombres de los personajes; el otro lado se conecta al mismo
+    segmento. own() restringe las filas que este proceso puede escribir.
+    
+    Args:
+        segment: Segmento ya creado o conectado
+        names: Nombre de cada fila
+        owner: Si este objeto creó el segmento
+    """
+    
+    def __init__(self, segment: shared_memory.SharedMemory, names: Sequence[str],
+                 owner: bool = False):
+        magic, version, count = SHARED_HEADER.unpack_from(segment.buf, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"El segmento {segment.name} no contiene un estado compartido")
+        if len(names) != count:
+            raise ValueError("La cantidad de nombres no coincide con el segmento")
+        self._segment = segment
+        self._owner = owner
+        self._closed = False
+        self.names = list(names)
+        self.rng = random
+        offsets, _ = _layout(count)
+        self.columns: Dict[str, memoryview] = {
+            name: segment.buf[offset:offset + count * array(typecode).itemsize].cast(typecode)
+            for name, (offset, typecode) in offsets.items()
+        }
+        self._start = 0
+        self._stop = count
+    
+    @classmethod
+    def create(cls, characters: Union[Sequence[Character], CharacterTable],
+               name: Optional[str] = None) -> "SharedCharacterState":
+        """
+        Copia el estado de los personajes a un segmento nuevo.
+        
+        Raises:
+            ValueError: Si algún personaje tiene una armadura de un tipo
+                que no se puede representar en columnas
+        """
+        snap = snapshot(characters)
+        kinds = snap.columns["armor_kind"]
+        if ARMOR_OTHER in kinds:
+            row = list(kinds).index(ARMOR_OTHER)
+            raise ValueError(f"Armadura no compartible en la fila {row}")
+        count = len(snap)
+        offsets, size = _layout(count)
+        segment = shared_memory.SharedMemory(name=name, create=True, size=size)
+        SHARED_HEADER.pack_into(segment.buf, 0, MAGIC, FORMAT_VERSION, count)
+        for column, (offset, typecode) in offsets.items():
+            data = snap.columns[column].tobytes()
+            segment.buf[offset:offset + len(data)] = data
+        if isinstance(characters, CharacterTable):
+            names = characters.names
+        else:
+            names = [character.name for character in characters]
+        return cls(segment, names, owner=True)
+    
+    @classmethod
+    def attach(cls, segment_name: str, names: Sequence[str]) -> "SharedCharacterState":
+        """Se conecta a un segmento creado por otro proceso."""
+        return cls(_attach_segment(segment_name), names)
+    
+    def __reduce__(self):
+        return (_attach_state, (self.segment_name, self.names, self._start, self._stop))
+    
+    @property
+    def segment_name(self) -> str:
+        return self._segment.name
+    
+    @property
+    def owned(self) -> range:
+        """Filas que este proceso puede escribir."""
+        return range(self._start, self._stop)
+    
+    def own(self, rows: range) -> "SharedCharacterState":
+        """
+        Restringe las escrituras de este proceso a un rango contiguo de filas.
+        
+        Raises:
+            ValueError: Si el rango no es contiguo o se sale del estado
+        """
+        if rows.step != 1 or rows.start < 0 or rows.stop > len(self):
+            raise ValueError(f"Rango de filas inválido: {rows}")
+        self._start = rows.start
+        self._stop = rows.stop
+        return self
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def __getitem__(self, row: int) -> SharedCharacter:
+        if not 0 <= row < len(self.names):
+            raise IndexError(f"Fila fuera de rango: {row}")
+        return SharedCharacter(self, row)
+    
+    def __iter__(self):
+        for row in range(len(self.names)):
+            yield SharedCharacter(self, row)
+    
+    def close(self):
+        """Suelta las vistas y se desconecta del segmento (no lo borra)."""
+        if self._closed:
+            return
+        for column in self.columns.values():
+            column.release()
+        self.columns = {}
+        self._segment.close()
+        self._closed = True
+    
+    def unlink(self):
+        """Borra el segmento; solo debe llamarlo el proceso que lo creó."""
+        self._segment.unlink()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+        if self._owner:
+            self.unlink()
+
+
+def _attach_state(segment_name: str, names: Sequence[str], start: int,
+                  stop: int) -> SharedCharacterState:
+    state = SharedCharacterState.attach(segment_name, names)
+    return state.own(range(start, stop))
+
+
+class CrossShardQueue:
+    """
+    Bandejas de entrada de ataques entre shards, una por shard.
+    
+    Los ataques se acumulan por destino en arreglos planos y flush() manda
+    cada destino en un solo mensaje (bytes de un array "q"). Las bandejas son
+    SimpleQueue: put() escribe en el momento, así que después de una barrera
+    el destino ya ve todo lo que se le mandó antes de ella.
+    
+    Args:
+        shards: Cantidad de shards
+        context: Contexto de multiprocessing (por defecto el del sistema)
+    """
+    
+    def __init__(self, shards: int, context=None):
+        if context is None:
+            context = multiprocessing.get_context()
+        self.inboxes = [context.SimpleQueue() for _ in range(shards)]
+        self._outboxes: Dict[int, array] = {}
+    
+    def __getstate__(self):
+        # Los ataques pendientes son locales a cada proceso
+        return {"inboxes": self.inboxes, "_outboxes": {}}
+    
+    def send(self, destination: int, attacker_row: int, defender_row: int, weapon_damage: int):
+        """Agrega un ataque al lote pendiente para el shard destino."""
+        outbox = self._outboxes.get(destination)
+        if outbox is None:
+            outbox = self._outboxes[destination] = array("q")
+        outbox.extend((attacker_row, defender_row, weapon_damage))
+    
+    def pending(self, destination: int) -> int:
+        """Cantidad de ataques acumulados para un destino."""
+        outbox = self._outboxes.get(destination)
+        return len(outbox) // MESSAGE_FIELDS if outbox is not None else 0
+    
+    def flush(self, sender: int) -> int:
+        """
+        Manda los lotes pendientes, uno por destino.
+        
+        Returns:
+            Cantidad de mensajes enviados
+        """
+        sent = 0
+        for destination, outbox in self._outboxes.items():
+            if outbox:
+                self.inboxes[destination].put((sender, outbox.tobytes()))
+                sent += 1
+        self._outboxes.clear()
+        return sent
+    
+    def receive(self, shard: int) -> List[Tuple[int, array]]:
+        """
+        Lotes que ya llegaron a la bandeja del shard, ordenados por emisor.
+        
+        Returns:
+            Lista de (shard emisor, array "q" con ternas atacante, defensor, daño)
+        """
+        inbox = self.inboxes[shard]
+        batches = []
+        while not inbox.empty():
+            sender, data = inbox.get()
+            batch = array("q")
+            batch.frombytes(data)
+            batches.append((sender, batch))
+        # El orden de llegada entre emisores no es determinista; el de emisión sí
+        batches.sort(key=lambda item: item[0])
+        return batches
+
+
+class ShardWorker:
+    """
+    Resuelve los ataques de un shard sobre el estado compartido.
+    
+    attack() aplica de inmediato los ataques contra defensores propios, en
+    lotes con CombatSystem.attack_batch, y encola los demás para su dueño.
+    Un tick típico en cada proceso es: attack() las veces necesarias,
+    flush(), una barrera entre procesos y process_incoming().
+    
+    Args:
+        state: Estado compartido conectado en este proceso
+        shard: Índice de este shard
+        ranges: Reparto de filas de partition()
+        queue: Bandejas compartidas entre los shards
+        combat_system: Sistema de combate usado para resolver
+    """
+    
+    def __init__(self, state: SharedCharacterState, shard: int, ranges: Sequence[range],
+                 queue: CrossShardQueue, combat_system: CombatSystem):
+        self.state = state.own(ranges[shard])
+        self.shard = shard
+        self.ranges = list(ranges)
+        self.queue = queue
+        self.combat_system = combat_system
+        self._local = (array("q"), array("q"), array("q"))
+    
+    def attack(self, attacker_row: int, defender_row: int, weapon_damage: int):
+        """Programa un ataque; los locales se aplican en el próximo flush()."""
+        owned = self.state.owned
+        if defender_row in owned:
+            attackers, defenders, damages = self._local
+            attackers.append(attacker_row)
+            defenders.append(defender_row)
+            damages.append(weapon_damage)
+        else:
+            self.queue.send(shard_of(self.ranges, defender_row), attacker_row, defender_row,
+                            weapon_damage)
+    
+    def flush(self) -> list:
+        """
+        Aplica los ataques locales pendientes y manda los demás a sus dueños.
+        
+        Returns:
+            Daño real de cada ataque local, en orden
+        """
+        attackers, defenders, damages = self._local
+        results = []
+        if attackers:
+            results = self.combat_system.attack_batch(self.state, attackers, defenders, damages)
+            self._local = (array("q"), array("q"), array("q"))
+        self.queue.flush(self.shard)
+        return results
+    
+    def process_incoming(self) -> list:
+        """
+        Resuelve los ataques que otros shards mandaron contra filas propias.
+        
+        Returns:
+            Daño real de cada ataque recibido, por emisor y en orden de envío
+        """
+        results = []
+        for _, batch in self.queue.receive(self.shard):
+            results.extend(self.combat_system.attack_batch(
+                self.state, batch[0::MESSAGE_FIELDS], batch[1::MESSAGE_FIELDS],
+                batch[2::MESSAGE_FIELDS]
+            ))
+        return results
\ No newline at end of file
@@ -0,0 +1,476 @@
+"""
+Snapshots binarios del estado de combate.
+Guardan personajes, el estado interno de sus armaduras, el calculador de
+daño y el log de combate en columnas tipadas, para poder recuperarse de una
+caída o migrar una partida sin serializar el grafo de objetos completo.
+
+Formato (versión 1, orden de bytes nativo indicado en la cabecera):
+    cabecera    SNAPSHOT_HEADER: magic, versión, orden de bytes, cantidad de secciones
+    secciones   SECTION_HEADER (nombre, código de tipo, largo) + datos
+Las columnas usan los códigos de tipo de array; "J" es JSON y "P" es pickle.
+"""
+import json
+import pickle
+import random
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from src.armor_system import LeatherArmor, PlateArmor, MagicShield, EnchantedArmor
+from src.character_table import (
+    ARMOR_NONE, ARMOR_OTHER, ARMOR_LEATHER, ARMOR_PLATE, ARMOR_MAGIC_SHIELD, ARMOR_ENCHANTED,
+    CharacterTable, armor_kind_of
+)
+from src.combat_log import RECORD_FIELDS, CombatLog
+from src.combat_system import Character, CombatSystem
+from src.damage_calculator import (
+    StandardDamageCalculator, CriticalDamageCalculator, MockDamageCalculator
+)
+
+
+MAGIC = b"CSNP"
+FORMAT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("<4sHBxI")
+SECTION_HEADER = struct.Struct("<16scxxxQ")
+
+# Separador de nombres; si algún nombre lo contiene se guardan como JSON
+_NAME_SEPARATOR = "\0"
+
+_ARMOR_CLASSES = {
+    ARMOR_LEATHER: LeatherArmor,
+    ARMOR_PLATE: PlateArmor,
+    ARMOR_MAGIC_SHIELD: MagicShield,
+    ARMOR_ENCHANTED: EnchantedArmor,
+}
+
+# Columnas por fila de personaje y su código de tipo
+CHARACTER_COLUMNS = {
+    "health": "q",
+    "max_health": "q",
+    "level": "q",
+    "armor_kind": "b",
+    "armor_defense": "q",
+    "armor_state": "q",      # Durabilidad, o maná en MagicShield
+    "armor_max": "q",        # Maná máximo en MagicShield
+    "armor_reflected": "b",  # Último golpe reflejado en EnchantedArmor
+    "armor_chance": "d",     # Probabilidad de reflejo en EnchantedArmor
+}
+
+# Columna opcional, solo si hay armaduras del catálogo: índice + 1 de la
+# plantilla en el blob "templates" (0 si la armadura no tiene plantilla)
+TEMPLATE_COLUMN = "armor_template"
+
+
+class SnapshotError(ValueError):
+    """Datos de snapshot inválidos o de una versión no soportada."""
+    pass
+
+
+class Snapshot:
+    """
+    Estado de combate capturado.
+    
+    Las columnas son arreglos tipados; con pickle protocolo 5 se entregan
+    como buffers fuera de banda (pickle.dumps(s, protocol=5,
+    buffer_callback=...)), sin copiarlas dentro del flujo de pickle.
+    """
+    
+    def __init__(self, meta: dict, columns: Dict[str, array], blobs: Dict[str, bytes]):
+        self.meta = meta
+        self.columns = columns
+        self.blobs = blobs
+    
+    def __len__(self) -> int:
+        """Cantidad de personajes."""
+        return self.meta["characters"]
+    
+    def to_bytes(self) -> bytes:
+        """Serializa el snapshot al formato binario versionado."""
+        sections = [("meta", "J", json.dumps(self.meta).encode("utf-8"))]
+        sections.extend((name, column.typecode, column) for name, column in self.columns.items())
+        sections.extend((name, "P", blob) for name, blob in self.blobs.items())
+        
+        byteorder = 0 if sys.byteorder == "little" else 1
+        parts = [SNAPSHOT_HEADER.pack(MAGIC, FORMAT_VERSION, byteorder, len(sections))]
+        for name, typecode, data in sections:
+            view = memoryview(data).cast("B")
+            parts.append(SECTION_HEADER.pack(name.encode("ascii"), typecode.encode("ascii"),
+                                             view.nbytes))
+            parts.append(view)
+        return b"".join(parts)
+    
+    @classmethod
+    def from_bytes(cls, data) -> "Snapshot":
+        """Lee un snapshot serializado con to_bytes()."""
+        view = memoryview(data).cast("B")
+        if view.nbytes < SNAPSHOT_HEADER.size:
+            raise SnapshotError("Snapshot truncado")
+        magic, version, byteorder, count = SNAPSHOT_HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise SnapshotError("Los datos no son un snapshot de combate")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"Versión de snapshot no soportada: {version}")
+        if byteorder != (0 if sys.byteorder == "little" else 1):
+            raise SnapshotError("El snapshot se escribió con otro orden de bytes")
+        
+        offset = SNAPSHOT_HEADER.size
+        meta = None
+        columns: Dict[str, array] = {}
+        blobs: Dict[str, bytes] = {}
+        for _ in range(count):
+            if offset + SECTION_HEADER.size > view.nbytes:
+                raise SnapshotError("Snapshot truncado")
+            raw_name, raw_typecode, size = SECTION_HEADER.unpack_from(view, offset)
+            offset += SECTION_HEADER.size
+            payload = view[offset:offset + size]
+            if payload.nbytes != size:
+                raise SnapshotError("Snapshot truncado")
+            offset += size
+            name = raw_name.rstrip(b"\0").decode("ascii")
+            typecode = raw_typecode.decode("ascii")
+            if typecode == "J":
+                meta = json.loads(bytes(payload))
+            elif typecode == "P":
+                blobs[name] = bytes(payload)
+            else:
+                column = array(typecode)
+                column.frombytes(payload)
+                columns[name] = column
+        if meta is None:
+            raise SnapshotError("Falta la sección meta")
+        return cls(meta, columns, blobs)
+    
+    def __reduce_ex__(self, protocol):
+        if protocol >= 5:
+            buffers = {name: (column.typecode, pickle.PickleBuffer(column))
+                       for name, column in self.columns.items()}
+            return _rebuild_snapshot, (self.meta, buffers, self.blobs)
+        return Snapshot.from_bytes, (self.to_bytes(),)
+
+
+def _rebuild_snapshot(meta: dict, buffers: dict, blobs: Dict[str, bytes]) -> Snapshot:
+    columns = {}
+    for name, (typecode, buffer) in buffers.items():
+        column = array(typecode)
+        column.frombytes(memoryview(buffer).cast("B"))
+        columns[name] = column
+    return Snapshot(meta, columns, blobs)
+
+
+def _encode_names(names: Sequence[str]) -> Tuple[str, array]:
+    joined = _NAME_SEPARATOR.join(names)
+    if joined.count(_NAME_SEPARATOR) == max(0, len(names) - 1):
+        return "joined", array("B", joined.encode("utf-8"))
+    return "json", array("B", json.dumps(list(names)).encode("utf-8"))
+
+
+def _decode_names(encoding: str, data: array, count: int) -> List[str]:
+    text = data.tobytes().decode("utf-8")
+    if encoding == "json":
+        return json.loads(text)
+    return text.split(_NAME_SEPARATOR) if count else []
+
+
+def _capture_rng(rng):
+    """Las fuentes se guardan por pickle salvo el módulo random global."""
+    return None if rng is random else rng
+
+
+def _calculator_spec(calculator) -> Tuple[dict, list]:
+    """Retorna la descripción JSON del calculador y los objetos a guardar por pickle."""
+    calculator_type = type(calculator)
+    if calculator_type is StandardDamageCalculator:
+        cache_info = calculator.damage_cache_info()
+        return {"class": "standard",
+                "damage_cache_size": cache_info.maxsize if cache_info else 0}, []
+    if calculator_type is CriticalDamageCalculator:
+        return {"class": "critical", "crit_multiplier": calculator.crit_multiplier,
+                "last_was_critical": calculator.last_was_critical}, [
+            _capture_rng(calculator.rng)
+        ]
+    if calculator_type is MockDamageCalculator:
+        return {"class": "mock", "fixed_damage": calculator.fixed_damage}, []
+    return {"class": "pickle"}, [calculator]
+
+
+def _build_calculator(spec: dict, objects: list):
+    kind = spec["class"]
+    if kind == "standard":
+        return StandardDamageCalculator(damage_cache_size=spec["damage_cache_size"])
+    if kind == "critical":
+        calculator = CriticalDamageCalculator(spec["crit_multiplier"], rng=objects[0])
+        calculator.last_was_critical = spec["last_was_critical"]
+        return calculator
+    if kind == "mock":
+        return MockDamageCalculator(spec["fixed_damage"])
+    if kind == "pickle":
+        return objects[0]
+    raise SnapshotError(f"Calculador desconocido en el snapshot: {kind}")
+
+
+def _linear_log_records(log: CombatLog) -> array:
+    """Registros del log en orden lógico, empezando en el más antiguo."""
+    size = log._size * RECORD_FIELDS
+    records = log._records
+    if log.capacity is None:
+        return records[:size]
+    start = log._start * RECORD_FIELDS
+    end = start + size
+    limit = log.capacity * RECORD_FIELDS
+    if end <= limit:
+        return records[start:end]
+    return records[start:] + records[:end - limit]
+
+
+def snapshot(characters: Union[Sequence[Character], CharacterTable],
+             combat_system: Optional[CombatSystem] = None) -> Snapshot:
+    """
+    Captura el estado de un conjunto de personajes y, opcionalmente, del sistema de combate.
+    
+    Solo las clases de armadura y Character exactas van en columnas; las
+    subclases se guardan por pickle y se restauran con su tipo.
+    
+    Args:
+        characters: Lista de personajes o una CharacterTable
+        combat_system: Sistema cuyo calculador y log se incluyen
+    
+    Returns:
+        Snapshot independiente del estado vivo
+    """
+    is_table = isinstance(characters, CharacterTable)
+    other_characters: Dict[int, Character] = {}
+    if is_table:
+        names = characters.names
+        armors = characters.armors
+        columns = {
+            "health": array("q", characters.health),
+            "max_health": array("q", characters.max_health),
+            "level": array("q", characters.level),
+            "armor_kind": array("b", characters.armor_kind),
+        }
+    else:
+        names = [character.name for character in characters]
+        # Las subclases de Character se guardan enteras por pickle, con su armadura,
+        # para no restaurarlas como Character
+        other_characters = {row: character for row, character in enumerate(characters)
+                            if type(character) is not Character}
+        armors = [None if row in other_characters else character.armor
+                  for row, character in enumerate(characters)]
+        columns = {
+            "health": array("q", [character.current_health for character in characters]),
+            "max_health": array("q", [character.max_health for character in characters]),
+            "level": array("q", [character.level for character in characters]),
+        }
+    count = len(names)
+    
+    # El estado de armadura se llena solo en las filas que tienen una
+    zeros = bytes(8 * count)
+    defense = array("q", zeros)
+    state = array("q", zeros)
+    maximum = array("q", zeros)
+    chance = array("d", zeros)
+    reflected = array("b", bytes(count))
+    kinds = columns.get("armor_kind") or array("b", bytes(count))
+    kind_cache: Dict[type, int] = {}
+    other_armors: Dict[int, object] = {}
+    rngs: Dict[int, object] = {}
+    template_column = None
+    template_ids: Dict[str, int] = {}
+    templates = []
+    for row, armor in enumerate(armors):
+        if armor is None:
+            continue
+        armor_type = type(armor)
+        kind = kind_cache.get(armor_type)
+        if kind is None:
+            kind = armor_kind_of(armor)
+            if _ARMOR_CLASSES.get(kind) is not armor_type:
+                # Las subclases (vistas de bancos, armaduras compartidas o de
+                # usuario) van por pickle para no restaurarlas como la clase base
+                kind = ARMOR_OTHER
+            kind_cache[armor_type] = kind
+        kinds[row] = kind
+        if kind == ARMOR_OTHER:
+            other_armors[row] = armor
+            continue
+        defense[row] = armor._defense
+        template = armor.template
+        if template is not None:
+            if template_column is None:
+                template_column = array("q", zeros)
+            index = template_ids.get(template.id)
+            if index is None:
+                templates.append(template)
+                index = template_ids[template.id] = len(templates)
+            template_column[row] = index
+        if kind == ARMOR_MAGIC_SHIELD:
+            state[row] = armor._mana
+            maximum[row] = armor._max_mana
+        else:
+            state[row] = armor._durability
+            if kind == ARMOR_ENCHANTED:
+                reflected[row] = armor._last_reflected
+                chance[row] = armor._reflect_chance
+                rngs[row] = _capture_rng(armor.rng)
+    columns.update(armor_kind=kinds, armor_defense=defense, armor_state=state,
+                   armor_max=maximum, armor_reflected=reflected, armor_chance=chance)
+    if template_column is not None:
+        columns[TEMPLATE_COLUMN] = template_column
+    
+    name_encoding, columns["names"] = _encode_names(names)
+    meta = {"characters": count, "table": is_table, "names": name_encoding}
+    
+    calculator_objects: list = []
+    if combat_system is not None:
+        meta["calculator"], calculator_objects = _calculator_spec(combat_system.damage_calculator)
+        log = combat_system.combat_log
+        log_names_encoding, columns["log_names"] = _encode_names(log._names)
+        columns["log_records"] = _linear_log_records(log)
+        meta["log"] = {
+            "capacity": log.capacity,
+            "spill_path": log._spill_path,
+            "spill_segment": log._spill_segment,
+            "size": log._size,
+            "names": log_names_encoding,
+            "name_count": len(log._names),
+            "next_sequence": log._next_sequence,
+            "evicted": log.evicted,
+        }
+    
+    blobs = {}
+    if templates:
+        blobs["templates"] = pickle.dumps(templates, protocol=pickle.HIGHEST_PROTOCOL)
+    if other_armors or rngs or calculator_objects or other_characters:
+        # Un solo pickle conserva las fuentes aleatorias compartidas entre objetos
+        blobs["objects"] = pickle.dumps((other_armors, rngs, calculator_objects,
+                                         other_characters),
+                                        protocol=pickle.HIGHEST_PROTOCOL)
+    return Snapshot(meta, columns, blobs)
+
+
+def _restore_armors(snap: Snapshot, other_armors: dict, rngs: dict) -> List[Optional[object]]:
+    columns = snap.columns
+    template_column = columns.get(TEMPLATE_COLUMN)
+    templates = ()
+    if template_column is not None:
+        if (template_column.typecode != "q" or len(template_column) != len(snap)
+                or "templates" not in snap.blobs):
+            raise SnapshotError(f"Columna ausente o inválida: {TEMPLATE_COLUMN}")
+        templates = pickle.loads(snap.blobs["templates"])
+    kinds = columns["armor_kind"]
+    defense = columns["armor_defense"]
+    state = columns["armor_state"]
+    maximum = columns["armor_max"]
+    reflected = columns["armor_reflected"]
+    chance = columns["armor_chance"]
+    armors: List[Optional[object]] = [None] * len(snap)
+    new = object.__new__
+    for row, kind in enumerate(kinds):
+        if kind == ARMOR_NONE:
+            continue
+        if kind == ARMOR_OTHER:
+            armors[row] = other_armors[row]
+            continue
+        armor_cls = _ARMOR_CLASSES.get(kind)
+        if armor_cls is None:
+            raise SnapshotError(f"Tipo de armadura desconocido: {kind}")
+        armor = new(armor_cls)
+        armor._defense = defense[row]
+        if template_column is not None and template_column[row]:
+            armor.template = templates[template_column[row] - 1]
+        if kind == ARMOR_MAGIC_SHIELD:
+            armor._mana = state[row]
+            armor._max_mana = maximum[row]
+        else:
+            armor._durability = state[row]
+            if kind == ARMOR_ENCHANTED:
+                armor._last_reflected = bool(reflected[row])
+                armor._reflect_chance = chance[row]
+                rng = rngs.get(row)
+                armor.rng = rng if rng is not None else random
+        armors[row] = armor
+    return armors
+
+
+def _restore_log(snap: Snapshot) -> CombatLog:
+    log_meta = snap.meta["log"]
+    log = CombatLog(capacity=log_meta["capacity"], spill_path=log_meta["spill_path"],
+                    spill_segment=log_meta["spill_segment"])
+    records = snap.columns["log_records"]
+    if log.capacity is None:
+        log._records = array("q", records)
+    else:
+        log._records[:len(records)] = records
+    log._size = log_meta["size"]
+    log._names = _decode_names(log_meta["names"], snap.columns["log_names"],
+                               log_meta["name_count"])
+    log._name_ids = {name: name_id for name_id, name in enumerate(log._names)}
+    log._next_sequence = log_meta["next_sequence"]
+    log.evicted = log_meta["evicted"]
+    return log
+
+
+def restore(snap: Snapshot) -> Tuple[Union[List[Character], CharacterTable],
+                                     Optional[CombatSystem]]:
+    """
+    Reconstruye el estado capturado por snapshot().
+    
+    Returns:
+        Los personajes (en una CharacterTable si el snapshot vino de una) y
+        un CombatSystem con el calculador y el log, o None si no se capturó
+    """
+    meta = snap.meta
+    count = meta["characters"]
+    columns = snap.columns
+    for name, typecode in CHARACTER_COLUMNS.items():
+        column = columns.get(name)
+        if column is None or column.typecode != typecode or len(column) != count:
+            raise SnapshotError(f"Columna ausente o inválida: {name}")
+    other_armors, rngs, calculator_objects, other_characters = (
+        pickle.loads(snap.blobs["objects"]) if "objects" in snap.blobs else ({}, {}, [], {})
+    )
+    names = _decode_names(meta["names"], columns["names"], count)
+    armors = _restore_armors(snap, other_armors, rngs)
+    
+    if meta["table"]:
+        characters = CharacterTable()
+        characters.names = names
+        characters.health = array("q", columns["health"])
+        characters.max_health = array("q", columns["max_health"])
+        characters.level = array("q", columns["level"])
+        characters.armor_kind = array("b", columns["armor_kind"])
+        # Las subclases guardadas por pickle recuperan el tipo que usa la tabla
+        for row, armor in other_armors.items():
+            characters.armor_kind[row] = armor_kind_of(armor)
+        characters.armors = armors
+    else:
+        characters = []
+        health = columns["health"]
+        max_health = columns["max_health"]
+        level = columns["level"]
+        for row in range(count):
+            if row in other_characters:
+                characters.append(other_characters[row])
+                continue
+            character = Character(names[row], max_health[row], level[row], armors[row])
+            character.current_health = health[row]
+            characters.append(character)
+    
+    combat_system = None
+    if "calculator" in meta:
+        combat_system = CombatSystem(_build_calculator(meta["calculator"], calculator_objects),
+                                     _restore_log(snap))
+    return characters, combat_system
+
+
+def dump(snap: Snapshot, path: str):
+    """Escribe un snapshot a un archivo."""
+    with open(path, "wb") as snapshot_file:
+        snapshot_file.write(snap.to_bytes())
+
+
+def load(path: str) -> Snapshot:
+    """Lee un snapshot de un archivo."""
+    with open(path, "rb") as snapshot_file:
+        return Snapshot.from_bytes(snapshot_file.read())
\ No newline at end of file
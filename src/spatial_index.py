@@ -0,0 +1,278 @@
+"""
+Índice espacial de grilla uniforme para elegir objetivos.
+
+Cada personaje indexado guarda su posición en `position` y vive en la celda
+de la grilla que le corresponde. Las consultas solo recorren las celdas
+cercanas: radius() las que tocan el círculo, nearest() y k_nearest() anillos
+de celdas alrededor del punto hasta que ninguna celda sin revisar pueda
+tener algo más cerca. Los muertos se sacan del índice al encontrarlos.
+"""
+import heapq
+import math
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.combat_system import Character, CombatSystem
+from src.interfaces import Weapon
+
+
+Cell = Tuple[int, int]
+
+
+class _Entry:
+    __slots__ = ("character", "x", "y", "team", "cell")
+    
+    def __init__(self, character: Character, x: float, y: float, team, cell: Cell):
+        self.character = character
+        self.x = x
+        self.y = y
+        self.team = team
+        self.cell = cell
+
+
+class SpatialIndex:
+    """
+    Grilla uniforme de personajes.
+    
+    Args:
+        cell_size: Lado de cada celda; conviene que sea del orden del radio
+            típico de las consultas
+    """
+    
+    def __init__(self, cell_size: float = 10.0):
+        if cell_size <= 0:
+            raise ValueError("El tamaño de celda debe ser positivo")
+        self.cell_size = cell_size
+        self._cells: Dict[Cell, Dict[Character, _Entry]] = {}
+        self._entries: Dict[Character, _Entry] = {}
+        # Límites de las celdas ocupadas alguna vez (no se achican al quitar)
+        self._min_cell = [0, 0]
+        self._max_cell = [-1, -1]
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, character: Character) -> bool:
+        return character in self._entries
+    
+    def _cell_of(self, x: float, y: float) -> Cell:
+        size = self.cell_size
+        return (math.floor(x / size), math.floor(y / size))
+    
+    def _place(self, entry: _Entry):
+        cell = entry.cell
+        bucket = self._cells.get(cell)
+        if bucket is None:
+            bucket = self._cells[cell] = {}
+            if self._max_cell[0] < self._min_cell[0]:
+                self._min_cell = list(cell)
+                self._max_cell = list(cell)
+            else:
+                for axis in (0, 1):
+                    if cell[axis] < self._min_cell[axis]:
+                        self._min_cell[axis] = cell[axis]
+                    elif cell[axis] > self._max_cell[axis]:
+                        self._max_cell[axis] = cell[axis]
+        bucket[entry.character] = entry
+    
+    def _unplace(self, entry: _Entry):
+        bucket = self._cells[entry.cell]
+        del bucket[entry.character]
+        if not bucket:
+            del self._cells[entry.cell]
+    
+    def insert(self, character: Character, x: float, y: float, team=None):
+        """
+        Agrega un personaje en (x, y).
+        
+        Raises:
+            ValueError: Si ya está en el índice
+        """
+        if character in self._entries:
+            raise ValueError(f"{character.name} ya está en el índice")
+        entry = _Entry(character, x, y, team, self._cell_of(x, y))
+        self._entries[character] = entry
+        self._place(entry)
+        character.position = (x, y)
+    
+    def move(self, character: Character, x: float, y: float):
+        """Mueve un personaje; solo cambia de celda si cruza un borde."""
+        entry = self._entries[character]
+        entry.x = x
+        entry.y = y
+        character.position = (x, y)
+        cell = self._cell_of(x, y)
+        if cell != entry.cell:
+            self._unplace(entry)
+            entry.cell = cell
+            self._place(entry)
+    
+    def remove(self, character: Character):
+        """Quita un personaje del índice (no falla si no estaba)."""
+        entry = self._entries.pop(character, None)
+        if entry is not None:
+            self._unplace(entry)
+            character.position = None
+    
+    def remove_dead(self) -> int:
+        """Quita a todos los muertos; retorna cuántos se quitaron."""
+        dead = [character for character in self._entries if character.current_health <= 0]
+        for character in dead:
+            self.remove(character)
+        return len(dead)
+    
+    def team_of(self, character: Character):
+        return self._entries[character].team
+    
+    def _bucket_entries(self, cell: Cell) -> List[_Entry]:
+        """Entradas vivas de una celda; los muertos se quitan al pasar."""
+        bucket = self._cells.get(cell)
+        if bucket is None:
+            return []
+        alive = []
+        dead = None
+        for entry in bucket.values():
+            if entry.character.current_health > 0:
+                alive.append(entry)
+            else:
+                if dead is None:
+                    dead = []
+                dead.append(entry.character)
+        if dead:
+            for character in dead:
+                self.remove(character)
+        return alive
+    
+    @staticmethod
+    def _accepts(entry: _Entry, exclude_team, predicate) -> bool:
+        if exclude_team is not None and entry.team == exclude_team:
+            return False
+        return predicate is None or predicate(entry.character)
+    
+    def radius(self, x: float, y: float, radius: float, exclude_team=None,
+               predicate: Optional[Callable[[Character], bool]] = None) -> List[Character]:
+        """
+        Personajes vivos a distancia <= radius de (x, y), del más cercano al más lejano.
+        
+        Args:
+            exclude_team: Si se indica, omite a los de ese equipo
+            predicate: Filtro adicional sobre cada personaje
+        """
+        size = self.cell_size
+        # Solo las celdas del cuadrado que rodea al círculo dentro de la zona ocupada
+        min_cx = max(math.floor((x - radius) / size), self._min_cell[0])
+        min_cy = max(math.floor((y - radius) / size), self._min_cell[1])
+        max_cx = min(math.floor((x + radius) / size), self._max_cell[0])
+        max_cy = min(math.floor((y + radius) / size), self._max_cell[1])
+        limit = radius * radius
+        found = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                if (cx, cy) not in self._cells:
+                    continue
+                for entry in self._bucket_entries((cx, cy)):
+                    dx = entry.x - x
+                    dy = entry.y - y
+                    distance = dx * dx + dy * dy
+                    if distance <= limit and self._accepts(entry, exclude_team, predicate):
+                        found.append((distance, len(found), entry.character))
+        found.sort()
+        return [character for _, _, character in found]
+    
+    def _rings(self, cell: Cell) -> Iterator[Tuple[int, List[Cell]]]:
+        """Anillos de celdas (distancia de Chebyshev k) hasta cubrir las celdas ocupadas."""
+        cx, cy = cell
+        reach = max(cx - self._min_cell[0], self._max_cell[0] - cx,
+                    cy - self._min_cell[1], self._max_cell[1] - cy, 0)
+        cells = self._cells
+        for k in range(reach + 1):
+            if k == 0:
+                ring = [cell]
+            else:
+                ring = [(cx + dx, cy - k) for dx in range(-k, k + 1)]
+                ring += [(cx + dx, cy + k) for dx in range(-k, k + 1)]
+                ring += [(cx - k, cy + dy) for dy in range(-k + 1, k)]
+                ring += [(cx + k, cy + dy) for dy in range(-k + 1, k)]
+            yield k, [ring_cell for ring_cell in ring if ring_cell in cells]
+    
+    def k_nearest(self, x: float, y: float, k: int, exclude_team=None,
+                  predicate: Optional[Callable[[Character], bool]] = None,
+                  max_distance: Optional[float] = None) -> List[Character]:
+        """
+        Los k personajes vivos más cercanos a (x, y), del más cercano al más lejano.
+        
+        Args:
+            exclude_team: Si se indica, omite a los de ese equipo
+            predicate: Filtro adicional sobre cada personaje
+            max_distance: Si se indica, ignora a los que estén más lejos
+        """
+        if k <= 0 or not self._entries:
+            return []
+        size = self.cell_size
+        limit = math.inf if max_distance is None else max_distance * max_distance
+        # Heap de máximos con los k mejores: (-distancia, orden, personaje)
+        best: List[Tuple[float, int, Character]] = []
+        counter = 0
+        for ring, cells in self._rings(self._cell_of(x, y)):
+            for cell in cells:
+                for entry in self._bucket_entries(cell):
+                    dx = entry.x - x
+                    dy = entry.y - y
+                    distance = dx * dx + dy * dy
+                    if distance > limit or not self._accepts(entry, exclude_team, predicate):
+                        continue
+                    counter += 1
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, -counter, entry.character))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, -counter, entry.character))
+            # Lo que queda sin revisar está al menos a ring * size
+            bound = ring * size
+            if bound * bound > limit:
+                break
+            if len(best) == k and -best[0][0] <= bound * bound:
+                break
+        best.sort(key=lambda item: (-item[0], -item[1]))
+        return [character for _, _, character in best]
+    
+    def nearest(self, x: float, y: float, exclude_team=None,
+                predicate: Optional[Callable[[Character], bool]] = None,
+                max_distance: Optional[float] = None) -> Optional[Character]:
+        """El personaje vivo más cercano a (x, y), o None."""
+        found = self.k_nearest(x, y, 1, exclude_team, predicate, max_distance)
+        return found[0] if found else None
+    
+    def nearest_enemy(self, character: Character,
+                      max_distance: Optional[float] = None) -> Optional[Character]:
+        """El enemigo vivo más cercano a un personaje indexado (de otro equipo)."""
+        entry = self._entries[character]
+        return self.nearest(entry.x, entry.y, exclude_team=entry.team,
+                            predicate=lambda other: other is not character,
+                            max_distance=max_distance)
+    
+    def choose_target(self, combatant) -> Optional[Character]:
+        """Selector para TurnScheduler.run_until: el enemigo más cercano del combatiente."""
+        if combatant.character not in self._entries:
+            return None
+        return self.nearest_enemy(combatant.character)
+    
+    def area_attack(self, combat_system: CombatSystem, attacker: Character, weapon: Weapon,
+                    x: float, y: float, radius: float) -> dict:
+        """
+        Ataque de área centrado en (x, y) contra los enemigos del atacante.
+        
+        Los defensores reciben el golpe del más cercano al más lejano, con
+        CombatSystem.attack_many; los que mueren se quitan del índice.
+        
+        Returns:
+            El resultado de attack_many, con los defensores en "defenders"
+        """
+        entry = self._entries.get(attacker)
+        team = entry.team if entry is not None else None
+        defenders = self.radius(x, y, radius, exclude_team=team,
+                                predicate=lambda other: other is not attacker)
+        result = combat_system.attack_many(attacker, defenders, weapon)
+        result["defenders"] = defenders
+        for defender in defenders:
+            if defender.current_health <= 0:
+                self.remove(defender)
+        return result
\ No newline at end of file
@@ -0,0 +1,247 @@
+"""
+Equipos con agregados mantenidos en cada cambio.
+
+Los miembros de un Team son TeamMember, un Character cuyas vida, vida
+máxima, nivel y armadura avisan al equipo cuando se escriben. Así los vivos,
+la vida total, el nivel promedio y las armaduras agotadas se actualizan en
+O(1) por golpe o curación, venga de attack(), attack_batch(), take_damage()
+o una escritura directa, y los umbrales disparan callbacks sin sondear.
+"""
+from typing import Callable, List, Optional
+
+from src.combat_system import Character
+from src.interfaces import Armor
+
+
+class TeamMember(Character):
+    """Personaje que pertenece a un Team."""
+    
+    def __init__(self, name: str, health: int, level: int, armor: Optional[Armor] = None):
+        self._team: Optional["Team"] = None
+        self._health = health
+        self._max_health = health
+        self._level = level
+        self._armor = armor
+        self._armor_broken = False
+        super().__init__(name, health, level, armor)
+    
+    @property
+    def team(self) -> Optional["Team"]:
+        return self._team
+    
+    @property
+    def current_health(self) -> int:
+        return self._health
+    
+    @current_health.setter
+    def current_health(self, value: int):
+        old = self._health
+        self._health = value
+        if self._team is not None:
+            self._team._health_written(self, old, value)
+    
+    @property
+    def max_health(self) -> int:
+        return self._max_health
+    
+    @max_health.setter
+    def max_health(self, value: int):
+        old = self._max_health
+        self._max_health = value
+        if self._team is not None:
+            self._team._max_health_written(old, value)
+    
+    @property
+    def level(self) -> int:
+        return self._level
+    
+    @level.setter
+    def level(self, value: int):
+        old = self._level
+        self._level = value
+        if self._team is not None:
+            self._team._level_written(self, old, value)
+    
+    @property
+    def armor(self) -> Optional[Armor]:
+        return self._armor
+    
+    @armor.setter
+    def armor(self, value: Optional[Armor]):
+        self._armor = value
+        if self._team is not None:
+            self._team._check_armor(self)
+
+
+class _Threshold:
+    __slots__ = ("fraction", "callback")
+    
+    def __init__(self, fraction: float, callback: Callable):
+        self.fraction = fraction
+        self.callback = callback
+
+
+class Team:
+    """
+    Equipo o facción con agregados incrementales.
+    
+    Los callbacks de umbral reciben (team, fracción de vida) la primera vez
+    que la vida total baja de la fracción y se rearman cuando vuelve a
+    superarla; los de on_wiped reciben el equipo cuando muere el último vivo.
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.members: List[TeamMember] = []
+        self.alive_count = 0
+        self.total_health = 0
+        self.total_max_health = 0
+        self.armor_broken_count = 0
+        self._level_sum = 0
+        self._alive_level_sum = 0
+        # Umbrales de mayor a menor; los anteriores a _next_threshold ya se cruzaron
+        self._thresholds: List[_Threshold] = []
+        self._next_threshold = 0
+        self._wiped_callbacks: List[Callable[["Team"], None]] = []
+    
+    def __len__(self) -> int:
+        return len(self.members)
+    
+    def __iter__(self):
+        return iter(self.members)
+    
+    def add(self, name: str, health: int, level: int, armor: Optional[Armor] = None) -> TeamMember:
+        """Crea un miembro nuevo en el equipo."""
+        return self._join(TeamMember(name, health, level, armor))
+    
+    def add_character(self, character: Character) -> TeamMember:
+        """
+        Agrega un personaje existente. Si no es un TeamMember se crea uno con
+        su estado (compartiendo la armadura), que es el que debe usarse.
+        """
+        if isinstance(character, TeamMember):
+            if character._team is not None:
+                raise ValueError(f"{character.name} ya pertenece a {character._team.name}")
+            return self._join(character)
+        member = TeamMember(character.name, character.max_health, character.level, character.armor)
+        member._health = character.current_health
+        return self._join(member)
+    
+    def _join(self, member: TeamMember) -> TeamMember:
+        member._team = self
+        self.members.append(member)
+        health = member._health
+        self.total_health += health
+        self.total_max_health += member._max_health
+        self._level_sum += member._level
+        if health > 0:
+            self.alive_count += 1
+            self._alive_level_sum += member._level
+        member._armor_broken = False
+        self._check_armor(member)
+        self._check_thresholds()
+        return member
+    
+    def remove(self, member: TeamMember):
+        """Saca a un miembro; sus cambios dejan de afectar al equipo."""
+        if member._team is not self:
+            raise ValueError(f"{member.name} no pertenece a {self.name}")
+        self.members.remove(member)
+        member._team = None
+        self.total_health -= member._health
+        self.total_max_health -= member._max_health
+        self._level_sum -= member._level
+        if member._health > 0:
+            self.alive_count -= 1
+            self._alive_level_sum -= member._level
+        if member._armor_broken:
+            self.armor_broken_count -= 1
+            member._armor_broken = False
+        self._check_thresholds()
+    
+    @property
+    def health_fraction(self) -> float:
+        """Vida total sobre vida máxima total (0 si el equipo está vacío)."""
+        return self.total_health / self.total_max_health if self.total_max_health else 0.0
+    
+    @property
+    def average_level(self) -> float:
+        return self._level_sum / len(self.members) if self.members else 0.0
+    
+    @property
+    def average_alive_level(self) -> float:
+        return self._alive_level_sum / self.alive_count if self.alive_count else 0.0
+    
+    def is_wiped(self) -> bool:
+        return self.alive_count == 0
+    
+    def on_health_below(self, fraction: float, callback: Callable[["Team", float], None]):
+        """Registra un callback para cuando la vida total baje de fraction."""
+        threshold = _Threshold(fraction, callback)
+        thresholds = self._thresholds
+        position = 0
+        while position < len(thresholds) and thresholds[position].fraction >= fraction:
+            position += 1
+        thresholds.insert(position, threshold)
+        # Un umbral que ya está cruzado al registrarlo no se dispara
+        if position < self._next_threshold or self.health_fraction < fraction:
+            self._next_threshold += 1
+    
+    def on_wiped(self, callback: Callable[["Team"], None]):
+        """Registra un callback para cuando muera el último miembro vivo."""
+        self._wiped_callbacks.append(callback)
+    
+    def refresh_armor(self, member: TeamMember):
+        """Recalcula si la armadura del miembro está agotada (p. ej. tras recargar maná)."""
+        self._check_armor(member)
+    
+    def _check_armor(self, member: TeamMember):
+        armor = member._armor
+        broken = armor is not None and armor.is_broken()
+        if broken != member._armor_broken:
+            member._armor_broken = broken
+            self.armor_broken_count += 1 if broken else -1
+    
+    def _health_written(self, member: TeamMember, old: int, new: int):
+        if member._armor is not None:
+            self._check_armor(member)
+        if new == old:
+            return
+        self.total_health += new - old
+        died = False
+        if old > 0 >= new:
+            self.alive_count -= 1
+            self._alive_level_sum -= member._level
+            died = True
+        elif new > 0 >= old:
+            self.alive_count += 1
+            self._alive_level_sum += member._level
+        self._check_thresholds()
+        if died and self.alive_count == 0:
+            for callback in list(self._wiped_callbacks):
+                callback(self)
+    
+    def _max_health_written(self, old: int, new: int):
+        self.total_max_health += new - old
+        self._check_thresholds()
+    
+    def _level_written(self, member: TeamMember, old: int, new: int):
+        self._level_sum += new - old
+        if member._health > 0:
+            self._alive_level_sum += new - old
+    
+    def _check_thresholds(self):
+        thresholds = self._thresholds
+        if not thresholds:
+            return
+        fraction = self.health_fraction
+        position = self._next_threshold
+        while position > 0 and fraction >= thresholds[position - 1].fraction:
+            position -= 1
+        crossed = []
+        while position < len(thresholds) and fraction < thresholds[position].fraction:
+            crossed.append(thresholds[position])
+            position += 1
+        self._next_threshold = position
+        for threshold in crossed:
+            threshold.callback(self, fraction)
\ No newline at end of file
@@ -0,0 +1,241 @@
+"""
+Planificador de turnos por iniciativa.
+Ordena a los combatientes en un heap por el instante de su próxima acción,
+así que obtener el siguiente en actuar cuesta O(log n) en lugar de ordenar
+a todos en cada ronda. Los muertos salen del heap cuando les toca actuar; si
+los curan vuelven a agendarse en cuanto el planificador los encuentra vivos.
+"""
+import heapq
+from itertools import count
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.combat_system import Character, CombatSystem
+from src.interfaces import Weapon
+
+
+# Tiempo entre acciones de un combatiente con velocidad 1
+TURN_LENGTH = 100.0
+
+
+class Combatant:
+    """Entrada del planificador: un personaje, su arma, su velocidad y su equipo."""
+    
+    __slots__ = ("character", "weapon", "speed", "initiative", "team", "interval",
+                 "next_time", "active", "scheduled")
+    
+    def __init__(self, character: Character, weapon: Weapon, speed: float,
+                 initiative: int, team):
+        self.character = character
+        self.weapon = weapon
+        self.speed = speed
+        self.initiative = initiative
+        self.team = team
+        self.interval = TURN_LENGTH / speed
+        self.next_time = 0.0
+        self.active = True
+        self.scheduled = False
+    
+    def __repr__(self):
+        return (f"Combatant({self.character.name!r}, speed={self.speed}, "
+                f"team={self.team!r}, next_time={self.next_time})")
+
+
+class TurnScheduler:
+    """
+    Planificador de turnos sobre un heap.
+    
+    Cada combatiente actúa cada TURN_LENGTH / speed unidades de tiempo; los
+    empates se resuelven por mayor iniciativa y luego por orden de alta.
+    """
+    
+    def __init__(self, combat_system: Optional[CombatSystem] = None):
+        self.combat_system = combat_system
+        self.time = 0.0
+        self.turns = 0
+        self._heap: List[Tuple[float, int, int, Combatant]] = []
+        self._sequence = count()
+        self._combatants: Dict[int, Combatant] = {}
+        self._teams: Dict[object, List[Combatant]] = {}
+        self._team_hint: Dict[object, int] = {}
+    
+    def __len__(self) -> int:
+        """Cantidad de combatientes agregados que siguen vivos."""
+        return sum(1 for combatant in self._combatants.values()
+                   if combatant.character.is_alive())
+    
+    def add(self, character: Character, weapon: Weapon, speed: float = 1.0,
+            initiative: int = 0, team=None) -> Combatant:
+        """
+        Agrega un combatiente; su primera acción es un intervalo después del tiempo actual.
+        
+        Raises:
+            ValueError: Si speed no es positiva o el personaje ya está agregado
+        """
+        if speed <= 0:
+            raise ValueError("La velocidad debe ser positiva")
+        if id(character) in self._combatants:
+            raise ValueError(f"{character.name} ya está en el planificador")
+        combatant = Combatant(character, weapon, speed, initiative, team)
+        self._combatants[id(character)] = combatant
+        self._teams.setdefault(team, []).append(combatant)
+        self._schedule(combatant, self.time + combatant.interval)
+        return combatant
+    
+    def _schedule(self, combatant: Combatant, when: float):
+        combatant.next_time = when
+        combatant.scheduled = True
+        heapq.heappush(self._heap, (when, -combatant.initiative, next(self._sequence), combatant))
+    
+    def remove(self, character: Character):
+        """Retira un personaje; su entrada en el heap se descarta cuando sale."""
+        combatant = self._combatants.get(id(character))
+        if combatant is not None:
+            self._retire(combatant)
+    
+    def _retire(self, combatant: Combatant):
+        if not combatant.active:
+            return
+        combatant.active = False
+        del self._combatants[id(combatant.character)]
+    
+    def next_turn(self) -> Optional[Combatant]:
+        """
+        Saca al próximo combatiente vivo, avanza el reloj y lo vuelve a agendar.
+        
+        Returns:
+            El combatiente que actúa, o None si no queda ninguno
+        """
+        heap = self._heap
+        while heap:
+            when, _, _, combatant = heapq.heappop(heap)
+            if not combatant.active or when != combatant.next_time:
+                continue
+            if not combatant.character.is_alive():
+                combatant.scheduled = False
+                continue
+            self.time = when
+            self._schedule(combatant, when + combatant.interval)
+            return combatant
+        return None
+    
+    def peek(self) -> Optional[Combatant]:
+        """Retorna el próximo combatiente sin sacarlo (descarta entradas muertas)."""
+        heap = self._heap
+        while heap:
+            when, _, _, combatant = heap[0]
+            if combatant.active and when == combatant.next_time:
+                if combatant.character.is_alive():
+                    return combatant
+                combatant.scheduled = False
+            heapq.heappop(heap)
+        return None
+    
+    def set_speed(self, character: Character, speed: float):
+        """Cambia la velocidad; la próxima acción se reagenda desde el tiempo actual."""
+        if speed <= 0:
+            raise ValueError("La velocidad debe ser positiva")
+        combatant = self._combatants[id(character)]
+        combatant.speed = speed
+        combatant.interval = TURN_LENGTH / speed
+        # La entrada vieja queda obsoleta porque next_time ya no coincide
+        self._schedule(combatant, self.time + combatant.interval)
+    
+    def _first_alive(self, team) -> Optional[Combatant]:
+        """
+        Busca un miembro vivo del equipo empezando por el último encontrado y
+        dando la vuelta, así que los curados o revividos vuelven a ser elegibles.
+        Si el encontrado había salido del heap por muerto, se lo vuelve a agendar.
+        Un equipo sin vivos se recorre entero en cada llamada.
+        """
+        members = self._teams[team]
+        start = self._team_hint.get(team, 0)
+        member = members[start]
+        if member.active and member.scheduled and member.character.is_alive():
+            return member
+        size = len(members)
+        for offset in range(size):
+            index = (start + offset) % size
+            member = members[index]
+            if member.active and member.character.is_alive():
+                self._team_hint[team] = index
+                if not member.scheduled:
+                    self._schedule(member, self.time + member.interval)
+                return member
+        return None
+    
+    def teams_alive(self) -> int:
+        """
+        Cantidad de equipos con al menos un combatiente vivo.
+        
+        Se calcula con la vida actual de los personajes, así que ve las muertes
+        y curaciones ocurridas fuera de run_until.
+        """
+        first_alive = self._first_alive
+        alive = 0
+        for team in self._teams:
+            if first_alive(team) is not None:
+                alive += 1
+        return alive
+    
+    def alive_in_team(self, team) -> int:
+        """Cantidad de combatientes vivos del equipo."""
+        return sum(1 for member in self._teams.get(team, ())
+                   if member.active and member.character.is_alive())
+    
+    def first_enemy(self, combatant: Combatant) -> Optional[Character]:
+        """
+        Selector de objetivo por defecto: recorre los equipos enemigos en orden
+        de alta y ataca al mismo enemigo mientras siga vivo; cuando cae, pasa al
+        siguiente vivo de su equipo.
+        """
+        for team in self._teams:
+            if team == combatant.team:
+                continue
+            member = self._first_alive(team)
+            if member is not None:
+                return member.character
+        return None
+    
+    def run_until(self, condition: Callable[["TurnScheduler"], bool],
+                  choose_target: Optional[Callable[[Combatant], Optional[Character]]] = None,
+                  max_turns: Optional[int] = None,
+                  on_attack: Optional[Callable[[Combatant, dict], None]] = None) -> int:
+        """
+        Ejecuta turnos llamando a CombatSystem.attack hasta que condition sea verdadera.
+        
+        Args:
+            condition: Se evalúa antes de cada turno con el planificador
+            choose_target: Elige el defensor de un combatiente (por defecto first_enemy);
+                si retorna None el combatiente pierde el turno
+            max_turns: Turnos máximos de esta llamada
+            on_attack: Se llama con el combatiente y el resultado de cada ataque
+        
+        Returns:
+            Cantidad de turnos ejecutados
+        """
+        if self.combat_system is None:
+            raise ValueError("run_until requiere un CombatSystem")
+        choose_target = choose_target or self.first_enemy
+        executed = 0
+        while not condition(self):
+            if max_turns is not None and executed >= max_turns:
+                break
+            combatant = self.next_turn()
+            if combatant is None:
+                break
+            executed += 1
+            self.turns += 1
+            target = choose_target(combatant)
+            if target is None:
+                continue
+            # Se busca el método en cada turno para respetar hooks o profiling
+            # instalados a mitad de la batalla
+            result = self.combat_system.attack(combatant.character, target, combatant.weapon)
+            if on_attack is not None:
+                on_attack(combatant, result)
+        return executed
+
+
+def one_team_left(scheduler: TurnScheduler) -> bool:
+    """Condición de fin para run_until: queda a lo sumo un equipo."""
+    return scheduler.teams_alive() <= 1
\ No newline at end of file
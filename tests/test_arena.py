@@ -0,0 +1,174 @@
+"""
+Tests unitarios para la arena asíncrona.
+"""
+import asyncio
+import os
+import tempfile
+import unittest
+from src.arena import Arena, ArenaServer, ProtocolError, encode_frame, read_frame
+from src.arena_client import ArenaClient, load_test, percentile
+from src.combat_system import Character, CombatSystem
+from src.damage_calculator import StandardDamageCalculator
+from src.armor_system import PlateArmor
+from src.weapons import Sword, Bow
+
+
+CHARACTERS = [
+    {"name": "Hero", "health": 100, "level": 5, "weapon": "sword", "armor": "plate"},
+    {"name": "Villain", "health": 80, "level": 3, "weapon": "bow"},
+]
+
+
+class TestArena(unittest.IsolatedAsyncioTestCase):
+    """Tests de la arena sin red."""
+    
+    async def test_attacks_in_one_tick_are_batched(self):
+        """Verifica que los ataques de un tick se resuelven en un solo lote."""
+        arena = Arena()
+        arena.create_match("m", CHARACTERS)
+        futures = [arena.submit_attack("m", "Hero", "Villain"),
+                   arena.submit_attack("m", "Villain", "Hero")]
+        
+        results = await asyncio.gather(*futures)
+        
+        self.assertEqual(arena.ticks, 1)
+        self.assertEqual(arena.attacks_resolved, 2)
+        hero = Character("Hero", 100, 5, armor=PlateArmor())
+        villain = Character("Villain", 80, 3)
+        combat = CombatSystem(StandardDamageCalculator())
+        expected = [combat.attack(hero, villain, Sword())["damage"],
+                    combat.attack(villain, hero, Bow())["damage"]]
+        self.assertEqual([result["damage"] for result in results], expected)
+        self.assertEqual(arena.matches["m"].status(),
+                         {"Hero": hero.current_health, "Villain": villain.current_health})
+    
+    async def test_responses_report_health_after_each_attack(self):
+        """Verifica que cada respuesta trae la vida del defensor después de su ataque."""
+        arena = Arena()
+        arena.create_match("m", CHARACTERS)
+        futures = [arena.submit_attack("m", "Hero", "Villain") for _ in range(2)]
+        
+        results = await asyncio.gather(*futures)
+        
+        villain = Character("Villain", 80, 3)
+        combat = CombatSystem(StandardDamageCalculator())
+        hero = Character("Hero", 100, 5)
+        expected = [combat.attack(hero, villain, Sword())["defender_health"] for _ in range(2)]
+        self.assertEqual([result["defender_health"] for result in results], expected)
+        self.assertGreater(results[0]["defender_health"], results[1]["defender_health"])
+    
+    async def test_failed_batch_rejects_only_its_attacks(self):
+        """Verifica que un lote fallido avisa a sus clientes sin frenar las demás partidas."""
+        arena = Arena()
+        arena.create_match("broken", CHARACTERS)
+        arena.create_match("ok", CHARACTERS)
+        
+        def fail(*args):
+            raise RuntimeError("tabla dañada")
+        
+        arena.matches["broken"].combat.attack_batch = fail
+        broken = arena.submit_attack("broken", "Hero", "Villain")
+        ok = arena.submit_attack("ok", "Hero", "Villain")
+        
+        results = await asyncio.gather(broken, ok, return_exceptions=True)
+        
+        self.assertIsInstance(results[0], ProtocolError)
+        self.assertIsInstance(results[0].__cause__, RuntimeError)
+        self.assertGreater(results[1]["damage"], 0)
+        self.assertEqual(arena.attacks_resolved, 1)
+    
+    async def test_unknown_names(self):
+        """Verifica los errores por partida o personaje desconocido."""
+        arena = Arena()
+        arena.create_match("m", CHARACTERS)
+        with self.assertRaises(ProtocolError):
+            arena.submit_attack("x", "Hero", "Villain")
+        with self.assertRaises(ProtocolError):
+            arena.submit_attack("m", "Hero", "Nobody")
+        with self.assertRaises(ProtocolError):
+            arena.create_match("m", [])
+
+
+class TestArenaServer(unittest.IsolatedAsyncioTestCase):
+    """Tests del protocolo sobre sockets locales."""
+    
+    async def asyncSetUp(self):
+        self.server = ArenaServer()
+        self.host, self.port = await self.server.start_tcp()
+    
+    async def asyncTearDown(self):
+        await self.server.close()
+    
+    async def test_tcp_roundtrip(self):
+        """Verifica crear una partida, atacar y consultar el estado por TCP."""
+        client = await ArenaClient.connect_tcp(self.host, self.port)
+        try:
+            await client.create_match("m", CHARACTERS)
+            results = await asyncio.gather(*(
+                client.attack("m", "Hero", "Villain") for _ in range(3)
+            ))
+            health = await client.status("m")
+        finally:
+            await client.close()
+        
+        self.assertEqual(health["Villain"], max(0, 80 - sum(result["damage"] for result in results)))
+        self.assertEqual(results[-1]["defender_alive"], health["Villain"] > 0)
+    
+    async def test_errors_are_reported(self):
+        """Verifica que un comando inválido responde con error sin cortar la conexión."""
+        client = await ArenaClient.connect_tcp(self.host, self.port)
+        try:
+            with self.assertRaises(ProtocolError):
+                await client.request({"op": "fly"})
+            with self.assertRaises(ProtocolError):
+                await client.request({"op": "attack"})
+            await client.create_match("m", CHARACTERS)
+        finally:
+            await client.close()
+    
+    async def test_frame_limit(self):
+        """Verifica que se rechaza un marco con un largo excesivo."""
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.write((1 << 30).to_bytes(4, "big"))
+        response = await read_frame(reader)
+        writer.close()
+        self.assertFalse(response["ok"])
+    
+    async def test_load_test(self):
+        """Verifica que la prueba de carga reporta todas las latencias."""
+        report = await load_test(self.host, self.port, matches=20, attacks=5, connections=3)
+        self.assertEqual(report.requests, 100)
+        self.assertLessEqual(report.p50, report.p99)
+        self.assertEqual(self.server.arena.matches, {})
+    
+    @unittest.skipUnless(hasattr(asyncio, "start_unix_server"), "Requiere sockets Unix")
+    async def test_unix_socket(self):
+        """Verifica el mismo protocolo sobre un socket Unix."""
+        with tempfile.TemporaryDirectory() as directory:
+            server = ArenaServer()
+            path = await server.start_unix(os.path.join(directory, "arena.sock"))
+            try:
+                report = await load_test(unix_path=path, matches=4, attacks=3, connections=2)
+            finally:
+                await server.close()
+        self.assertEqual(report.requests, 12)
+
+
+class TestProtocolHelpers(unittest.TestCase):
+    """Tests de funciones auxiliares."""
+    
+    def test_encode_frame(self):
+        """Verifica el prefijo de largo."""
+        frame = encode_frame({"a": 1})
+        self.assertEqual(int.from_bytes(frame[:4], "big"), len(frame) - 4)
+    
+    def test_percentile(self):
+        """Verifica el percentil por rango más cercano."""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
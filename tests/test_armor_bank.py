@@ -0,0 +1,109 @@
+"""
+Tests unitarios para los bancos de armaduras.
+Cada banco se compara contra los objetos de src/armor_system.py.
+"""
+import unittest
+from src.armor_bank import (
+    ArmorBank, LeatherArmorBank, PlateArmorBank, MagicShieldBank, EnchantedArmorBank,
+    LeatherArmorView
+)
+from src.armor_system import LeatherArmor, PlateArmor, MagicShield, EnchantedArmor
+from src.combat_system import Character
+from src.rng import BufferedRandom
+
+
+ROWS = [0, 1, 2, 0, 0, 3, 1, 2, 2, 2, 3, 0] * 30
+DAMAGES = [50, 7, 133, 1, 20, 64, 99, 3, 45, 80, 12, 250] * 30
+
+
+class TestArmorBanks(unittest.TestCase):
+    """Tests de equivalencia entre bancos y objetos."""
+    
+    def _assert_matches_objects(self, bank, armors, state_of):
+        expected = [armors[row].absorb_damage(damage) for row, damage in zip(ROWS, DAMAGES)]
+        results = bank.absorb(DAMAGES, ROWS)
+        
+        self.assertEqual(results, expected)
+        for row, armor in enumerate(armors):
+            self.assertEqual(state_of(bank.view(row)), state_of(armor))
+    
+    def test_leather_bank(self):
+        """Verifica el banco de cuero."""
+        bank = LeatherArmorBank()
+        for _ in range(4):
+            bank.add()
+        self._assert_matches_objects(
+            bank, [LeatherArmor() for _ in range(4)], lambda armor: armor._durability
+        )
+    
+    def test_plate_bank(self):
+        """Verifica el banco de placas."""
+        bank = PlateArmorBank()
+        for _ in range(4):
+            bank.add(defense=40)
+        self._assert_matches_objects(
+            bank, [PlateArmor(40) for _ in range(4)], lambda armor: armor._durability
+        )
+        self.assertEqual(bank.view(0).get_defense(), 40)
+    
+    def test_magic_shield_bank(self):
+        """Verifica el banco de escudos, incluida la absorción por maná."""
+        bank = MagicShieldBank()
+        manas = [100, 30, 500, 7]
+        for mana in manas:
+            bank.add(mana=mana)
+        self._assert_matches_objects(
+            bank, [MagicShield(mana=mana) for mana in manas], MagicShield.get_mana
+        )
+    
+    def test_enchanted_bank(self):
+        """Verifica el banco encantado con la misma semilla."""
+        bank = EnchantedArmorBank(rng=BufferedRandom(5))
+        for _ in range(4):
+            bank.add()
+        shared = BufferedRandom(5)
+        self._assert_matches_objects(
+            bank, [EnchantedArmor(rng=shared) for _ in range(4)],
+            lambda armor: (armor._durability, armor.did_reflect())
+        )
+    
+    def test_absorb_without_rows(self):
+        """Verifica que sin rows cada daño va a su fila."""
+        bank = LeatherArmorBank()
+        bank.add()
+        bank.add()
+        self.assertEqual(bank.absorb([100, 10]), [80, 8])
+        with self.assertRaises(ValueError):
+            bank.absorb([100])
+    
+    def test_base_bank_is_abstract(self):
+        """Verifica que ArmorBank no se puede instanciar sin absorb()."""
+        with self.assertRaises(TypeError):
+            ArmorBank()
+    
+    def test_views_mutate_bank(self):
+        """Verifica que las vistas son armaduras que escriben en el banco."""
+        bank = MagicShieldBank()
+        row = bank.add(mana=100)
+        shield = bank.view(row)
+        character = Character("Mage", 100, 5, armor=shield)
+        
+        character.take_damage(60)
+        
+        self.assertLess(bank.mana[row], 100)
+        bank.recharge_mana(1000)
+        self.assertEqual(shield.get_mana(), 100)
+    
+    def test_view_fast_forward(self):
+        """Verifica que absorb_damage_n también funciona sobre vistas."""
+        bank = LeatherArmorBank()
+        view = bank.view(bank.add())
+        self.assertIsInstance(view, LeatherArmorView)
+        self.assertEqual(view.absorb_damage_n(10, 150), 100 * 8 + 50 * 10)
+        self.assertEqual(bank.durability[0], 0)
+        with self.assertRaises(IndexError):
+            bank.view(1)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
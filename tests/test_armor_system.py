@@ -10,6 +10,8 @@ from src.armor_system import (
 from src.combat_system import Character, CombatSystem
 from src.weapons import Sword
 from src.damage_calculator import MockDamageCalculator
+from src.interfaces import Armor
+from src.rng import BufferedRandom
 
 
 class TestLeatherArmor(unittest.TestCase):
@@ -379,5 +381,71 @@ class TestDummyArmor(unittest.TestCase):
         self.assertEqual(armor.damage_received_count, 3)
 
 
+class TestAbsorbDamageN(unittest.TestCase):
+    """Tests para la absorción de n golpes idénticos."""
+    
+    def _assert_same_as_sequential(self, factory, state_of):
+        for incoming in (1, 3, 7, 50, 137):
+            for n in (0, 1, 2, 49, 50, 51, 99, 100, 101, 150, 500):
+                fast = factory()
+                slow = factory()
+                total = fast.absorb_damage_n(incoming, n)
+                expected = sum(slow.absorb_damage(incoming) for _ in range(n))
+                self.assertEqual(total, expected, (incoming, n))
+                self.assertEqual(state_of(fast), state_of(slow), (incoming, n))
+    
+    def test_leather_armor(self):
+        """Verifica la armadura de cuero contra n llamadas sucesivas."""
+        self._assert_same_as_sequential(LeatherArmor, lambda armor: armor._durability)
+    
+    def test_plate_armor(self):
+        """Verifica la armadura de placas, incluida durabilidad impar."""
+        self._assert_same_as_sequential(PlateArmor, lambda armor: armor._durability)
+        
+        def worn_plate():
+            armor = PlateArmor()
+            armor._durability = 7
+            return armor
+        self._assert_same_as_sequential(worn_plate, lambda armor: armor._durability)
+    
+    def test_magic_shield(self):
+        """Verifica el escudo mágico, con y sin punto fijo de maná."""
+        self._assert_same_as_sequential(lambda: MagicShield(mana=100), MagicShield.get_mana)
+        self._assert_same_as_sequential(lambda: MagicShield(mana=13), MagicShield.get_mana)
+    
+    def test_enchanted_armor(self):
+        """Verifica la armadura encantada con la misma semilla."""
+        self._assert_same_as_sequential(
+            lambda: EnchantedArmor(rng=BufferedRandom(21)),
+            lambda armor: (armor._durability, armor.did_reflect(), armor.rng.random())
+        )
+    
+    def test_dummy_armor(self):
+        """Verifica la armadura dummy."""
+        self._assert_same_as_sequential(
+            lambda: DummyArmor(absorption_rate=0.3), lambda armor: armor.damage_received_count
+        )
+    
+    def test_generic_fallback(self):
+        """Verifica la implementación genérica de la interfaz."""
+        class CountingArmor(Armor):
+            def __init__(self):
+                self.hits = 0
+            
+            def get_defense(self) -> int:
+                return 0
+            
+            def get_name(self) -> str:
+                return "Counting Armor"
+            
+            def absorb_damage(self, incoming_damage: int) -> int:
+                self.hits += 1
+                return incoming_damage - self.hits
+        
+        armor = CountingArmor()
+        self.assertEqual(armor.absorb_damage_n(10, 3), 9 + 8 + 7)
+        self.assertEqual(armor.hits, 3)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Tests unitarios para el simulador Monte Carlo de duelos.
+"""
+import unittest
+from src.battle_simulator import (
+    CombatantSpec, DuelConfig, DuelStats, simulate_duels, duel_seed, CHUNK_SIZE
+)
+from src.armor_system import PlateArmor, EnchantedArmor
+from src.damage_calculator import CriticalDamageCalculator
+from src.weapons import Sword, Bow
+
+
+class TestBattleSimulator(unittest.TestCase):
+    """Tests para simulate_duels."""
+    
+    def _random_config(self):
+        return DuelConfig(
+            CombatantSpec("Knight", 200, 10, Sword, {"damage": 40}, EnchantedArmor),
+            CombatantSpec("Ranger", 160, 11, Bow, {"damage": 35}, PlateArmor),
+            calculator_cls=CriticalDamageCalculator,
+        )
+    
+    def test_deterministic_duel(self):
+        """Verifica un duelo sin azar contra el cálculo a mano."""
+        config = DuelConfig(
+            CombatantSpec("Knight", 100, 5, Sword, {"damage": 50}),
+            CombatantSpec("Goblin", 60, 5, Sword, {"damage": 10}),
+        )
+        
+        stats = simulate_duels(config, 3, workers=1)
+        
+        # El caballero mata en dos golpes (turnos 1 y 3)
+        self.assertEqual(stats.duels, 3)
+        self.assertEqual(stats.win_rates(), {"challenger": 1.0})
+        self.assertEqual(stats.time_to_kill, {3: 3})
+        self.assertEqual(stats.damage_histogram, {50: 6, 10: 3})
+    
+    def test_draw_after_max_turns(self):
+        """Verifica que se declara empate al llegar al máximo de turnos."""
+        config = DuelConfig(
+            CombatantSpec("Wall", 10000, 1, Sword, {"damage": 1}),
+            CombatantSpec("Rock", 10000, 1, Sword, {"damage": 1}),
+            max_turns=4,
+        )
+        
+        stats = simulate_duels(config, 2, workers=1)
+        
+        self.assertEqual(stats.wins, {"draw": 2})
+        self.assertEqual(stats.mean_time_to_kill(), 0.0)
+    
+    def test_same_seed_same_result(self):
+        """Verifica que la misma semilla reproduce el mismo resultado."""
+        config = self._random_config()
+        first = simulate_duels(config, 200, workers=1, seed=7)
+        second = simulate_duels(config, 200, workers=1, seed=7)
+        other = simulate_duels(config, 200, workers=1, seed=8)
+        
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+    
+    def test_result_independent_of_worker_count(self):
+        """Verifica que el resultado no depende de la cantidad de procesos."""
+        config = self._random_config()
+        n = CHUNK_SIZE + 250
+        
+        serial = simulate_duels(config, n, workers=1, seed=3)
+        parallel = simulate_duels(config, n, workers=2, seed=3)
+        
+        self.assertEqual(serial, parallel)
+        self.assertEqual(parallel.duels, n)
+        self.assertAlmostEqual(sum(parallel.win_rates().values()), 1.0)
+    
+    def test_merge_and_seed_derivation(self):
+        """Verifica la suma de estadísticas y la derivación de semillas."""
+        a = DuelStats()
+        a.duels = 1
+        a.wins["challenger"] = 1
+        b = DuelStats()
+        b.duels = 1
+        b.wins["opponent"] = 1
+        a.merge(b)
+        
+        self.assertEqual(a.win_rates(), {"challenger": 0.5, "opponent": 0.5})
+        self.assertEqual(duel_seed(1, 2), duel_seed(1, 2))
+        self.assertNotEqual(duel_seed(1, 2), duel_seed(2, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
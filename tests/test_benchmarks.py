@@ -0,0 +1,61 @@
+"""
+Tests unitarios para la suite de benchmarks.
+"""
+import json
+import unittest
+from benchmarks.suite import BENCHMARKS, compare, run_benchmark, run_suite
+
+
+def _document(**results):
+    return {"results": {name: {"ns_per_op": ns, "peak_bytes": peak}
+                        for name, (ns, peak) in results.items()}}
+
+
+class TestCompare(unittest.TestCase):
+    """Tests de la comparación contra la línea base."""
+    
+    def test_within_threshold(self):
+        """Verifica que una variación menor al umbral no es regresión."""
+        baseline = _document(attack=(100.0, 1000))
+        current = _document(attack=(110.0, 1100))
+        self.assertEqual(compare(current, baseline, threshold=0.15), [])
+    
+    def test_time_and_memory_regressions(self):
+        """Verifica que se reportan el tiempo y la memoria por separado."""
+        baseline = _document(attack=(100.0, 1000), absorb=(10.0, 100))
+        current = _document(attack=(130.0, 1000), absorb=(10.0, 200))
+        
+        regressions = compare(current, baseline, threshold=0.2, memory_threshold=0.5)
+        
+        self.assertEqual([(r.name, r.metric) for r in regressions],
+                         [("attack", "ns_per_op"), ("absorb", "peak_bytes")])
+        self.assertAlmostEqual(regressions[0].change, 0.3)
+    
+    def test_per_benchmark_threshold_and_new_benchmarks(self):
+        """Verifica los umbrales por benchmark y que se ignoran los nuevos."""
+        baseline = _document(attack=(100.0, 0))
+        current = _document(attack=(130.0, 0), brand_new=(1.0, 1))
+        self.assertEqual(compare(current, baseline, threshold=0.1,
+                                 thresholds={"attack": 0.5}), [])
+
+
+class TestRunSuite(unittest.TestCase):
+    """Tests de ejecución a escala reducida."""
+    
+    def test_every_benchmark_runs(self):
+        """Verifica que todos los benchmarks corren y el resultado es JSON."""
+        document = run_suite(scale=0.001, repeat=1, measure_memory=False)
+        
+        self.assertEqual(set(document["results"]), set(BENCHMARKS))
+        json.dumps(document)
+        for result in document["results"].values():
+            self.assertGreater(result["ns_per_op"], 0)
+    
+    def test_memory_is_measured(self):
+        """Verifica que el crecimiento del log se refleja en la memoria pico."""
+        result = run_benchmark("log_growth", scale=0.01, repeat=1)
+        self.assertGreater(result.peak_bytes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
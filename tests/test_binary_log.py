@@ -0,0 +1,100 @@
+"""
+Tests unitarios para el formato binario del log de combate.
+"""
+import os
+import tempfile
+import unittest
+from src.binary_log import BinaryLogWriter, BinaryLogReader, RECORD_SIZE, HEADER
+from src.combat_log import LogRecord, RECORD_FIELDS
+from src.combat_system import CombatSystem, Character
+from src.weapons import Sword, Bow
+from src.damage_calculator import MockDamageCalculator
+
+
+class TestBinaryLog(unittest.TestCase):
+    """Tests para el escritor y lector binarios."""
+    
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._directory.name, "combat.bin")
+    
+    def tearDown(self):
+        self._directory.cleanup()
+    
+    def test_round_trip(self):
+        """Verifica que los registros escritos se leen igual."""
+        with BinaryLogWriter(self.path) as writer:
+            writer.write(0, "Hero", 5, "Orc", 3, "Sword", 42)
+            writer.write(1, "Orc", 3, "Hero", 5, "Club", 7)
+        
+        with BinaryLogReader(self.path) as reader:
+            self.assertEqual(len(reader), 2)
+            self.assertEqual(reader.record(0), LogRecord(0, "Hero", 5, "Orc", 3, "Sword", 42))
+            self.assertEqual(reader.record(-1).weapon, "Club")
+            self.assertEqual(list(reader.column("damage")), [42, 7])
+        
+        self.assertEqual(os.path.getsize(self.path), HEADER.size + 2 * RECORD_SIZE)
+    
+    def test_slice_by_sequence(self):
+        """Verifica el corte por rango de secuencia."""
+        with BinaryLogWriter(self.path) as writer:
+            for sequence in range(10, 110):
+                writer.write(sequence, "Hero", 5, "Orc", 3, "Sword", sequence * 2)
+        
+        with BinaryLogReader(self.path) as reader:
+            self.assertEqual(reader.sequence_range(20, 30), (10, 20))
+            rows = reader.slice_by_sequence(20, 30)
+            self.assertEqual(len(rows), 10 * RECORD_FIELDS)
+            self.assertEqual(rows[0], 20)
+            self.assertEqual(rows[6], 40)
+            self.assertEqual(len(reader.slice_by_sequence(500, 600)), 0)
+            del rows
+    
+    def test_reader_sees_appended_records(self):
+        """Verifica que se puede leer mientras el escritor sigue anexando."""
+        writer = BinaryLogWriter(self.path, buffer_records=2)
+        reader = BinaryLogReader(self.path)
+        try:
+            self.assertEqual(len(reader), 0)
+            writer.write(0, "Hero", 5, "Orc", 3, "Sword", 1)
+            writer.write(1, "Hero", 5, "Orc", 3, "Sword", 2)
+            self.assertEqual(reader.refresh(), 2)
+            
+            writer.write(2, "Mage", 7, "Orc", 3, "Staff", 3)
+            writer.flush()
+            self.assertEqual(reader.refresh(), 3)
+            self.assertEqual(reader.record(2).attacker, "Mage")
+        finally:
+            writer.close()
+            reader.close()
+    
+    def test_rejects_other_files(self):
+        """Verifica que se rechazan archivos que no son logs binarios."""
+        with open(self.path, "wb") as other:
+            other.write(b"x" * 64)
+        with self.assertRaises(ValueError):
+            BinaryLogReader(self.path)
+    
+    def test_writer_attached_to_combat_system(self):
+        """Verifica que CombatSystem escribe cada ataque en el log binario."""
+        combat = CombatSystem(MockDamageCalculator(fixed_damage=20))
+        attacker = Character("Hero", 100, 5)
+        defender = Character("Orc", 100, 3)
+        
+        with BinaryLogWriter(self.path) as writer:
+            combat.attach_log_writer(writer)
+            combat.attack(attacker, defender, Sword())
+            combat.attack(attacker, defender, Bow())
+            combat.attach_log_writer(None)
+            combat.attack(attacker, defender, Bow())
+        
+        with BinaryLogReader(self.path) as reader:
+            self.assertEqual(len(reader), 2)
+            self.assertEqual(
+                [record.message() for record in map(reader.record, range(2))],
+                combat.get_combat_log()[:2]
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""
+Tests unitarios para la tabla columnar de personajes.
+"""
+import unittest
+from src.character_table import CharacterTable, CharacterView, ARMOR_NONE, ARMOR_PLATE
+from src.combat_system import CombatSystem, Character
+from src.weapons import Sword
+from src.armor_system import LeatherArmor, PlateArmor
+from src.damage_calculator import StandardDamageCalculator, MockDamageCalculator
+
+
+class TestCharacterTable(unittest.TestCase):
+    """Tests para CharacterTable."""
+    
+    def test_add_stores_columns(self):
+        """Verifica que los atributos se guardan en columnas."""
+        table = CharacterTable()
+        row = table.add("Hero", 100, 5, armor=PlateArmor())
+        
+        self.assertEqual(row, 0)
+        self.assertEqual(len(table), 1)
+        self.assertEqual(table.health[0], 100)
+        self.assertEqual(table.max_health[0], 100)
+        self.assertEqual(table.level[0], 5)
+        self.assertEqual(table.armor_kind[0], ARMOR_PLATE)
+    
+    def test_view_behaves_like_character(self):
+        """Verifica que la vista se comporta como un Character."""
+        table = CharacterTable()
+        table.add("Hero", 100, 5)
+        hero = table[0]
+        
+        self.assertIsInstance(hero, Character)
+        self.assertEqual(hero.name, "Hero")
+        self.assertEqual(hero.take_damage(30), 30)
+        self.assertEqual(table.health[0], 70)
+        hero.heal(50)
+        self.assertEqual(hero.current_health, 100)
+        self.assertTrue(hero.is_alive())
+    
+    def test_view_equip_armor_updates_kind(self):
+        """Verifica que equipar armadura actualiza la columna de tipo."""
+        table = CharacterTable()
+        table.add("Hero", 100, 5)
+        self.assertEqual(table.armor_kind[0], ARMOR_NONE)
+        
+        table[0].equip_armor(PlateArmor())
+        self.assertEqual(table.armor_kind[0], ARMOR_PLATE)
+        self.assertEqual(table[0].take_damage(40), 20)
+    
+    def test_views_work_with_combat_system(self):
+        """Verifica que CombatSystem acepta vistas de la tabla."""
+        table = CharacterTable()
+        table.add("Knight", 100, 5)
+        table.add("Goblin", 50, 5, armor=LeatherArmor())
+        combat = CombatSystem(MockDamageCalculator(fixed_damage=20))
+        
+        result = combat.attack(table[0], table[1], Sword())
+        
+        self.assertEqual(result["damage"], 16)
+        self.assertEqual(table.health[1], 34)
+    
+    def test_column_operations(self):
+        """Verifica daño, curación y vida sobre columnas completas."""
+        table = CharacterTable()
+        table.add("A", 100, 1)
+        table.add("B", 20, 1, armor=LeatherArmor())
+        table.add("C", 50, 1)
+        
+        damages = table.take_damage([0, 1, 1, 2], [10, 30, 30, 60])
+        
+        self.assertEqual(damages, [10, 24, 24, 60])
+        self.assertEqual(list(table.health), [90, 0, 0])
+        self.assertEqual(table.is_alive(), [True, False, False])
+        self.assertEqual(table.is_alive([2, 0]), [False, True])
+        self.assertEqual(table.alive_rows(), [0])
+        self.assertEqual(table.alive_count(), 1)
+        
+        table.heal([0, 2], [50, 10])
+        self.assertEqual(list(table.health), [100, 0, 10])
+    
+    def test_extend_copies_characters(self):
+        """Verifica que se pueden migrar personajes existentes."""
+        hero = Character("Hero", 100, 5)
+        hero.take_damage(25)
+        table = CharacterTable()
+        
+        rows = table.extend([hero])
+        
+        self.assertEqual(list(rows), [0])
+        self.assertEqual(table[0].current_health, 75)
+        self.assertEqual(table[0].max_health, 100)
+    
+    def test_views_compare_by_row(self):
+        """Verifica que dos vistas de la misma fila son iguales."""
+        table = CharacterTable()
+        table.add("Hero", 100, 5)
+        self.assertEqual(table[0], table[-1])
+        self.assertIsInstance(table[0], CharacterView)
+        with self.assertRaises(IndexError):
+            table[1]
+    
+    def test_attack_batch_on_table(self):
+        """Verifica que attack_batch opera sobre las columnas de la tabla."""
+        table = CharacterTable()
+        table.add("Knight", 300, 10, armor=PlateArmor())
+        table.add("Goblin", 40, 3)
+        party = [Character("Knight", 300, 10, armor=PlateArmor()), Character("Goblin", 40, 3)]
+        combat = CombatSystem(StandardDamageCalculator())
+        
+        expected = combat.attack_batch(party, [0, 1, 0], [1, 0, 1], [20, 50, 20])
+        results = combat.attack_batch(table, [0, 1, 0], [1, 0, 1], [20, 50, 20])
+        
+        self.assertEqual(results, expected)
+        self.assertEqual(list(table.health), [c.current_health for c in party])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Tests unitarios para el análisis cerrado de enfrentamientos.
+Cada resultado se compara contra una simulación golpe a golpe.
+"""
+import unittest
+from src.combat_analysis import (
+    hits_to_kill, analyze_matchup, expected_damage_per_hit, expected_hits_to_kill,
+    incoming_distribution
+)
+from src.armor_system import LeatherArmor, PlateArmor, MagicShield, EnchantedArmor, DummyArmor
+from src.combat_system import Character
+from src.damage_calculator import StandardDamageCalculator, CriticalDamageCalculator
+from src.rng import BufferedRandom
+
+
+def _simulate(health, incoming, armor):
+    """Simulación de referencia: (golpes, absorbido, golpe que agota la armadura)."""
+    character = Character("Target", health, 1, armor=armor)
+    hits = 0
+    absorbed = 0
+    broken_at = None
+    if armor is not None and _depleted(armor):
+        broken_at = 0
+    while character.is_alive():
+        hits += 1
+        absorbed += incoming - character.take_damage(incoming)
+        if broken_at is None and armor is not None and _depleted(armor):
+            broken_at = hits
+    return hits, absorbed, broken_at
+
+
+def _depleted(armor):
+    if isinstance(armor, DummyArmor):
+        return False
+    if isinstance(armor, MagicShield):
+        return armor.get_mana() <= 0
+    return armor._durability <= 0
+
+
+class TestHitsToKill(unittest.TestCase):
+    """Tests para las fórmulas deterministas."""
+    
+    def test_matches_simulation(self):
+        """Verifica las fórmulas contra la simulación para muchas combinaciones."""
+        factories = [
+            lambda: None,
+            LeatherArmor,
+            PlateArmor,
+            lambda: MagicShield(mana=100),
+            lambda: MagicShield(mana=37),
+            lambda: DummyArmor(absorption_rate=0.25),
+        ]
+        for factory in factories:
+            for health in (1, 10, 99, 500, 5000, 20000):
+                for incoming in (1, 3, 7, 50, 133):
+                    with self.subTest(armor=factory(), health=health, incoming=incoming):
+                        analysis = hits_to_kill(health, incoming, factory())
+                        expected = _simulate(health, incoming, factory())
+                        self.assertEqual(tuple(analysis), expected)
+    
+    def test_partially_worn_armor(self):
+        """Verifica que se parte del estado actual de la armadura."""
+        armor = PlateArmor()
+        armor._durability = 3
+        # Dos golpes al 50% agotan la armadura; luego 300 de vida a 100 por golpe
+        self.assertEqual(tuple(hits_to_kill(400, 100, armor)), (5, 100, 2))
+        self.assertEqual(armor._durability, 3)
+    
+    def test_analyze_matchup_uses_calculator(self):
+        """Verifica la respuesta a "cuántos espadazos matan a un nivel 10 con placas"."""
+        analysis = analyze_matchup(50, 10, 10, 1000, PlateArmor())
+        self.assertEqual(tuple(analysis), _simulate(1000, 50, PlateArmor()))
+    
+    def test_enchanted_armor_is_not_deterministic(self):
+        """Verifica que la armadura encantada se rechaza en la ruta determinista."""
+        with self.assertRaises(ValueError):
+            hits_to_kill(100, 10, EnchantedArmor())
+    
+    def test_zero_damage_never_kills(self):
+        """Verifica que un daño nulo nunca mata."""
+        self.assertIsNone(hits_to_kill(100, 10, DummyArmor(absorption_rate=1.0)).hits)
+
+
+class TestExpectedValues(unittest.TestCase):
+    """Tests para los valores esperados con azar."""
+    
+    def test_incoming_distribution(self):
+        """Verifica la distribución del calculador con críticos."""
+        distribution = incoming_distribution(50, 5, 5, CriticalDamageCalculator())
+        self.assertEqual(len(distribution), 2)
+        self.assertAlmostEqual(distribution[0][0], 0.9)
+        self.assertEqual([damage for _, damage in distribution], [50, 100])
+    
+    def test_deterministic_case_matches_closed_form(self):
+        """Verifica que la propagación exacta coincide con la fórmula cerrada."""
+        for armor_factory in (LeatherArmor, PlateArmor, lambda: MagicShield(mana=60)):
+            result = expected_hits_to_kill(900, 40, 6, 5, StandardDamageCalculator(), armor_factory())
+            analysis = analyze_matchup(40, 6, 5, 900, armor_factory())
+            self.assertAlmostEqual(result.hits.mean, analysis.hits)
+            self.assertAlmostEqual(result.hits.variance, 0.0)
+            self.assertAlmostEqual(result.expected_absorbed, analysis.total_absorbed)
+    
+    def test_expected_hit_matches_monte_carlo(self):
+        """Verifica la media y varianza por golpe contra una simulación."""
+        moments = expected_damage_per_hit(60, 9, 5, CriticalDamageCalculator(), EnchantedArmor())
+        
+        calculator = CriticalDamageCalculator(rng=BufferedRandom(1))
+        armor_rng = BufferedRandom(4)
+        samples = []
+        for _ in range(20000):
+            armor = EnchantedArmor(rng=armor_rng)
+            samples.append(armor.absorb_damage(calculator.calculate_damage(60, 9, 5)))
+        mean = sum(samples) / len(samples)
+        variance = sum((sample - mean) ** 2 for sample in samples) / len(samples)
+        
+        self.assertAlmostEqual(mean, moments.mean, delta=0.5)
+        self.assertAlmostEqual(variance, moments.variance, delta=0.05 * moments.variance)
+    
+    def test_expected_hits_match_monte_carlo(self):
+        """Verifica los golpes esperados para matar contra una simulación."""
+        result = expected_hits_to_kill(400, 30, 7, 5, CriticalDamageCalculator(), EnchantedArmor())
+        
+        calculator = CriticalDamageCalculator(rng=BufferedRandom(2))
+        armor_rng = BufferedRandom(3)
+        samples = []
+        for _ in range(3000):
+            character = Character("Target", 400, 5, armor=EnchantedArmor(rng=armor_rng))
+            hits = 0
+            while character.is_alive():
+                hits += 1
+                character.take_damage(calculator.calculate_damage(30, 7, 5))
+            samples.append(hits)
+        mean = sum(samples) / len(samples)
+        variance = sum((sample - mean) ** 2 for sample in samples) / len(samples)
+        
+        self.assertAlmostEqual(mean, result.hits.mean, delta=0.1)
+        self.assertAlmostEqual(variance, result.hits.variance, delta=0.15 * result.hits.variance)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,216 @@
+"""
+Tests unitarios para el log de combate estructurado.
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+from src.combat_log import CombatLog, CombatLogView, LogRecord, format_attack_message
+from src.combat_system import CombatSystem, Character
+from src.weapons import Sword
+from src.damage_calculator import MockDamageCalculator
+
+
+class TestCombatLog(unittest.TestCase):
+    """Tests para CombatLog."""
+    
+    def test_append_stores_structured_record(self):
+        """Verifica que el log guarda registros estructurados."""
+        log = CombatLog()
+        sequence = log.append("Hero", 5, "Orc", 3, "Sword", 42)
+        
+        self.assertEqual(sequence, 0)
+        self.assertEqual(len(log), 1)
+        self.assertEqual(log.record(0), LogRecord(0, "Hero", 5, "Orc", 3, "Sword", 42))
+    
+    def test_messages_are_rendered_on_read(self):
+        """Verifica que el texto coincide con el formato original."""
+        log = CombatLog()
+        log.append("Hero", 5, "Orc", 3, "Sword", 42)
+        log.append("Orc", 3, "Hero", 5, "Bow", 7)
+        
+        expected = [
+            "Hero (Lvl 5) atacó a Orc (Lvl 3) con Sword causando 42 daño",
+            "Orc (Lvl 3) atacó a Hero (Lvl 5) con Bow causando 7 daño",
+        ]
+        self.assertEqual(list(log), expected)
+        self.assertEqual(log[-1], expected[1])
+        self.assertEqual(log[0:1], expected[:1])
+        self.assertEqual(log.copy(), expected)
+    
+    def test_names_are_interned(self):
+        """Verifica que cada nombre se guarda una sola vez."""
+        log = CombatLog()
+        for _ in range(10):
+            log.append("Hero", 5, "Orc", 3, "Sword", 1)
+        
+        self.assertEqual(log.name(0), "Hero")
+        self.assertEqual(len(log._names), 3)
+    
+    def test_clear_keeps_sequence_advancing(self):
+        """Verifica que limpiar el log no reinicia la secuencia."""
+        log = CombatLog()
+        log.append("Hero", 5, "Orc", 3, "Sword", 1)
+        log.clear()
+        
+        self.assertEqual(len(log), 0)
+        self.assertEqual(log.append("Hero", 5, "Orc", 3, "Sword", 1), 1)
+        with self.assertRaises(IndexError):
+            log.record(1)
+
+
+class TestBoundedCombatLog(unittest.TestCase):
+    """Tests para el log circular con capacidad fija."""
+    
+    def test_ring_buffer_evicts_oldest(self):
+        """Verifica que el buffer circular descarta los registros más antiguos."""
+        log = CombatLog(capacity=3)
+        for damage in range(5):
+            log.append("Hero", 5, "Orc", 3, "Sword", damage)
+        
+        self.assertEqual(len(log), 3)
+        self.assertEqual(log.evicted, 2)
+        self.assertEqual([record.damage for record in log.records()], [2, 3, 4])
+        self.assertEqual(log.record(0).sequence, 2)
+        self.assertEqual(log[-1], "Hero (Lvl 5) atacó a Orc (Lvl 3) con Sword causando 4 daño")
+    
+    def test_ring_buffer_clear(self):
+        """Verifica que el buffer circular se puede limpiar y reutilizar."""
+        log = CombatLog(capacity=2)
+        for damage in range(3):
+            log.append("Hero", 5, "Orc", 3, "Sword", damage)
+        log.clear()
+        log.append("Hero", 5, "Orc", 3, "Sword", 9)
+        
+        self.assertEqual([record.damage for record in log.records()], [9])
+    
+    def test_spill_writes_evicted_segments(self):
+        """Verifica que los registros desalojados se vuelcan al archivo."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "spill.log")
+            with CombatLog(capacity=4, spill_path=path, spill_segment=2) as log:
+                log.append("Hero", 5, "Orc", 3, "Sword", 0)
+                handles = set()
+                for damage in range(1, 7):
+                    log.append("Hero", 5, "Orc", 3, "Sword", damage)
+                    handles.add(log._spill_file)
+                
+                with open(path, encoding="utf-8") as spill:
+                    lines = spill.read().splitlines()
+            
+            # Un solo archivo abierto para todos los segmentos, cerrado al salir
+            handles.discard(None)
+            self.assertEqual(len(handles), 1)
+            self.assertTrue(next(iter(handles)).closed)
+            self.assertIsNone(log._spill_file)
+            self.assertEqual(len(lines), 4)
+            self.assertTrue(lines[0].endswith("causando 0 daño"))
+            self.assertTrue(lines[3].endswith("causando 3 daño"))
+            self.assertEqual([record.damage for record in log.records()], [4, 5, 6])
+    
+    def test_unique_names_do_not_grow_memory(self):
+        """Verifica que los nombres huérfanos se compactan."""
+        log = CombatLog(capacity=10)
+        for index in range(5000):
+            log.append(f"Mob {index}", 1, "Hero", 5, "Claw", 1)
+        
+        self.assertLessEqual(len(log._names), 6 * 10 + 1024)
+        self.assertEqual(log.record(-1).attacker, "Mob 4999")
+        self.assertEqual(log.record(0).attacker, "Mob 4990")
+    
+    def test_combat_system_closes_spill_file(self):
+        """Verifica que cerrar el sistema de combate cierra el archivo de volcado del log."""
+        with tempfile.TemporaryDirectory() as directory:
+            log = CombatLog(capacity=2, spill_path=os.path.join(directory, "spill.log"))
+            with CombatSystem(MockDamageCalculator(fixed_damage=1), log) as combat:
+                for _ in range(4):
+                    combat.attack(Character("Hero", 100, 5), Character("Orc", 100, 3), Sword())
+                spill_file = log._spill_file
+                self.assertFalse(spill_file.closed)
+            
+            self.assertTrue(spill_file.closed)
+            self.assertIsNone(log._spill_file)
+    
+    def test_invalid_configuration(self):
+        """Verifica que se rechazan configuraciones inválidas."""
+        with self.assertRaises(ValueError):
+            CombatLog(capacity=0)
+        with self.assertRaises(ValueError):
+            CombatLog(spill_path="spill.log")
+    
+    def test_view_reflects_log_without_copying(self):
+        """Verifica que la vista refleja el log sin copiarlo."""
+        log = CombatLog(capacity=2)
+        view = log.view()
+        self.assertIsInstance(view, CombatLogView)
+        
+        log.append("Hero", 5, "Orc", 3, "Sword", 1)
+        self.assertEqual(len(view), 1)
+        log.append("Hero", 5, "Orc", 3, "Sword", 2)
+        log.append("Hero", 5, "Orc", 3, "Sword", 3)
+        
+        self.assertEqual(len(view), 2)
+        self.assertTrue(view[0].endswith("causando 2 daño"))
+        self.assertEqual([record.damage for record in view.records()], [2, 3])
+
+
+class TestCombatSystemLog(unittest.TestCase):
+    """Tests de integración del log con CombatSystem."""
+    
+    def test_attack_message_matches_log(self):
+        """Verifica que el mensaje del resultado coincide con el log."""
+        combat = CombatSystem(MockDamageCalculator(fixed_damage=20))
+        attacker = Character("Hero", 100, 5)
+        defender = Character("Orc", 100, 3)
+        
+        result = combat.attack(attacker, defender, Sword())
+        
+        expected = "Hero (Lvl 5) atacó a Orc (Lvl 3) con Sword causando 20 daño"
+        self.assertIn("message", result)
+        self.assertEqual(result["message"], expected)
+        self.assertEqual(result.get("message"), expected)
+        self.assertEqual(combat.get_combat_log(), [expected])
+    
+    def test_attack_result_formats_message_on_demand(self):
+        """Verifica que attack() no arma el mensaje hasta que se consulta y se lee como un dict."""
+        combat = CombatSystem(MockDamageCalculator(fixed_damage=20))
+        with mock.patch("src.combat_system.format_attack_message",
+                        wraps=format_attack_message) as formatter:
+            result = combat.attack(Character("Hero", 100, 5), Character("Orc", 100, 3), Sword())
+            self.assertIn("message", result)
+            self.assertEqual(result["damage"], 20)
+            self.assertEqual(formatter.call_count, 0)
+            
+            expected = "Hero (Lvl 5) atacó a Orc (Lvl 3) con Sword causando 20 daño"
+            self.assertEqual(result["message"], expected)
+            self.assertEqual(formatter.call_count, 1)
+        
+        self.assertEqual(len(result), 8)
+        self.assertEqual(result, dict(result))
+        self.assertEqual(dict(result), result.to_dict())
+        self.assertNotIn("extra", result)
+        with self.assertRaises(KeyError):
+            result["extra"]
+        with self.assertRaises(TypeError):
+            result["damage"] = 1
+        
+        dead = combat.attack(Character("Hero", 100, 5), Character("Orc", 0, 3), Sword())
+        self.assertEqual(dead, {"success": False, "message": "Orc ya está muerto"})
+        
+        fast = combat.attack_fast(Character("Hero", 100, 5), Character("Orc", 100, 3), Sword())
+        self.assertEqual(fast, result)
+    
+    def test_injected_bounded_log(self):
+        """Verifica que se puede inyectar un log con capacidad fija."""
+        combat = CombatSystem(MockDamageCalculator(fixed_damage=1), CombatLog(capacity=2))
+        attacker = Character("Hero", 100, 5)
+        defender = Character("Orc", 100, 3)
+        for _ in range(5):
+            combat.attack(attacker, defender, Sword())
+        
+        self.assertEqual(len(combat.get_combat_log()), 2)
+        self.assertEqual(len(combat.view_combat_log()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
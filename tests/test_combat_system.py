@@ -4,10 +4,10 @@ Demuestra el uso de inyección de dependencias y mocks.
 """
 import unittest
 from unittest.mock import Mock, MagicMock
-from src.combat_system import CombatSystem, Character
+from src.combat_system import AttackResult, CombatSystem, Character
 from src.weapons import Sword, DummyWeapon
 from src.damage_calculator import StandardDamageCalculator, MockDamageCalculator
-from src.armor_system import LeatherArmor, DummyArmor
+from src.armor_system import LeatherArmor, PlateArmor, MagicShield, DummyArmor
 
 
 class TestCharacter(unittest.TestCase):
@@ -232,5 +232,220 @@ class TestCombatWithArmor(unittest.TestCase):
         self.assertEqual(defender.current_health, 60)
 
 
+class TestAttackBatch(unittest.TestCase):
+    """Tests para la resolución de ataques en lote."""
+    
+    def _build_party(self):
+        return [
+            Character("Knight", 300, 10, armor=PlateArmor()),
+            Character("Archer", 120, 7, armor=LeatherArmor()),
+            Character("Mage", 90, 12, armor=MagicShield(mana=80)),
+            Character("Goblin", 40, 3),
+        ]
+    
+    def test_batch_matches_sequential_attacks(self):
+        """Verifica que el lote produce lo mismo que atacar en orden."""
+        attackers = [0, 1, 2, 3, 0, 2, 1, 0, 3, 2, 0, 1]
+        defenders = [3, 2, 0, 1, 1, 3, 0, 2, 2, 1, 3, 2]
+        damages = [50, 40, 70, 10, 55, 30, 45, 60, 5, 80, 25, 35]
+        
+        sequential = self._build_party()
+        combat = CombatSystem(StandardDamageCalculator())
+        weapon_damages = iter(damages)
+        expected = []
+        expected_health = []
+        for a, d in zip(attackers, defenders):
+            result = combat.attack(sequential[a], sequential[d], DummyWeapon(next(weapon_damages)))
+            expected.append(result["damage"] if result["success"] else 0)
+            expected_health.append(sequential[d].current_health)
+        
+        batched = self._build_party()
+        health = []
+        results = CombatSystem(StandardDamageCalculator()).attack_batch(
+            batched, attackers, defenders, damages, health
+        )
+        
+        self.assertEqual(results, expected)
+        self.assertEqual(health, expected_health)
+        self.assertEqual(
+            [c.current_health for c in batched],
+            [c.current_health for c in sequential]
+        )
+        self.assertEqual(batched[0].armor._durability, sequential[0].armor._durability)
+        self.assertEqual(batched[2].armor.get_mana(), sequential[2].armor.get_mana())
+    
+    def test_batch_skips_dead_characters(self):
+        """Verifica que los muertos no atacan ni reciben daño en el lote."""
+        party = [Character("Hero", 100, 5), Character("Slime", 10, 1)]
+        combat = CombatSystem(StandardDamageCalculator())
+        
+        results = combat.attack_batch(party, [0, 0, 1], [1, 1, 0], [50, 50, 50])
+        
+        self.assertEqual(results, [70, 0, 0])
+        self.assertEqual(party[1].current_health, 0)
+        self.assertEqual(party[0].current_health, 100)
+    
+    def test_batch_uses_injected_calculator(self):
+        """Verifica que otros calculadores se usan ataque a ataque."""
+        calculator = MockDamageCalculator(fixed_damage=7)
+        combat = CombatSystem(calculator)
+        party = [Character("Hero", 100, 5), Character("Orc", 100, 5)]
+        
+        results = combat.attack_batch(party, [0, 1], [1, 0], [20, 30])
+        
+        self.assertEqual(results, [7, 7])
+        self.assertEqual(calculator.call_count, 2)
+        self.assertEqual(calculator.last_base_damage, 30)
+    
+    def test_batch_calls_overridden_take_damage_and_skips_log(self):
+        """Verifica que el lote respeta take_damage redefinido y no escribe en el log."""
+        class Stoneskin(Character):
+            def take_damage(self, damage):
+                return super().take_damage(damage // 2)
+        
+        def build():
+            return [Character("Hero", 100, 5), Stoneskin("Golem", 200, 5, armor=LeatherArmor())]
+        
+        sequential = build()
+        reference = CombatSystem(StandardDamageCalculator())
+        expected = [reference.attack(sequential[a], sequential[d], DummyWeapon(40))["damage"]
+                    for a, d in ((0, 1), (1, 0), (0, 1))]
+        
+        batched = build()
+        combat = CombatSystem(StandardDamageCalculator())
+        results = combat.attack_batch(batched, [0, 1, 0], [1, 0, 1], [40, 40, 40])
+        
+        self.assertEqual(results, expected)
+        self.assertEqual([c.current_health for c in batched],
+                         [c.current_health for c in sequential])
+        self.assertEqual(batched[1].armor._durability, sequential[1].armor._durability)
+        self.assertEqual(len(reference.get_combat_log()), 3)
+        self.assertEqual(combat.get_combat_log(), [])
+    
+    def test_batch_requires_same_length(self):
+        """Verifica que los arreglos deben tener la misma longitud."""
+        combat = CombatSystem(StandardDamageCalculator())
+        party = [Character("Hero", 100, 5)]
+        
+        with self.assertRaises(ValueError):
+            combat.attack_batch(party, [0], [0, 0], [10])
+
+
+class TestAttackMany(unittest.TestCase):
+    """Tests para los ataques de área."""
+    
+    def _build_horde(self):
+        horde = [Character(f"Goblin{i}", 60 + i * 10, 1 + i % 3) for i in range(8)]
+        horde[1].equip_armor(LeatherArmor())
+        horde[4].equip_armor(MagicShield(mana=40))
+        horde[6].current_health = 0
+        # Un defensor repetido recibe el golpe dos veces, como con attack()
+        return horde + [horde[0], horde[0]]
+    
+    def test_matches_sequential_attacks(self):
+        """Verifica que el daño, la vida y el log coinciden con attack() en orden."""
+        sequential = self._build_horde()
+        sequential_combat = CombatSystem(StandardDamageCalculator())
+        expected = []
+        for defender in sequential:
+            result = sequential_combat.attack(Character("Dragon", 500, 4), defender, Sword(30))
+            expected.append(result["damage"] if result["success"] else None)
+        
+        horde = self._build_horde()
+        combat = CombatSystem(StandardDamageCalculator())
+        result = combat.attack_many(Character("Dragon", 500, 4), horde, Sword(30))
+        
+        self.assertTrue(result["success"])
+        self.assertEqual(result["damages"], expected)
+        self.assertEqual(result["hits"], sum(d is not None for d in expected))
+        self.assertEqual(result["total_damage"], sum(d for d in expected if d is not None))
+        self.assertEqual([c.current_health for c in horde], [c.current_health for c in sequential])
+        self.assertEqual(combat.get_combat_log(), sequential_combat.get_combat_log())
+        self.assertIn("Goblin0", result["killed"])
+        self.assertIsNone(result["damages"][-1])
+    
+    def test_deterministic_calculator_runs_once_per_level(self):
+        """Verifica que el calculador se evalúa una vez por nivel de defensor."""
+        calculator = StandardDamageCalculator()
+        calculator.calculate_damage = Mock(wraps=calculator.calculate_damage)
+        horde = [Character(f"Rat{i}", 1000, 1 + i % 2) for i in range(50)]
+        weapon = Mock(wraps=Sword())
+        
+        CombatSystem(calculator).attack_many(Character("Hero", 100, 5), horde, weapon)
+        
+        self.assertEqual(calculator.calculate_damage.call_count, 2)
+        self.assertEqual(weapon.get_damage.call_count, 1)
+    
+    def test_random_calculator_runs_per_hit(self):
+        """Verifica que un calculador no determinista se evalúa en cada golpe."""
+        calculator = MockDamageCalculator(fixed_damage=5)
+        horde = [Character(f"Rat{i}", 100, 1) for i in range(4)]
+        
+        CombatSystem(calculator).attack_many(Character("Hero", 100, 5), horde, Sword())
+        
+        self.assertEqual(calculator.call_count, 4)
+    
+    def test_dead_attacker(self):
+        """Verifica que un atacante muerto no golpea a nadie."""
+        attacker = Character("Ghost", 100, 5)
+        attacker.current_health = 0
+        combat = CombatSystem(StandardDamageCalculator())
+        
+        result = combat.attack_many(attacker, [Character("Rat", 10, 1)], Sword())
+        
+        self.assertFalse(result["success"])
+        self.assertEqual(combat.get_combat_log(), [])
+
+
+class TestAttackFast(unittest.TestCase):
+    """Tests para el camino rápido con AttackResult."""
+    
+    def test_matches_attack(self):
+        """Verifica que attack_fast aplica el mismo daño, log y resultado que attack()."""
+        reference = CombatSystem(StandardDamageCalculator())
+        reference_defender = Character("Knight", 200, 3, armor=PlateArmor())
+        combat = CombatSystem(StandardDamageCalculator())
+        defender = Character("Knight", 200, 3, armor=PlateArmor())
+        out = AttackResult()
+        
+        for _ in range(12):
+            expected = reference.attack(Character("Hero", 100, 5), reference_defender, Sword())
+            result = combat.attack_fast(Character("Hero", 100, 5), defender, Sword(), out=out)
+            self.assertIs(result, out)
+            self.assertEqual(result.to_dict(), expected)
+            self.assertEqual(result.message, expected["message"])
+        
+        self.assertEqual(defender.current_health, reference_defender.current_health)
+        self.assertEqual(combat.get_combat_log(), reference.get_combat_log())
+    
+    def test_failed_attacks(self):
+        """Verifica los mensajes de ataques con atacante o defensor muerto."""
+        combat = CombatSystem(StandardDamageCalculator())
+        ghost = Character("Ghost", 100, 5)
+        ghost.current_health = 0
+        corpse = Character("Corpse", 100, 5)
+        corpse.current_health = 0
+        alive = Character("Hero", 100, 5)
+        
+        for attacker, defender in ((ghost, alive), (alive, corpse), (ghost, corpse)):
+            with self.subTest(attacker=attacker.name, defender=defender.name):
+                expected = CombatSystem(StandardDamageCalculator()).attack(attacker, defender, Sword())
+                result = combat.attack_fast(attacker, defender, Sword())
+                self.assertFalse(result.success)
+                self.assertEqual(result.to_dict(), expected)
+        self.assertEqual(combat.get_combat_log(), [])
+    
+    def test_hooks_still_receive_attacks(self):
+        """Verifica que con oyentes activos attack_fast pasa por el camino instrumentado."""
+        combat = CombatSystem(StandardDamageCalculator())
+        hook = Mock()
+        combat.add_hook(hook)
+        
+        result = combat.attack_fast(Character("Hero", 100, 5), Character("Orc", 100, 5), Sword())
+        
+        self.assertTrue(result.success)
+        self.assertEqual(hook.after_attack.call_args[0][3]["damage"], result.damage)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
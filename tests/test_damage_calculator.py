@@ -0,0 +1,98 @@
+"""
+Tests unitarios para las tablas de los calculadores de daño.
+"""
+import unittest
+from src.damage_calculator import (
+    StandardDamageCalculator, CriticalDamageCalculator, LEVEL_DIFF_RANGE
+)
+
+
+class _FixedRandom:
+    """Fuente aleatoria que siempre retorna el mismo valor."""
+    
+    def __init__(self, value: float):
+        self.value = value
+    
+    def random(self) -> float:
+        return self.value
+
+
+def _reference_damage(base_damage, attacker_level, defender_level, critical=False,
+                      crit_multiplier=2.0):
+    """Fórmula original, sin tablas."""
+    multiplier = 1 + ((attacker_level - defender_level) * 0.1)
+    if critical:
+        multiplier *= crit_multiplier
+    return max(1, int(base_damage * multiplier))
+
+
+class TestStandardDamageTables(unittest.TestCase):
+    """Tests para las tablas del calculador estándar."""
+    
+    def test_tables_match_formula(self):
+        """Verifica que la tabla reproduce la fórmula en todo su rango y fuera de él."""
+        calculator = StandardDamageCalculator()
+        for level_difference in range(-LEVEL_DIFF_RANGE - 5, LEVEL_DIFF_RANGE + 6):
+            for base_damage in (1, 7, 33, 50, 999):
+                self.assertEqual(
+                    calculator.calculate_damage(base_damage, level_difference, 0),
+                    _reference_damage(base_damage, level_difference, 0)
+                )
+    
+    def test_damage_cache_is_bounded(self):
+        """Verifica que el LRU de daño final respeta su tamaño."""
+        calculator = StandardDamageCalculator(damage_cache_size=4)
+        for base_damage in range(10):
+            self.assertEqual(calculator.calculate_damage(base_damage, 5, 3),
+                             _reference_damage(base_damage, 5, 3))
+        calculator.calculate_damage(9, 5, 3)
+        
+        info = calculator.damage_cache_info()
+        self.assertEqual(info.currsize, 4)
+        self.assertEqual(info.hits, 1)
+        self.assertIsNone(StandardDamageCalculator().damage_cache_info())
+    
+    def test_batch_reads_same_tables(self):
+        """Verifica que el lote coincide con la ruta escalar, con y sin LRU."""
+        args = [(50, 10, 5), (1, 1, 20), (30, 400, 4), (12, 3, 3)]
+        for calculator in (StandardDamageCalculator(), StandardDamageCalculator(16)):
+            self.assertEqual(
+                calculator.calculate_damage_batch(*zip(*args)),
+                [_reference_damage(*arg) for arg in args]
+            )
+
+
+class TestCriticalDamageTables(unittest.TestCase):
+    """Tests para las tablas del calculador con críticos."""
+    
+    def test_tables_match_formula(self):
+        """Verifica golpes normales y críticos contra la fórmula original."""
+        normal = CriticalDamageCalculator(crit_multiplier=2.5, rng=_FixedRandom(0.99))
+        critical = CriticalDamageCalculator(crit_multiplier=2.5, rng=_FixedRandom(0.0))
+        for level_difference in (-150, -20, -3, 0, 2, 4, 60, 150):
+            self.assertEqual(normal.calculate_damage(47, level_difference, 0),
+                             _reference_damage(47, level_difference, 0))
+            self.assertEqual(critical.calculate_damage(47, level_difference, 0),
+                             _reference_damage(47, level_difference, 0, True, 2.5))
+    
+    def test_crit_chance_table(self):
+        """Verifica la probabilidad de crítico leída de la tabla."""
+        calculator = CriticalDamageCalculator(rng=_FixedRandom(0.25))
+        
+        calculator.calculate_damage(50, 5, 5)
+        self.assertFalse(calculator.last_was_critical)  # 10%
+        calculator.calculate_damage(50, 9, 5)
+        self.assertTrue(calculator.last_was_critical)  # 30%
+    
+    def test_changing_multiplier_invalidates_tables(self):
+        """Verifica que cambiar crit_multiplier reconstruye las tablas."""
+        calculator = CriticalDamageCalculator(crit_multiplier=2.0, rng=_FixedRandom(0.0))
+        self.assertEqual(calculator.calculate_damage(50, 5, 5), 100)
+        
+        calculator.crit_multiplier = 3.0
+        self.assertEqual(calculator.calculate_damage(50, 5, 5), 150)
+        self.assertEqual(calculator.calculate_damage_batch([50], [5], [5]), [150])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
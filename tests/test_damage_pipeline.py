@@ -0,0 +1,148 @@
+"""
+Tests unitarios para el pipeline de daño fusionado.
+"""
+import unittest
+from itertools import product
+from src.armor_system import LeatherArmor, PlateArmor, MagicShield, EnchantedArmor, DummyArmor
+from src.character_table import CharacterTable
+from src.combat_system import Character
+from src.damage_calculator import (
+    StandardDamageCalculator, CriticalDamageCalculator, MockDamageCalculator
+)
+from src.damage_pipeline import Buff, DamagePipeline, DamageStage, Resistance
+from src.item_catalog import ItemCatalog
+from src.rng import BufferedRandom
+from src.weapons import Sword
+
+
+ARMORS = {
+    "none": lambda rng: None,
+    "leather": lambda rng: LeatherArmor(),
+    "plate": lambda rng: PlateArmor(),
+    "magic_shield": lambda rng: MagicShield(mana=60),
+    "enchanted": lambda rng: EnchantedArmor(rng=rng),
+    "dummy": lambda rng: DummyArmor(),
+}
+
+CALCULATORS = {
+    "standard": lambda rng: StandardDamageCalculator(),
+    "standard_cached": lambda rng: StandardDamageCalculator(damage_cache_size=16),
+    "critical": lambda rng: CriticalDamageCalculator(rng=rng),
+    "mock": lambda rng: MockDamageCalculator(fixed_damage=33),
+}
+
+
+def _armor_state(armor):
+    if armor is None:
+        return None
+    state = dict(vars(armor))
+    state.pop("rng", None)
+    return state
+
+
+class LoggedCharacter(Character):
+    """Personaje que redefine take_damage."""
+    
+    def take_damage(self, damage: int) -> int:
+        self.hits = getattr(self, "hits", 0) + 1
+        return super().take_damage(damage)
+
+
+class TestDamagePipeline(unittest.TestCase):
+    """Tests de equivalencia con la ruta de métodos y de etapas."""
+    
+    def _pair(self, calculator_name, armor_name, seed=5):
+        """Retorna (calculador, defensor) dos veces con las mismas fuentes aleatorias."""
+        built = []
+        for _ in range(2):
+            rng = BufferedRandom(seed)
+            calculator = CALCULATORS[calculator_name](rng)
+            defender = Character("Target", 100_000, 6, armor=ARMORS[armor_name](rng))
+            built.append((calculator, defender))
+        return built
+    
+    def test_matches_method_path(self):
+        """Verifica que cada combinación produce el mismo daño y estado que los métodos"""
+        attackers = [Character(f"A{level}", 100, level) for level in (1, 6, 12, 150)]
+        # Una etapa neutra lleva a la ruta con el cálculo en su propio paso
+        for stages, calculator_name, armor_name in product(((), (DamageStage(),)), CALCULATORS,
+                                                            ARMORS):
+            with self.subTest(calculator=calculator_name, armor=armor_name, staged=bool(stages)):
+                (calculator, defender), (reference_calculator, reference) = self._pair(
+                    calculator_name, armor_name)
+                pipeline = DamagePipeline(calculator, stages)
+                for i in range(300):
+                    attacker = attackers[i % len(attackers)]
+                    base_damage = (i * 37) % 120
+                    expected = reference.take_damage(reference_calculator.calculate_damage(
+                        base_damage, attacker.level, reference.level))
+                    self.assertEqual(pipeline.resolve(attacker, defender, base_damage), expected)
+                self.assertEqual(defender.current_health, reference.current_health)
+                self.assertEqual(_armor_state(defender.armor), _armor_state(reference.armor))
+                self.assertEqual(getattr(calculator, "last_was_critical", None),
+                                 getattr(reference_calculator, "last_was_critical", None))
+    
+    def test_health_is_clamped(self):
+        """Verifica que la vida no baja de 0"""
+        pipeline = DamagePipeline(StandardDamageCalculator())
+        defender = Character("Rat", 10, 1)
+        self.assertEqual(pipeline.attack(Character("Hero", 100, 5), defender, Sword()), 70)
+        self.assertEqual(defender.current_health, 0)
+    
+    def test_catalog_armor_and_table_views(self):
+        """Verifica que funciona con armaduras del catálogo y vistas de CharacterTable"""
+        catalog = ItemCatalog()
+        catalog.add_armor("heavy", "Heavy Plate", "plate", defense=50, durability=7)
+        table = CharacterTable()
+        row = table.add("Knight", 1000, 4, catalog.create_armor("heavy"))
+        reference = Character("Knight", 1000, 4, catalog.create_armor("heavy"))
+        pipeline = DamagePipeline(StandardDamageCalculator())
+        calculator = StandardDamageCalculator()
+        attacker = Character("Orc", 100, 5)
+        for _ in range(6):
+            expected = reference.take_damage(calculator.calculate_damage(50, 5, 4))
+            self.assertEqual(pipeline.resolve(attacker, table[row], 50), expected)
+        self.assertEqual(table.health[row], reference.current_health)
+    
+    def test_custom_take_damage_is_called(self):
+        """Verifica que un defensor que redefine take_damage la sigue recibiendo"""
+        pipeline = DamagePipeline(StandardDamageCalculator())
+        defender = LoggedCharacter("Spy", 500, 3, armor=LeatherArmor())
+        pipeline.resolve(Character("Hero", 100, 3), defender, 40)
+        self.assertEqual(defender.hits, 1)
+        self.assertEqual(defender.current_health, 500 - 32)
+    
+    def test_stages_run_between_calculator_and_armor(self):
+        """Verifica que las etapas se aplican en orden antes de la armadura"""
+        pipeline = DamagePipeline(StandardDamageCalculator()).with_stages(Buff(1.5), Resistance(0.25))
+        defender = Character("Knight", 1000, 5, armor=PlateArmor())
+        damage = pipeline.resolve(Character("Hero", 100, 5), defender, 40)
+        buffed = int(40 * 1.5)
+        resisted = buffed - int(buffed * 0.25)
+        self.assertEqual(damage, resisted - int(resisted * PlateArmor.ABSORPTION_RATE))
+        
+        seen = []
+        def record(damage, attacker, defender):
+            seen.append((damage, attacker.name, defender.name))
+            return damage + 1
+        pipeline = DamagePipeline(StandardDamageCalculator(), [record])
+        self.assertEqual(pipeline.resolve(Character("Hero", 100, 5), Character("Rat", 100, 5), 40), 41)
+        self.assertEqual(seen, [(40, "Hero", "Rat")])
+    
+    def test_critical_follows_rng_replacement(self):
+        """Verifica que cambiar la fuente aleatoria del calculador se respeta"""
+        calculator = CriticalDamageCalculator(rng=BufferedRandom(1))
+        pipeline = DamagePipeline(calculator)
+        defender = Character("Rat", 10_000, 5)
+        pipeline.resolve(Character("Hero", 100, 5), defender, 10)
+        
+        class AlwaysCritical:
+            def random(self):
+                return 0.0
+        calculator.rng = AlwaysCritical()
+        self.assertEqual(pipeline.resolve(Character("Hero", 100, 5), defender, 10), 20)
+        self.assertTrue(calculator.last_was_critical)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""
+Tests unitarios para el catálogo de objetos.
+"""
+import io
+import json
+import os
+import pickle
+import tempfile
+import unittest
+from src.armor_system import LeatherArmor, PlateArmor, MagicShield, EnchantedArmor
+from src.character_table import ARMOR_PLATE, armor_kind_of
+from src.combat_system import Character, CombatSystem
+from src.damage_calculator import StandardDamageCalculator
+from src.interfaces import Weapon
+from src.item_catalog import ItemCatalog, WeaponTemplate, max_durability
+from src.rng import BufferedRandom
+from src.snapshot import restore, snapshot
+from src.weapons import MagicStaff
+
+
+CSV_TEXT = """type,id,name,damage,intelligence_bonus,kind,defense,durability,mana,reflect_chance
+weapon,staff,Oak Staff,60,10,,,,,
+weapon,sword,Short Sword,35,,,,,,
+armor,plate,Iron Plate,,,plate,40,120,,
+armor,shield,Ward,,,magic_shield,15,,50,
+armor,robe,Silk Robe,,,enchanted,,,,0.5
+"""
+
+
+class TestItemCatalog(unittest.TestCase):
+    """Tests de carga, búsqueda y plantillas compartidas."""
+    
+    def setUp(self):
+        self.catalog = ItemCatalog()
+        self.catalog.load_csv(io.StringIO(CSV_TEXT))
+    
+    def test_weapons_are_shared_templates(self):
+        """Verifica que el arma del catálogo es única por id y se comporta como las clásicas"""
+        staff = self.catalog.weapon("staff")
+        self.assertIs(self.catalog.weapon("staff"), staff)
+        self.assertIsInstance(staff, Weapon)
+        self.assertEqual(staff.get_damage(), MagicStaff().get_damage())
+        self.assertEqual(staff.get_name(), "Oak Staff")
+        self.assertEqual(self.catalog.weapon("sword").intelligence_bonus, 0)
+        with self.assertRaises(AttributeError):
+            staff.damage = 1
+    
+    def test_armor_instances_hold_only_wear_state(self):
+        """Verifica que cada armadura guarda su desgaste y comparte la plantilla"""
+        first = self.catalog.create_armor("plate")
+        second = self.catalog.create_armor("plate")
+        template = self.catalog.armor_template("plate")
+        self.assertIs(type(first), PlateArmor)
+        self.assertIs(first.template, template)
+        self.assertIs(second.template, template)
+        self.assertEqual(vars(first), {"_defense": 40, "_durability": 120, "_template": template,
+                                       "_name": "Iron Plate"})
+        self.assertEqual(first.get_defense(), 40)
+        self.assertEqual(first.get_name(), "Iron Plate")
+        self.assertEqual(max_durability(first), 120)
+        self.assertEqual(max_durability(PlateArmor()), PlateArmor.MAX_DURABILITY)
+        
+        first.absorb_damage(100)
+        self.assertEqual(first._durability, 120 - PlateArmor.DURABILITY_COST)
+        self.assertEqual(second._durability, 120)
+        
+        shield = self.catalog.create_armor("shield")
+        self.assertIs(type(shield), MagicShield)
+        self.assertEqual(shield.get_name(), "Ward")
+        self.assertEqual(shield.get_mana(), 50)
+        self.assertIsNone(max_durability(shield))
+        shield.recharge_mana(100)
+        self.assertEqual(shield._mana, 50)
+    
+    def test_armor_matches_classic_absorption(self):
+        """Verifica que una plantilla con valores por defecto absorbe igual que la clase base"""
+        catalog = ItemCatalog()
+        catalog.add_armor("leather", "Leather", "leather")
+        catalog.add_armor("robe", "Robe", "enchanted")
+        pairs = [
+            (catalog.create_armor("leather"), LeatherArmor()),
+            (catalog.create_armor("robe", rng=BufferedRandom(4)), EnchantedArmor(rng=BufferedRandom(4))),
+        ]
+        for armor, classic in pairs:
+            with self.subTest(armor=type(classic).__name__):
+                for damage in range(0, 400, 7):
+                    self.assertEqual(armor.absorb_damage(damage), classic.absorb_damage(damage))
+                self.assertEqual(armor._durability, classic._durability)
+    
+    def test_catalog_items_in_combat_and_snapshots(self):
+        """Verifica que los objetos del catálogo sirven en combate y en snapshots"""
+        knight = Character("Knight", 200, 5, armor=self.catalog.create_armor("plate"))
+        combat = CombatSystem(StandardDamageCalculator())
+        combat.attack(Character("Orc", 100, 5), knight, self.catalog.weapon("sword"))
+        self.assertEqual(armor_kind_of(knight.armor), ARMOR_PLATE)
+        
+        (restored,), _ = restore(snapshot([knight]))
+        self.assertEqual(restored.current_health, knight.current_health)
+        self.assertEqual(restored.armor.get_defense(), 40)
+        self.assertEqual(restored.armor._durability, knight.armor._durability)
+    
+    def test_armor_survives_snapshot_and_pickle(self):
+        """Verifica que la armadura del catálogo conserva su plantilla al restaurarse o copiarse"""
+        party = [
+            Character("Knight", 200, 5, armor=self.catalog.create_armor("plate")),
+            Character("Mage", 150, 5, armor=self.catalog.create_armor("shield")),
+            Character("Monk", 150, 5, armor=self.catalog.create_armor("robe")),
+            Character("Squire", 100, 2, armor=PlateArmor()),
+            Character("Peasant", 80, 1),
+        ]
+        party[0].armor.absorb_damage(30)
+        
+        for copies in (restore(snapshot(party))[0], pickle.loads(pickle.dumps(party))):
+            for copy, original in zip(copies, party):
+                with self.subTest(character=original.name):
+                    armor = copy.armor
+                    if original.armor is None:
+                        self.assertIsNone(armor)
+                        continue
+                    self.assertIs(type(armor), type(original.armor))
+                    self.assertEqual(armor.template, original.armor.template)
+                    self.assertEqual(armor.get_name(), original.armor.get_name())
+                    self.assertEqual(armor.get_defense(), original.armor.get_defense())
+                    self.assertEqual(vars(armor).keys(), vars(original.armor).keys())
+        self.assertEqual(max_durability(restore(snapshot(party))[0][0].armor), 120)
+    
+    def test_json_formats(self):
+        """Verifica la carga de JSON en lista de registros y en listas por tipo"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "items.json")
+            self.catalog.dump_json(path)
+            loaded = ItemCatalog()
+            self.assertEqual(loaded.load_json(path), len(self.catalog))
+        self.assertEqual(list(loaded.weapons()), list(self.catalog.weapons()))
+        self.assertEqual(list(loaded.armors()), list(self.catalog.armors()))
+        
+        records = [{"type": "weapon", "id": "bow", "name": "Bow", "damage": 40}]
+        catalog = ItemCatalog()
+        catalog.load_json(io.StringIO(json.dumps(records)))
+        self.assertEqual(catalog.weapon("bow"), WeaponTemplate("bow", "Bow", 40))
+    
+    def test_invalid_records(self):
+        """Verifica que se rechazan ids repetidos, tipos desconocidos y campos faltantes"""
+        with self.assertRaises(ValueError):
+            self.catalog.add_weapon("sword", "Again", 1)
+        with self.assertRaises(ValueError):
+            self.catalog.add_armor("cloak", "Cloak", "cloth")
+        with self.assertRaises(ValueError):
+            self.catalog.load_records([{"type": "weapon", "id": "x", "name": "X"}])
+        with self.assertRaises(ValueError):
+            self.catalog.load_records([{"type": "potion", "id": "p"}])
+        with self.assertRaises(KeyError):
+            self.catalog.weapon("missing")
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""
+Tests unitarios para las métricas del combate.
+"""
+import gc
+import threading
+import unittest
+import urllib.request
+from src.armor_system import LeatherArmor, MagicShield, PlateArmor
+from src.character_table import CharacterTable
+from src.combat_system import Character, CombatSystem
+from src.damage_calculator import StandardDamageCalculator
+from src.damage_pipeline import DamagePipeline
+from src.metrics import CombatMetrics, Counter, Histogram, MetricsRegistry, MetricsServer
+from src.weapons import Sword
+
+
+class TestMetricTypes(unittest.TestCase):
+    """Tests de contadores e histogramas."""
+    
+    def test_counter_is_thread_safe(self):
+        """Verifica que no se pierden incrementos entre hilos."""
+        counter = Counter("hits_total", "Golpes")
+        by_kind = Counter("by_kind_total", "Golpes", ("kind",))
+        child = by_kind.labels("a")
+        
+        def work():
+            for _ in range(10_000):
+                counter.inc()
+                child.inc(2)
+        
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(counter.snapshot(), 40_000)
+        self.assertEqual(by_kind.value("a"), 80_000)
+    
+    def test_histogram_buckets(self):
+        """Verifica que los límites son inclusivos y el último intervalo es +Inf."""
+        histogram = Histogram("damage", "Daño", (10, 50))
+        for value in (0, 10, 11, 50, 51, 1000):
+            histogram.observe(value)
+        
+        snapshot = histogram.snapshot()
+        
+        self.assertEqual(snapshot["buckets"], {"10": 2, "50": 2, "+Inf": 2})
+        self.assertEqual(snapshot["count"], 6)
+        self.assertEqual(snapshot["sum"], 1122)
+    
+    def test_finished_threads_are_folded(self):
+        """Verifica que las celdas de los hilos terminados se suman a la base y se liberan."""
+        counter = Counter("hits_total", "Golpes")
+        histogram = Histogram("damage", "Daño", (10,))
+        
+        def work():
+            counter.inc(2)
+            histogram.observe(5)
+        
+        for _ in range(50):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+        gc.collect()
+        
+        self.assertEqual(counter.snapshot(), 100)
+        self.assertEqual(histogram.snapshot()["count"], 50)
+        self.assertEqual(len(counter._children[()]._cells), 0)
+        self.assertEqual(len(histogram._values._cells), 0)
+    
+    def test_prometheus_format(self):
+        """Verifica el texto exportado, con intervalos acumulados."""
+        registry = MetricsRegistry()
+        registry.counter("attacks_total", "Ataques").inc(3)
+        registry.counter("broken_total", "Rotas", ("armor",)).labels("Plate").inc()
+        histogram = registry.histogram("damage", "Daño", (10, 50))
+        histogram.observe(5)
+        histogram.observe(20)
+        
+        text = registry.render_prometheus()
+        
+        self.assertIn("# TYPE attacks_total counter\nattacks_total 3\n", text)
+        self.assertIn('broken_total{armor="Plate"} 1\n', text)
+        self.assertIn('damage_bucket{le="10.0"} 1\n', text)
+        self.assertIn('damage_bucket{le="50.0"} 2\n', text)
+        self.assertIn('damage_bucket{le="+Inf"} 2\n', text)
+        self.assertIn("damage_count 2\n", text)
+        with self.assertRaises(ValueError):
+            registry.counter("attacks_total", "Repetida")
+
+
+class TestCombatMetrics(unittest.TestCase):
+    """Tests de las métricas alimentadas por CombatSystem."""
+    
+    def setUp(self):
+        self.metrics = CombatMetrics()
+        self.combat = CombatSystem(StandardDamageCalculator())
+        self.combat.add_hook(self.metrics)
+    
+    def test_attacks_kills_and_damage(self):
+        """Verifica los contadores de ataques, muertes y fallidos."""
+        hero = Character("Hero", 100, 5)
+        slime = Character("Slime", 60, 5)
+        
+        self.combat.attack(hero, slime, Sword())
+        self.combat.attack(hero, slime, Sword())
+        self.combat.attack(hero, slime, Sword())
+        
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot["combat_attacks_total"], 2)
+        self.assertEqual(snapshot["combat_kills_total"], 1)
+        self.assertEqual(snapshot["combat_failed_attacks_total"], 1)
+        self.assertEqual(snapshot["combat_damage"]["sum"], 100)
+        self.assertEqual(snapshot["combat_attack_latency_seconds"]["count"], 3)
+    
+    def test_armor_breakage(self):
+        """Verifica que se cuenta una vez cada armadura que se agota."""
+        armor = LeatherArmor()
+        armor._durability = 2
+        knight = Character("Knight", 10_000, 5, armor=armor)
+        mage = Character("Mage", 10_000, 5, armor=MagicShield(mana=10))
+        hero = Character("Hero", 100, 5)
+        
+        for _ in range(5):
+            self.combat.attack(hero, knight, Sword())
+            self.combat.attack(hero, mage, Sword())
+        
+        self.assertTrue(armor.is_broken())
+        self.assertEqual(self.metrics.snapshot()["combat_armor_broken_total"],
+                         {"LeatherArmor": 1, "MagicShield": 1})
+    
+    def test_area_and_batch_attacks(self):
+        """Verifica que attack_many y attack_batch alimentan las mismas métricas que attack."""
+        armor = LeatherArmor()
+        armor._durability = 1
+        hero = Character("Hero", 100, 5)
+        slime = Character("Slime", 20, 5)
+        knight = Character("Knight", 10_000, 5, armor=armor)
+        
+        self.combat.attack_many(hero, [slime, knight, slime], Sword())
+        self.combat.attack_batch([hero, slime, knight], [0, 0], [2, 1], [10, 10])
+        table = CharacterTable()
+        table.add("Hero", 100, 5)
+        table.add("Orc", 5, 5)
+        self.combat.attack_batch(table, [0, 0], [1, 1], [10, 10])
+        
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot["combat_attacks_total"], 4)
+        self.assertEqual(snapshot["combat_failed_attacks_total"], 3)
+        self.assertEqual(snapshot["combat_kills_total"], 2)
+        self.assertEqual(snapshot["combat_damage"]["count"], 4)
+        self.assertEqual(snapshot["combat_armor_broken_total"], {"LeatherArmor": 1})
+        self.assertEqual(snapshot["combat_attack_latency_seconds"]["count"], 0)
+    
+    def test_instrument_counts_damage_outside_combat_system(self):
+        """Verifica que instrument() mide take_damage directo, DamagePipeline y los lotes."""
+        self.metrics.instrument()
+        self.addCleanup(self.metrics.uninstrument)
+        armor = PlateArmor()
+        armor._durability = 4
+        knight = Character("Knight", 10_000, 5, armor=armor)
+        peasant = Character("Peasant", 10, 1)
+        
+        knight.take_damage(100)
+        DamagePipeline(StandardDamageCalculator()).resolve(Character("Hero", 100, 5), knight, 100)
+        self.combat.attack_batch([knight, peasant], [0], [1], [100])
+        table = CharacterTable()
+        table.add("Hero", 100, 5)
+        table.add("Guard", 100, 5, LeatherArmor())
+        self.combat.attack_batch(table, [0], [1], [40])
+        self.combat.attack(Character("Hero", 100, 5), knight, Sword())
+        
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot["combat_damage_taken"]["count"], 5)
+        self.assertEqual(snapshot["combat_deaths_total"], 1)
+        absorbed = snapshot["combat_armor_absorbed_total"]
+        self.assertEqual((absorbed["PlateArmor"], absorbed["LeatherArmor"]), (100, 8))
+        self.assertEqual(snapshot["combat_armor_broken_total"], {"PlateArmor": 1})
+        self.assertEqual(snapshot["combat_attacks_total"], 3)
+        
+        self.metrics.uninstrument()
+        self.assertFalse(hasattr(Character.take_damage, "__wrapped__"))
+        self.assertFalse(hasattr(PlateArmor.absorb_damage, "__wrapped__"))
+        knight.take_damage(10)
+        self.assertEqual(self.metrics.snapshot()["combat_damage_taken"]["count"], 5)
+    
+    def test_http_endpoint(self):
+        """Verifica que /metrics sirve el texto de Prometheus."""
+        self.combat.attack(Character("Hero", 100, 5), Character("Orc", 100, 5), Sword())
+        with MetricsServer(self.metrics.registry) as server:
+            host, port = server.address
+            with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+                body = response.read().decode("utf-8")
+                content_type = response.headers["Content-Type"]
+        
+        self.assertIn("combat_attacks_total 1", body)
+        self.assertTrue(content_type.startswith("text/plain"))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+Tests unitarios para el perfilado y los oyentes de CombatSystem.
+"""
+import unittest
+from src.armor_system import PlateArmor
+from src.combat_system import Character, CombatSystem
+from src.damage_calculator import StandardDamageCalculator
+from src.interfaces import CombatHook
+from src.profiling import PHASES, AttackProfiler
+from src.weapons import Sword, Bow
+
+
+class RecordingHook(CombatHook):
+    """Oyente que guarda las llamadas recibidas."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def before_attack(self, attacker, defender, weapon):
+        self.calls.append(("before", attacker.name, defender.name))
+    
+    def after_attack(self, attacker, defender, weapon, result):
+        self.calls.append(("after", attacker.name, result["success"]))
+
+
+class TestProfiling(unittest.TestCase):
+    """Tests del perfilado por fases."""
+    
+    def setUp(self):
+        self.combat = CombatSystem(StandardDamageCalculator())
+        self.hero = Character("Hero", 100, 5)
+        self.knight = Character("Knight", 1000, 5, armor=PlateArmor())
+    
+    def test_disabled_by_default(self):
+        """Verifica que sin perfilado attack es el método normal."""
+        self.assertEqual(self.combat.attack.__func__, CombatSystem.attack)
+        self.assertEqual(self.combat.stats(), {})
+    
+    def test_phase_breakdown(self):
+        """Verifica los contadores y que las fases suman el total."""
+        profiler = self.combat.enable_profiling()
+        self.combat.attack(self.hero, self.knight, Sword())
+        self.combat.attack(self.hero, self.knight, Bow())
+        self.combat.attack(self.knight, self.hero, Sword())
+        
+        stats = self.combat.stats()
+        
+        self.assertIsInstance(profiler, AttackProfiler)
+        self.assertEqual(stats["attacks"], 3)
+        self.assertEqual(stats["failed"], 0)
+        self.assertEqual(stats["weapons"], {"Sword": 2, "Bow": 1})
+        self.assertEqual(stats["armors"], {"PlateArmor": 2, "None": 1})
+        self.assertEqual(stats["calculators"], {"StandardDamageCalculator": 3})
+        self.assertEqual(set(stats["phases"]), set(PHASES))
+        self.assertEqual(
+            sum(phase["total_ns"] for phase in stats["phases"].values()), stats["total_ns"]
+        )
+    
+    def test_results_match_normal_path(self):
+        """Verifica que la versión instrumentada da el mismo resultado y log."""
+        plain = CombatSystem(StandardDamageCalculator())
+        expected = plain.attack(Character("Hero", 100, 5),
+                                Character("Knight", 1000, 5, armor=PlateArmor()), Sword())
+        self.combat.enable_profiling()
+        
+        result = self.combat.attack(self.hero, self.knight, Sword())
+        
+        self.assertEqual(result, expected)
+        self.assertEqual(self.combat.get_combat_log(), plain.get_combat_log())
+    
+    def test_failed_attacks_and_disable(self):
+        """Verifica que los fallidos se cuentan y que desactivar conserva lo medido."""
+        self.combat.enable_profiling()
+        self.hero.current_health = 0
+        self.combat.attack(self.hero, self.knight, Sword())
+        self.combat.disable_profiling()
+        self.combat.attack(self.knight, self.hero, Sword())
+        
+        self.assertEqual(self.combat.attack.__func__, CombatSystem.attack)
+        self.assertEqual(self.combat.stats()["failed"], 1)
+        self.assertEqual(self.combat.stats()["attacks"], 1)
+
+
+class TestHooks(unittest.TestCase):
+    """Tests de los oyentes de ataques."""
+    
+    def test_hooks_receive_every_attack(self):
+        """Verifica el orden de las llamadas, incluidos los ataques fallidos."""
+        combat = CombatSystem(StandardDamageCalculator())
+        hook = RecordingHook()
+        combat.add_hook(hook)
+        hero = Character("Hero", 100, 5)
+        slime = Character("Slime", 10, 1)
+        
+        combat.attack(hero, slime, Sword())
+        combat.attack(hero, slime, Sword())
+        
+        self.assertEqual(hook.calls, [
+            ("before", "Hero", "Slime"), ("after", "Hero", True),
+            ("before", "Hero", "Slime"), ("after", "Hero", False),
+        ])
+        self.assertEqual(combat.stats(), {})
+        
+        combat.remove_hook(hook)
+        self.assertEqual(combat.attack.__func__, CombatSystem.attack)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
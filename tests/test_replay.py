@@ -0,0 +1,117 @@
+"""
+Tests unitarios para la grabación y reproducción de batallas.
+"""
+import os
+import random
+import tempfile
+import unittest
+from src.armor_system import LeatherArmor, PlateArmor, MagicShield, EnchantedArmor
+from src.combat_log import CombatLog
+from src.combat_system import Character, CombatSystem
+from src.damage_calculator import CriticalDamageCalculator, StandardDamageCalculator
+from src.replay import BattleRecorder, Recording, ReplayMismatchError, replay, state_hash
+from src.weapons import Sword, Bow
+
+
+class TestReplay(unittest.TestCase):
+    """Tests de BattleRecorder y replay."""
+    
+    def _record(self, turns=200, seed=11, checkpoint_interval=50, calculator=None):
+        party = [
+            Character("Knight", 400, 10, armor=PlateArmor()),
+            Character("Archer", 250, 7, armor=LeatherArmor()),
+            Character("Mage", 220, 12, armor=MagicShield(mana=80)),
+            Character("Paladin", 380, 9, armor=EnchantedArmor()),
+            Character("Goblin", 150, 3),
+        ]
+        combat = CombatSystem(calculator or CriticalDamageCalculator(), CombatLog())
+        recorder = BattleRecorder(party, combat, seed=seed,
+                                  checkpoint_interval=checkpoint_interval)
+        weapons = [Sword(), Bow()]
+        chooser = random.Random(seed)
+        states = [state_hash(party)]
+        for _ in range(turns):
+            attacker, defender = chooser.sample(party, 2)
+            recorder.attack(attacker, defender, chooser.choice(weapons))
+            states.append(state_hash(party))
+        return party, combat, recorder.finish(), states
+    
+    def test_replay_reproduces_final_state(self):
+        """Verifica que la reproducción llega al mismo estado sin registrar en el log"""
+        party, _, recording, _ = self._record()
+        characters, combat = replay(recording)
+        self.assertEqual(state_hash(characters), state_hash(party))
+        self.assertEqual([c.current_health for c in characters],
+                         [c.current_health for c in party])
+        self.assertEqual(len(combat.combat_log), 0)
+    
+    def test_recording_captures_draws_and_restores_sources(self):
+        """Verifica que se graban los números aleatorios y se devuelven las fuentes originales"""
+        party, combat, recording, _ = self._record(turns=50)
+        self.assertGreater(len(recording.draws), 0)
+        self.assertEqual(recording.turns, 50)
+        self.assertEqual(recording.meta["seed"], 11)
+        self.assertNotIn("Recording", type(combat.damage_calculator.rng).__name__)
+        self.assertNotIn("Recording", type(party[3].armor.rng).__name__)
+    
+    def test_seek_to_any_turn(self):
+        """Verifica que se puede saltar a cualquier turno usando los checkpoints"""
+        _, _, recording, states = self._record()
+        self.assertEqual([turn for turn, _, _ in recording.checkpoints], [50, 100, 150])
+        for turn in (0, 1, 49, 50, 51, 120, 150, 199, 200):
+            with self.subTest(turn=turn):
+                characters, _ = replay(recording, until_turn=turn)
+                self.assertEqual(state_hash(characters), states[turn])
+    
+    def test_seek_rejects_out_of_range(self):
+        """Verifica que un turno fuera de la grabación se rechaza"""
+        _, _, recording, _ = self._record(turns=10)
+        with self.assertRaises(ValueError):
+            replay(recording, until_turn=11)
+    
+    def test_roundtrip_through_file(self):
+        """Verifica que la grabación se guarda y se carga de un archivo"""
+        party, _, recording, states = self._record()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "battle.crpl")
+            recording.save(path)
+            loaded = Recording.load(path)
+        self.assertEqual(loaded.turns, recording.turns)
+        self.assertEqual(loaded.draws, recording.draws)
+        self.assertEqual(loaded.meta, recording.meta)
+        characters, _ = replay(loaded)
+        self.assertEqual(state_hash(characters), state_hash(party))
+        characters, _ = replay(loaded, until_turn=75)
+        self.assertEqual(state_hash(characters), states[75])
+    
+    def test_deterministic_calculator_records_no_calculator_draws(self):
+        """Verifica que con un calculador determinista solo se graban los números de armaduras"""
+        party, _, recording, _ = self._record(calculator=StandardDamageCalculator())
+        characters, _ = replay(recording)
+        self.assertEqual(state_hash(characters), state_hash(party))
+    
+    def test_tampered_recording_fails_verification(self):
+        """Verifica que una grabación alterada no pasa la verificación"""
+        _, _, recording, _ = self._record(turns=30, checkpoint_interval=0)
+        # Cambiar el arma del primer ataque altera el daño sin cambiar los números consumidos
+        recording.commands[2] = 1 - recording.commands[2]
+        with self.assertRaises(ReplayMismatchError):
+            replay(recording)
+        replay(recording, verify=False)
+    
+    def test_rejects_foreign_characters(self):
+        """Verifica que no se graban ataques de personajes ajenos a la batalla"""
+        hero = Character("Hero", 100, 5)
+        combat = CombatSystem(StandardDamageCalculator())
+        recorder = BattleRecorder([hero], combat)
+        with self.assertRaises(ValueError):
+            recorder.attack(hero, Character("Stranger", 100, 5), Sword())
+    
+    def test_rejects_foreign_data(self):
+        """Verifica que se rechazan datos que no son una grabación"""
+        with self.assertRaises(ReplayMismatchError):
+            Recording.from_bytes(b"XXXX" + bytes(20))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Tests unitarios para las fuentes aleatorias inyectables.
+"""
+import copy
+import pickle
+import random
+import unittest
+from src.armor_bank import EnchantedArmorBank
+from src.rng import BufferedRandom, RandomStreams, derive_seed, draw_many
+from src.damage_calculator import CriticalDamageCalculator, StandardDamageCalculator
+from src.armor_system import EnchantedArmor
+
+
+class TestBufferedRandom(unittest.TestCase):
+    """Tests para BufferedRandom."""
+    
+    def test_matches_plain_random_sequence(self):
+        """Verifica que produce la misma secuencia que random.Random."""
+        buffered = BufferedRandom(42, block_size=7)
+        plain = random.Random(42)
+        
+        self.assertEqual([buffered.random() for _ in range(30)],
+                         [plain.random() for _ in range(30)])
+    
+    def test_take_matches_scalar_draws(self):
+        """Verifica que take() consume el flujo igual que random()."""
+        scalar = BufferedRandom(5, block_size=4)
+        batched = BufferedRandom(5, block_size=4)
+        
+        expected = [scalar.random() for _ in range(11)]
+        values = [batched.random()] + batched.take(9) + [batched.random()]
+        
+        self.assertEqual(values, expected)
+        self.assertEqual(draw_many(batched, 0), [])
+    
+    def test_streams_are_reproducible_and_independent(self):
+        """Verifica que cada clave tiene su propio flujo reproducible."""
+        streams = RandomStreams(99)
+        
+        self.assertEqual(streams.stream("armor", 1).random(), streams.stream("armor", 1).random())
+        self.assertNotEqual(streams.stream("armor", 1).random(), streams.stream("armor", 2).random())
+        self.assertNotEqual(derive_seed(1, "a"), derive_seed(1, "b"))
+
+
+class TestInjectedRandomness(unittest.TestCase):
+    """Tests de calculadores y armaduras con azar inyectado."""
+    
+    def test_critical_calculator_is_reproducible(self):
+        """Verifica que la misma semilla produce los mismos golpes."""
+        first = CriticalDamageCalculator(rng=BufferedRandom(3))
+        second = CriticalDamageCalculator(rng=BufferedRandom(3))
+        
+        self.assertEqual([first.calculate_damage(50, 10, 5) for _ in range(50)],
+                         [second.calculate_damage(50, 10, 5) for _ in range(50)])
+    
+    def test_critical_batch_matches_scalar(self):
+        """Verifica que el lote y la ruta escalar coinciden con la misma semilla."""
+        scalar = CriticalDamageCalculator(crit_multiplier=3.0, rng=BufferedRandom(11))
+        batched = CriticalDamageCalculator(crit_multiplier=3.0, rng=BufferedRandom(11))
+        bases = [50, 20, 70, 5, 40] * 20
+        attackers = [10, 3, 7, 1, 9] * 20
+        defenders = [5, 3, 9, 1, 2] * 20
+        
+        expected = [scalar.calculate_damage(*args) for args in zip(bases, attackers, defenders)]
+        results = batched.calculate_damage_batch(bases, attackers, defenders)
+        
+        self.assertEqual(results, expected)
+        self.assertEqual(batched.last_was_critical, scalar.last_was_critical)
+    
+    def test_standard_batch_matches_scalar(self):
+        """Verifica el lote del calculador estándar."""
+        calculator = StandardDamageCalculator()
+        args = [(50, 10, 5), (1, 1, 20), (30, 4, 4)]
+        
+        self.assertEqual(
+            calculator.calculate_damage_batch(*zip(*args)),
+            [calculator.calculate_damage(*arg) for arg in args]
+        )
+    
+    def test_enchanted_armor_uses_injected_rng(self):
+        """Verifica que la armadura encantada refleja según el flujo inyectado."""
+        armor = EnchantedArmor(rng=BufferedRandom(8))
+        draws = BufferedRandom(8)
+        
+        for _ in range(40):
+            armor.absorb_damage(100)
+            self.assertEqual(armor.did_reflect(), draws.random() < 0.15)
+    
+    
+    def test_default_sources_survive_pickle_and_deepcopy(self):
+        """Verifica que los objetos con el generador global se serializan y copian."""
+        bank = EnchantedArmorBank()
+        bank.add()
+        for original in (EnchantedArmor(), CriticalDamageCalculator(), bank, bank.view(0)):
+            for clone in (pickle.loads(pickle.dumps(original)), copy.deepcopy(original)):
+                with self.subTest(type=type(original).__name__):
+                    self.assertIs(clone.rng, random)
+                    self.assertIs(original.rng, random)
+    
+    def test_injected_source_is_copied(self):
+        """Verifica que una fuente inyectada viaja con el objeto y sigue su flujo."""
+        armor = EnchantedArmor(rng=BufferedRandom(5))
+        armor.absorb_damage(10)
+        clone = pickle.loads(pickle.dumps(armor))
+        
+        self.assertIsNot(clone.rng, armor.rng)
+        self.assertEqual(clone.rng.random(), armor.rng.random())
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
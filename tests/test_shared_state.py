@@ -0,0 +1,169 @@
+"""
+Tests unitarios para el estado de personajes en memoria compartida.
+"""
+import multiprocessing
+import os
+import pickle
+import random
+import subprocess
+import sys
+import unittest
+from multiprocessing import shared_memory
+from src.armor_system import LeatherArmor, PlateArmor, MagicShield, EnchantedArmor
+from src.combat_system import Character, CombatSystem
+from src.damage_calculator import StandardDamageCalculator
+from src.shared_state import (
+    CrossShardQueue, OwnershipError, SharedCharacterState, ShardWorker, partition, shard_of
+)
+
+
+def _roster(count=12, health=150):
+    armors = [lambda: None, LeatherArmor, PlateArmor, lambda: MagicShield(mana=40)]
+    return [Character(f"U{i}", health + 10 * i, 1 + i % 7, armor=armors[i % 4]())
+            for i in range(count)]
+
+
+def _attacks(count, seed, rows):
+    rng = random.Random(seed)
+    return [(rng.randrange(rows), rng.randrange(rows), rng.randint(5, 40)) for _ in range(count)]
+
+
+def _state_of(characters):
+    rows = []
+    for character in characters:
+        armor = character.armor
+        wear = None
+        if armor is not None:
+            wear = armor._mana if isinstance(armor, MagicShield) else armor._durability
+        rows.append((character.current_health, character.level, wear))
+    return rows
+
+
+def _run_shard(state, shard, ranges, queue, barrier, attacks):
+    """Proceso worker: ataques locales, envío, barrera y ataques recibidos."""
+    worker = ShardWorker(state, shard, ranges, queue, CombatSystem(StandardDamageCalculator()))
+    for attacker, defender, damage in attacks:
+        worker.attack(attacker, defender, damage)
+    worker.flush()
+    barrier.wait()
+    worker.process_incoming()
+    state.close()
+
+
+class TestSharedState(unittest.TestCase):
+    """Tests de vistas, propiedad de filas y ataques entre shards."""
+    
+    def setUp(self):
+        self.characters = _roster()
+        self.state = SharedCharacterState.create(self.characters)
+        self.addCleanup(self.state.unlink)
+        self.addCleanup(self.state.close)
+    
+    def test_views_match_characters(self):
+        """Verifica que las vistas compartidas leen el mismo estado que los personajes"""
+        self.assertEqual(_state_of(self.state), _state_of(self.characters))
+        self.assertEqual([c.name for c in self.state], [c.name for c in self.characters])
+        self.assertIsInstance(self.state[2].armor, PlateArmor)
+        
+        enchanted = Character("E", 100, 3, armor=EnchantedArmor())
+        with SharedCharacterState.create([enchanted]) as state:
+            self.assertEqual(state[0].armor._reflect_chance, 0.15)
+    
+    def test_attacks_match_plain_characters(self):
+        """Verifica que atacar sobre las vistas equivale a atacar a los personajes normales"""
+        combat = CombatSystem(StandardDamageCalculator())
+        attacks = _attacks(300, 4, len(self.characters))
+        columns = [list(column) for column in zip(*attacks)]
+        expected = combat.attack_batch(self.characters, *columns)
+        self.assertEqual(combat.attack_batch(self.state, *columns), expected)
+        self.assertEqual(_state_of(self.state), _state_of(self.characters))
+    
+    def test_ownership(self):
+        """Verifica que un shard no puede escribir filas ajenas pero sí leerlas"""
+        ranges = partition(len(self.state), 3)
+        attached = pickle.loads(pickle.dumps(self.state)).own(ranges[1])
+        self.addCleanup(attached.close)
+        attached[ranges[1][0]].take_damage(10)
+        self.assertEqual(self.state[ranges[1][0]].current_health,
+                         attached[ranges[1][0]].current_health)
+        with self.assertRaises(OwnershipError):
+            attached[0].current_health = 1
+        with self.assertRaises(OwnershipError):
+            attached[ranges[2][1]].armor.absorb_damage(10)
+        self.assertEqual(attached[0].current_health, self.characters[0].current_health)
+    
+    def test_attach_from_independent_process_keeps_segment(self):
+        """Verifica que un proceso que no es hijo se conecta sin borrar el segmento al salir"""
+        script = (
+            "import sys\n"
+            "from multiprocessing import resource_tracker\n"
+            "from src.shared_state import SharedCharacterState\n"
+            "state = SharedCharacterState.attach(sys.argv[1], sys.argv[2:])\n"
+            "print(state[0].current_health)\n"
+            "state.close()\n"
+            "# Espera a que su resource_tracker termine y haga su limpieza\n"
+            "stop = getattr(resource_tracker._resource_tracker, '_stop', None)\n"
+            "if stop is not None:\n"
+            "    stop()\n"
+        )
+        names = [character.name for character in self.characters]
+        
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        
+        output = subprocess.run([sys.executable, "-c", script, self.state.segment_name, *names],
+                                cwd=root, capture_output=True, text=True, timeout=60, check=True)
+        
+        self.assertEqual(output.stdout.strip(), str(self.characters[0].current_health))
+        segment = shared_memory.SharedMemory(name=self.state.segment_name)
+        segment.close()
+    
+    def test_partition(self):
+        """Verifica que el reparto cubre todas las filas y shard_of encuentra a su dueño"""
+        for count, shards in ((10, 3), (2, 4), (0, 2), (100, 7)):
+            ranges = partition(count, shards)
+            self.assertEqual([row for r in ranges for row in r], list(range(count)))
+            for row in range(count):
+                self.assertIn(row, ranges[shard_of(ranges, row)])
+    
+    def test_cross_shard_attacks_between_processes(self):
+        """Verifica que los workers en procesos separados producen el resultado secuencial"""
+        # Con vida de sobra ningún atacante muere a destiempo en el otro proceso
+        self.characters = _roster(health=5000)
+        self.state.close()
+        self.state = SharedCharacterState.create(self.characters)
+        self.addCleanup(self.state.unlink)
+        self.addCleanup(self.state.close)
+        shards = 2
+        ranges = partition(len(self.characters), shards)
+        attacks = [_attacks(80, seed, len(self.characters)) for seed in range(shards)]
+        
+        # Cada dueño aplica primero sus ataques locales y luego los recibidos, por emisor
+        combat = CombatSystem(StandardDamageCalculator())
+        for shard in range(shards):
+            ordered = [a for a in attacks[shard] if a[1] in ranges[shard]]
+            for sender in range(shards):
+                if sender != shard:
+                    ordered += [a for a in attacks[sender] if a[1] in ranges[shard]]
+            for attacker, defender, damage in ordered:
+                combat.attack_batch(self.characters, [attacker], [defender], [damage])
+        
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+        queue = CrossShardQueue(shards, context)
+        barrier = context.Barrier(shards)
+        processes = [
+            context.Process(target=_run_shard,
+                            args=(self.state, shard, ranges, queue, barrier, attacks[shard]))
+            for shard in range(shards)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(30)
+            self.assertEqual(process.exitcode, 0)
+        
+        self.assertEqual(_state_of(self.state), _state_of(self.characters))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
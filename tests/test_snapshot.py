@@ -0,0 +1,167 @@
+"""
+Tests unitarios para los snapshots del estado de combate.
+"""
+import os
+import pickle
+import tempfile
+import unittest
+from src.armor_bank import PlateArmorBank, PlateArmorView
+from src.armor_system import LeatherArmor, PlateArmor, MagicShield, EnchantedArmor, DummyArmor
+from src.character_table import CharacterTable
+from src.combat_log import CombatLog
+from src.combat_system import Character, CombatSystem
+from src.damage_calculator import StandardDamageCalculator, CriticalDamageCalculator
+from src.rng import BufferedRandom
+from src.snapshot import Snapshot, SnapshotError, dump, load, restore, snapshot
+from src.team import Team, TeamMember
+from src.weapons import Sword
+
+
+def _armor_state(armor):
+    if armor is None:
+        return None
+    state = dict(vars(armor))
+    state.pop("rng", None)
+    return type(armor), state
+
+
+class TestSnapshot(unittest.TestCase):
+    """Tests de captura y restauración."""
+    
+    def _battle(self, log=None):
+        shared = BufferedRandom(3)
+        party = [
+            Character("Knight", 300, 10, armor=PlateArmor()),
+            Character("Archer", 120, 7, armor=LeatherArmor()),
+            Character("Mage", 90, 12, armor=MagicShield(mana=80)),
+            Character("Paladin", 200, 9, armor=EnchantedArmor(rng=shared)),
+            Character("Squire", 80, 2, armor=DummyArmor()),
+            Character("Goblin", 40, 3),
+        ]
+        combat = CombatSystem(CriticalDamageCalculator(rng=BufferedRandom(9)), log)
+        for i in range(30):
+            combat.attack(party[i % 6], party[(i * 5 + 1) % 6], Sword(20 + i))
+        return party, combat
+    
+    def _assert_same_state(self, restored, original):
+        self.assertEqual([(c.name, c.current_health, c.max_health, c.level) for c in restored],
+                         [(c.name, c.current_health, c.max_health, c.level) for c in original])
+        self.assertEqual([_armor_state(c.armor) for c in restored],
+                         [_armor_state(c.armor) for c in original])
+    
+    def test_roundtrip_characters_calculator_and_log(self):
+        """Verifica que el estado restaurado continúa igual que el original."""
+        party, combat = self._battle()
+        
+        restored_party, restored_combat = restore(Snapshot.from_bytes(snapshot(party, combat).to_bytes()))
+        
+        self._assert_same_state(restored_party, party)
+        self.assertEqual(restored_combat.get_combat_log(), combat.get_combat_log())
+        self.assertEqual(restored_combat.damage_calculator.crit_multiplier, 2.0)
+        # Las fuentes aleatorias también se restauran: ambos combates siguen igual
+        for i in range(30):
+            expected = combat.attack(party[i % 6], party[(i + 2) % 6], Sword(35))
+            result = restored_combat.attack(restored_party[i % 6], restored_party[(i + 2) % 6],
+                                            Sword(35))
+            self.assertEqual(result, expected)
+        self.assertIs(restored_party[3].armor.rng, restored_party[3].armor.rng)
+    
+    def test_ring_buffer_log(self):
+        """Verifica un log circular que ya dio la vuelta."""
+        party, combat = self._battle(CombatLog(capacity=7))
+        
+        _, restored_combat = restore(snapshot(party, combat))
+        restored_combat.attack(Character("A", 10, 1), Character("B", 10, 1), Sword())
+        combat.attack(Character("A", 10, 1), Character("B", 10, 1), Sword())
+        
+        self.assertEqual(restored_combat.get_combat_log(), combat.get_combat_log())
+        self.assertEqual(restored_combat.combat_log.evicted, combat.combat_log.evicted)
+        self.assertEqual(list(restored_combat.combat_log.records()),
+                         list(combat.combat_log.records()))
+    
+    def test_character_table(self):
+        """Verifica que una tabla se restaura como tabla."""
+        table = CharacterTable()
+        table.add("Orc", 100, 4, PlateArmor())
+        table.add("Elf", 80, 6)
+        table.add("Name\0With separator", 50, 1, MagicShield(mana=30))
+        table.take_damage([0, 2], [40, 20])
+        
+        restored, combat = restore(snapshot(table))
+        
+        self.assertIsInstance(restored, CharacterTable)
+        self.assertIsNone(combat)
+        self._assert_same_state(list(restored), list(table))
+        self.assertEqual(list(restored.armor_kind), list(table.armor_kind))
+    
+    def test_subclasses_keep_their_type(self):
+        """Verifica que las vistas de bancos y los TeamMember se restauran con su tipo."""
+        bank = PlateArmorBank()
+        bank.add()
+        team = Team("Blue")
+        scout = team.add("Scout", 70, 5, LeatherArmor())
+        party = [Character("Knight", 300, 10, armor=bank.view(0)), scout]
+        calculator = CriticalDamageCalculator(rng=BufferedRandom(1))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "spill.log")
+            combat = CombatSystem(calculator, CombatLog(capacity=4, spill_path=path,
+                                                        spill_segment=2))
+            for _ in range(3):
+                combat.attack(scout, party[0], Sword(40))
+                combat.attack(party[0], scout, Sword(10))
+            calculator.last_was_critical = True
+            
+            restored, restored_combat = restore(Snapshot.from_bytes(snapshot(party, combat).to_bytes()))
+            combat.close()
+        
+        self.assertIsInstance(restored[0].armor, PlateArmorView)
+        self.assertEqual(restored[0].armor._durability, bank.durability[0])
+        self.assertIsInstance(restored[1], TeamMember)
+        self.assertEqual(restored[1].team.name, "Blue")
+        self.assertEqual([(c.name, c.current_health) for c in restored],
+                         [(c.name, c.current_health) for c in party])
+        self.assertEqual(_armor_state(restored[1].armor), _armor_state(scout.armor))
+        restored_log = restored_combat.combat_log
+        self.assertEqual((restored_log._spill_path, restored_log._spill_segment), (path, 2))
+        self.assertTrue(restored_combat.damage_calculator.last_was_critical)
+        
+        table = CharacterTable()
+        table.add("Orc", 100, 4, bank.view(0))
+        restored_table, _ = restore(snapshot(table))
+        self.assertIsInstance(restored_table.armors[0], PlateArmorView)
+        self.assertEqual(list(restored_table.armor_kind), list(table.armor_kind))
+    
+    def test_pickle_protocol_5_out_of_band(self):
+        """Verifica que las columnas viajan como buffers fuera de banda."""
+        party, combat = self._battle()
+        snap = snapshot(party, combat)
+        buffers = []
+        
+        data = pickle.dumps(snap, protocol=5, buffer_callback=buffers.append)
+        copy = pickle.loads(data, buffers=buffers)
+        
+        self.assertEqual(len(buffers), len(snap.columns))
+        self.assertEqual(copy.columns, snap.columns)
+        self._assert_same_state(restore(copy)[0], party)
+    
+    def test_file_roundtrip_and_errors(self):
+        """Verifica guardar en archivo y rechazar datos inválidos."""
+        party, _ = self._battle()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "battle.snap")
+            dump(snapshot(party), path)
+            self._assert_same_state(restore(load(path))[0], party)
+        
+        data = snapshot(party).to_bytes()
+        with self.assertRaises(SnapshotError):
+            Snapshot.from_bytes(b"XXXX" + data[4:])
+        with self.assertRaises(SnapshotError):
+            Snapshot.from_bytes(data[:len(data) // 2])
+        broken = snapshot(party)
+        del broken.columns["level"]
+        with self.assertRaises(SnapshotError):
+            restore(broken)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+Tests unitarios para el índice espacial.
+"""
+import math
+import random
+import unittest
+from src.combat_system import Character, CombatSystem
+from src.damage_calculator import StandardDamageCalculator
+from src.spatial_index import SpatialIndex
+from src.turn_scheduler import TurnScheduler, one_team_left
+from src.weapons import Sword
+
+
+def _brute_force(points, x, y, exclude_team=None):
+    """Personajes ordenados por distancia recorriendo todos."""
+    candidates = [
+        (math.hypot(px - x, py - y), order, character)
+        for order, (character, px, py, team) in enumerate(points)
+        if character.is_alive() and (exclude_team is None or team != exclude_team)
+    ]
+    candidates.sort(key=lambda item: (item[0], item[1]))
+    return candidates
+
+
+class TestSpatialIndex(unittest.TestCase):
+    """Tests de consultas contra una búsqueda exhaustiva."""
+    
+    def _field(self, count=400, seed=2, cell_size=7.0):
+        rng = random.Random(seed)
+        index = SpatialIndex(cell_size)
+        points = []
+        for i in range(count):
+            character = Character(f"U{i}", 100, 1)
+            x, y = rng.uniform(-100, 100), rng.uniform(-60, 140)
+            team = i % 3
+            index.insert(character, x, y, team)
+            points.append((character, x, y, team))
+        return index, points, rng
+    
+    def test_queries_match_brute_force(self):
+        """Verifica nearest, k_nearest y radius contra recorrer todos los personajes"""
+        index, points, rng = self._field()
+        for _ in range(60):
+            x, y = rng.uniform(-150, 150), rng.uniform(-150, 150)
+            expected = _brute_force(points, x, y)
+            with self.subTest(x=x, y=y):
+                self.assertIs(index.nearest(x, y), expected[0][2])
+                self.assertEqual(index.k_nearest(x, y, 9), [c for _, _, c in expected[:9]])
+                radius = rng.uniform(1, 40)
+                self.assertEqual(set(index.radius(x, y, radius)),
+                                 {c for d, _, c in expected if d <= radius})
+                enemies = _brute_force(points, x, y, exclude_team=1)
+                self.assertIs(index.nearest(x, y, exclude_team=1), enemies[0][2])
+    
+    def test_moves_and_deaths(self):
+        """Verifica que los movimientos y las muertes se reflejan en las consultas"""
+        index, points, rng = self._field(count=200)
+        for step in range(300):
+            position = rng.randrange(len(points))
+            character, _, _, team = points[position]
+            if step % 10 == 0:
+                character.current_health = 0
+            elif character.is_alive():
+                x, y = rng.uniform(-100, 100), rng.uniform(-100, 100)
+                index.move(character, x, y)
+                points[position] = (character, x, y, team)
+                self.assertEqual(character.position, (x, y))
+        x, y = 3.0, -4.0
+        expected = _brute_force(points, x, y)
+        self.assertEqual(index.k_nearest(x, y, 20), [c for _, _, c in expected[:20]])
+        index.remove_dead()
+        self.assertEqual(len(index), sum(1 for c, _, _, _ in points if c.is_alive()))
+    
+    def test_max_distance_and_empty_index(self):
+        """Verifica el límite de distancia y las consultas sobre un índice vacío"""
+        index = SpatialIndex(5.0)
+        self.assertIsNone(index.nearest(0, 0))
+        hero = Character("Hero", 100, 1)
+        index.insert(hero, 30, 40)
+        self.assertIsNone(index.nearest(0, 0, max_distance=49))
+        self.assertIs(index.nearest(0, 0, max_distance=50), hero)
+        with self.assertRaises(ValueError):
+            index.insert(hero, 0, 0)
+        index.remove(hero)
+        self.assertIsNone(hero.position)
+        self.assertIsNone(index.nearest(0, 0))
+    
+    def test_area_attack(self):
+        """Verifica que el ataque de área golpea a los enemigos en el radio y quita a los muertos"""
+        index = SpatialIndex(4.0)
+        mage = Character("Mage", 100, 10)
+        index.insert(mage, 0, 0, team="heroes")
+        ally = Character("Ally", 100, 1)
+        index.insert(ally, 1, 0, team="heroes")
+        near = [Character(f"Rat{i}", 30 + 40 * i, 1) for i in range(3)]
+        for i, rat in enumerate(near):
+            index.insert(rat, 0, 2 + i, team="rats")
+        far = Character("FarRat", 10, 1)
+        index.insert(far, 20, 20, team="rats")
+        
+        result = index.area_attack(CombatSystem(StandardDamageCalculator()), mage, Sword(),
+                                   0, 0, radius=5)
+        
+        self.assertEqual(result["defenders"], near)
+        self.assertEqual(ally.current_health, 100)
+        self.assertEqual(far.current_health, 10)
+        for rat in near:
+            self.assertEqual(rat in index, rat.is_alive())
+    
+    def test_scheduler_targets_nearest_enemy(self):
+        """Verifica que el planificador usa al enemigo más cercano como objetivo"""
+        index = SpatialIndex(10.0)
+        scheduler = TurnScheduler(CombatSystem(StandardDamageCalculator()))
+        knight = Character("Knight", 1000, 20)
+        index.insert(knight, 0, 0, team="a")
+        scheduler.add(knight, Sword(), team="a")
+        goblins = []
+        for distance in (30, 5, 12):
+            goblin = Character(f"Goblin{distance}", 1, 1)
+            index.insert(goblin, distance, 0, team="b")
+            scheduler.add(goblin, Sword(1), speed=0.01, team="b")
+            goblins.append(goblin)
+        killed = []
+        scheduler.run_until(one_team_left, choose_target=index.choose_target,
+                            on_attack=lambda combatant, result: killed.append(result["defender"]))
+        self.assertEqual(killed, ["Goblin5", "Goblin12", "Goblin30"])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Tests unitarios para los equipos con agregados incrementales.
+"""
+import random
+import unittest
+from src.armor_system import LeatherArmor, MagicShield, PlateArmor
+from src.combat_system import Character, CombatSystem
+from src.damage_calculator import StandardDamageCalculator
+from src.damage_pipeline import DamagePipeline
+from src.team import Team, TeamMember
+from src.weapons import Sword
+
+
+def _recount(team):
+    """Agregados recalculados recorriendo a todos los miembros."""
+    members = list(team)
+    alive = [m for m in members if m.current_health > 0]
+    return {
+        "alive_count": len(alive),
+        "total_health": sum(m.current_health for m in members),
+        "total_max_health": sum(m.max_health for m in members),
+        "armor_broken_count": sum(1 for m in members if m.armor is not None and m.armor.is_broken()),
+        "average_level": sum(m.level for m in members) / len(members) if members else 0.0,
+        "average_alive_level": sum(m.level for m in alive) / len(alive) if alive else 0.0,
+    }
+
+
+def _aggregates(team):
+    return {name: getattr(team, name) for name in _recount(team)}
+
+
+class TestTeam(unittest.TestCase):
+    """Tests de agregados y callbacks."""
+    
+    def _team(self):
+        team = Team("Red")
+        team.add("Knight", 300, 10, PlateArmor())
+        team.add("Archer", 120, 7, LeatherArmor())
+        team.add("Mage", 90, 12, MagicShield(mana=30))
+        team.add("Squire", 60, 2)
+        return team
+    
+    def test_aggregates_follow_every_write_path(self):
+        """Verifica que los agregados coinciden con un recuento tras ataques, lotes y curaciones"""
+        team = self._team()
+        combat = CombatSystem(StandardDamageCalculator())
+        pipeline = DamagePipeline(StandardDamageCalculator())
+        enemy = Character("Ogre", 10_000, 9)
+        members = list(team)
+        chooser = random.Random(3)
+        for step in range(200):
+            member = chooser.choice(members)
+            action = step % 5
+            if action == 0:
+                combat.attack(enemy, member, Sword(chooser.randint(5, 60)))
+            elif action == 1:
+                combat.attack_batch(members, [0], [members.index(member)], [35])
+            elif action == 2:
+                pipeline.resolve(enemy, member, 25)
+            elif action == 3:
+                member.heal(chooser.randint(1, 40))
+            else:
+                member.take_damage(chooser.randint(1, 30))
+            self.assertEqual(_aggregates(team), _recount(team))
+    
+    def test_level_armor_and_max_health_changes(self):
+        """Verifica que cambiar nivel, armadura y vida máxima actualiza los agregados"""
+        team = self._team()
+        archer = list(team)[1]
+        archer.level = 20
+        archer.max_health = 200
+        broken = LeatherArmor()
+        broken._durability = 0
+        archer.equip_armor(broken)
+        self.assertEqual(team.armor_broken_count, 1)
+        self.assertEqual(_aggregates(team), _recount(team))
+    
+    def test_threshold_callbacks(self):
+        """Verifica que los umbrales se disparan una vez al cruzarlos y se rearman al curar"""
+        team = Team("Blue")
+        first = team.add("A", 100, 1)
+        second = team.add("B", 100, 1)
+        fired = []
+        team.on_health_below(0.5, lambda t, fraction: fired.append(("half", fraction)))
+        team.on_health_below(0.25, lambda t, fraction: fired.append(("quarter", fraction)))
+        team.on_wiped(lambda t: fired.append(("wiped", t.name)))
+        
+        first.take_damage(90)
+        self.assertEqual(fired, [])
+        second.take_damage(20)
+        self.assertEqual(fired, [("half", 0.45)])
+        second.take_damage(10)
+        self.assertEqual(len(fired), 1)
+        
+        second.take_damage(200)
+        self.assertEqual(fired[1:], [("quarter", 0.05)])
+        first.take_damage(10)
+        self.assertEqual(fired[2:], [("wiped", "Blue")])
+        self.assertTrue(team.is_wiped())
+        
+        # Al curar por encima de los umbrales se rearman
+        first.heal(100)
+        second.heal(100)
+        fired.clear()
+        first.take_damage(100)
+        second.take_damage(20)
+        self.assertEqual(fired, [("half", 0.4)])
+    
+    def test_threshold_already_crossed_does_not_fire(self):
+        """Verifica que un umbral registrado cuando ya está cruzado no se dispara"""
+        team = Team("Green")
+        member = team.add("A", 100, 1)
+        member.take_damage(90)
+        fired = []
+        team.on_health_below(0.5, lambda t, fraction: fired.append(fraction))
+        member.take_damage(5)
+        self.assertEqual(fired, [])
+        member.heal(60)
+        member.take_damage(30)
+        self.assertEqual(fired, [0.35])
+    
+    def test_add_character_and_remove(self):
+        """Verifica que se agregan personajes existentes y se quitan miembros"""
+        team = Team("Gold")
+        hero = Character("Hero", 100, 5, armor=LeatherArmor())
+        hero.current_health = 40
+        member = team.add_character(hero)
+        self.assertIsInstance(member, TeamMember)
+        self.assertIs(member.armor, hero.armor)
+        self.assertEqual(team.total_health, 40)
+        with self.assertRaises(ValueError):
+            Team("Other").add_character(member)
+        
+        team.remove(member)
+        member.take_damage(10)
+        self.assertEqual(_aggregates(team), _recount(team))
+        self.assertIsNone(member.team)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
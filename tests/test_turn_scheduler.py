@@ -0,0 +1,159 @@
+"""
+Tests unitarios para el planificador de turnos.
+"""
+import unittest
+from src.combat_system import Character, CombatSystem
+from src.damage_calculator import MockDamageCalculator
+from src.interfaces import CombatHook
+from src.turn_scheduler import TurnScheduler, one_team_left
+from src.weapons import Sword
+
+
+class TestTurnScheduler(unittest.TestCase):
+    """Tests del orden de turnos y de la batalla."""
+    
+    def setUp(self):
+        self.scheduler = TurnScheduler(CombatSystem(MockDamageCalculator(fixed_damage=30)))
+        self.sword = Sword()
+    
+    def test_speed_order(self):
+        """Verifica que un personaje el doble de rápido actúa el doble de veces."""
+        fast = Character("Fast", 100, 1)
+        slow = Character("Slow", 100, 1)
+        self.scheduler.add(slow, self.sword, speed=1)
+        self.scheduler.add(fast, self.sword, speed=2)
+        
+        order = [self.scheduler.next_turn().character.name for _ in range(6)]
+        
+        # En los empates actúa primero quien se agendó antes
+        self.assertEqual(order, ["Fast", "Slow", "Fast", "Fast", "Slow", "Fast"])
+        self.assertEqual(self.scheduler.time, 200.0)
+    
+    def test_initiative_breaks_ties(self):
+        """Verifica que en empate actúa primero la mayor iniciativa."""
+        first = Character("First", 100, 1)
+        second = Character("Second", 100, 1)
+        self.scheduler.add(first, self.sword, initiative=1)
+        self.scheduler.add(second, self.sword, initiative=5)
+        
+        self.assertEqual(self.scheduler.next_turn().character, second)
+        self.assertEqual(self.scheduler.next_turn().character, first)
+    
+    def test_dead_characters_are_skipped(self):
+        """Verifica que los muertos y los retirados salen sin actuar."""
+        alive = Character("Alive", 100, 1)
+        dead = Character("Dead", 100, 1)
+        gone = Character("Gone", 100, 1)
+        for character in (dead, gone, alive):
+            self.scheduler.add(character, self.sword)
+        dead.take_damage(1000)
+        self.scheduler.remove(gone)
+        
+        self.assertEqual(self.scheduler.next_turn().character, alive)
+        self.assertEqual(len(self.scheduler), 1)
+    
+    def test_set_speed(self):
+        """Verifica que cambiar la velocidad reagenda sin duplicar turnos."""
+        a = Character("A", 100, 1)
+        b = Character("B", 100, 1)
+        self.scheduler.add(a, self.sword, speed=1)
+        self.scheduler.add(b, self.sword, speed=1)
+        self.scheduler.set_speed(b, 4)
+        
+        order = [self.scheduler.next_turn().character.name for _ in range(5)]
+        
+        self.assertEqual(order, ["B", "B", "B", "A", "B"])
+    
+    def test_run_until_one_team_left(self):
+        """Verifica una batalla por equipos hasta que queda uno."""
+        heroes = [Character(f"H{i}", 100, 1) for i in range(3)]
+        villains = [Character(f"V{i}", 50, 1) for i in range(2)]
+        for hero in heroes:
+            self.scheduler.add(hero, self.sword, speed=1, team="heroes")
+        for villain in villains:
+            self.scheduler.add(villain, self.sword, speed=1, team="villains")
+        attacks = []
+        
+        turns = self.scheduler.run_until(
+            one_team_left, on_attack=lambda combatant, result: attacks.append(result)
+        )
+        
+        self.assertTrue(all(not villain.is_alive() for villain in villains))
+        self.assertEqual(self.scheduler.teams_alive(), 1)
+        self.assertEqual(self.scheduler.alive_in_team("heroes"), 3)
+        self.assertEqual(turns, len(attacks))
+        self.assertTrue(all(result["success"] for result in attacks))
+    
+    def test_healed_enemy_is_targeted_again(self):
+        """Verifica que un enemigo curado vuelve a ser objetivo y a actuar."""
+        hero = Character("Hero", 100, 1)
+        first = Character("First", 100, 1)
+        second = Character("Second", 100, 1)
+        hero_entry = self.scheduler.add(hero, self.sword, speed=0.5, team="heroes")
+        self.scheduler.add(first, self.sword, team="villains")
+        self.scheduler.add(second, self.sword, team="villains")
+        
+        first.take_damage(1000)
+        self.assertIs(self.scheduler.first_enemy(hero_entry), second)
+        self.assertEqual(self.scheduler.alive_in_team("villains"), 1)
+        second.take_damage(1000)
+        self.assertIsNone(self.scheduler.first_enemy(hero_entry))
+        # Los muertos salen del heap sin actuar
+        self.assertIs(self.scheduler.next_turn(), hero_entry)
+        self.assertEqual(self.scheduler.teams_alive(), 1)
+        first.heal(50)
+        
+        self.assertIs(self.scheduler.first_enemy(hero_entry), first)
+        self.assertEqual(self.scheduler.teams_alive(), 2)
+        self.assertEqual([self.scheduler.next_turn().character for _ in range(2)],
+                         [first, hero])
+    
+    def test_teams_alive_sees_outside_deaths(self):
+        """Verifica que teams_alive cuenta muertes ocurridas fuera de run_until."""
+        hero = Character("Hero", 100, 1)
+        villain = Character("Villain", 100, 1)
+        self.scheduler.add(hero, self.sword, team="heroes")
+        self.scheduler.add(villain, self.sword, team="villains")
+        self.assertFalse(one_team_left(self.scheduler))
+        
+        villain.take_damage(1000)
+        
+        self.assertTrue(one_team_left(self.scheduler))
+        self.assertEqual(self.scheduler.run_until(one_team_left), 0)
+    
+    def test_run_until_sees_hooks_added_mid_battle(self):
+        """Verifica que run_until usa el attack vigente en cada turno."""
+        combat = self.scheduler.combat_system
+        a = Character("A", 1000, 1)
+        b = Character("B", 1000, 1)
+        self.scheduler.add(a, self.sword, team=1)
+        self.scheduler.add(b, self.sword, team=2)
+        seen = []
+        
+        class Recorder(CombatHook):
+            def before_attack(self, attacker, defender, weapon):
+                seen.append(attacker.name)
+        
+        def install_hook(combatant, result):
+            if not seen:
+                combat.add_hook(Recorder())
+        
+        self.scheduler.run_until(lambda s: False, max_turns=3, on_attack=install_hook)
+        
+        self.assertEqual(seen, ["B", "A"])
+    
+    def test_max_turns_and_validation(self):
+        """Verifica max_turns y los errores de alta."""
+        a = Character("A", 100, 1)
+        self.scheduler.add(a, self.sword, team=1)
+        self.scheduler.add(Character("B", 100, 1), self.sword, team=2)
+        
+        self.assertEqual(self.scheduler.run_until(lambda s: False, max_turns=3), 3)
+        with self.assertRaises(ValueError):
+            self.scheduler.add(a, self.sword)
+        with self.assertRaises(ValueError):
+            self.scheduler.add(Character("C", 1, 1), self.sword, speed=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file